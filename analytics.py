@@ -0,0 +1,150 @@
+import itertools
+from collections import Counter
+from typing import Callable, Dict, Hashable, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from questions import Question, QuestionStore
+
+# Urutan tetap kesulitan bawaan; label lain (misalnya dari LLM) ditampilkan sesudahnya
+DIFFICULTY_ORDER = ("easy", "medium", "hard")
+# Jumlah konsep teratas di grafik riwayat per konsep
+TOP_CONCEPTS = 15
+
+# Versi agregat unik di satu proses, sehingga agregat baru tidak pernah memakai grafik milik agregat lama
+_versions = itertools.count(1)
+
+
+# Jumlah soal per kesulitan, jenis, dan konsep yang diperbarui saat soal ditambah, dihapus, atau diubah
+# kesulitannya, tanpa menghitung ulang semua soal
+class QuestionAggregates:
+    def __init__(self, questions: Iterable[Question] = ()):
+        self.difficulties: Counter = Counter()
+        self.types: Counter = Counter()
+        self.concepts: Counter = Counter()
+        self.total = 0
+        self.version = next(_versions)
+        self.add(questions)
+
+    def add(self, questions: Iterable[Question]):
+        self._update(questions, 1)
+
+    def remove(self, questions: Iterable[Question]):
+        self._update(questions, -1)
+
+    def _update(self, questions: Iterable[Question], sign: int):
+        if isinstance(questions, QuestionStore):
+            # Store kolumnar: hitung per kode kategori dengan bincount, bukan per objek Question
+            columns = ((self.difficulties, questions.difficulties.values, questions.difficulty_codes),
+                       (self.types, questions.types.values, questions.type_codes),
+                       (self.concepts, questions.concepts.values, questions.concept_codes))
+            for counter, values, codes in columns:
+                counts = np.bincount(np.frombuffer(codes, dtype=codes.typecode), minlength=len(values))
+                for code in np.flatnonzero(counts):
+                    counter[values[code]] += sign * int(counts[code])
+            total = len(questions)
+        else:
+            total = 0
+            for question in questions:
+                self.difficulties[question.difficulty] += sign
+                self.types[question.question_type] += sign
+                self.concepts[question.concept] += sign
+                total += 1
+        if not total:
+            return
+        self.total += sign * total
+        if sign < 0:
+            for counter in (self.difficulties, self.types, self.concepts):
+                for key in [key for key, count in counter.items() if count <= 0]:
+                    del counter[key]
+        self.version = next(_versions)
+
+    # Ubah kesulitan soal di store (None = tetap) dan sesuaikan jumlahnya hanya untuk baris yang berubah
+    def set_difficulties(self, store: QuestionStore, difficulties: Sequence[Optional[str]]) -> int:
+        values, codes = store.difficulties.values, store.difficulty_codes
+        for row, difficulty in enumerate(difficulties):
+            if difficulty is not None and difficulty != values[codes[row]]:
+                self.difficulties[values[codes[row]]] -= 1
+                self.difficulties[difficulty] += 1
+        changed = store.set_difficulties(difficulties)
+        if changed:
+            for key in [key for key, count in self.difficulties.items() if count <= 0]:
+                del self.difficulties[key]
+            self.version = next(_versions)
+        return changed
+
+    # Distribusi kesulitan: easy/medium/hard selalu ada, label lain ikut dihitung
+    def difficulty_distribution(self) -> Dict[str, int]:
+        distribution = {difficulty: self.difficulties.get(difficulty, 0) for difficulty in DIFFICULTY_ORDER}
+        distribution.update((d, count) for d, count in self.difficulties.items() if d not in distribution)
+        return distribution
+
+
+# Grafik yang sudah dibuat, dipakai ulang selama versi datanya sama (satu entri per nama grafik)
+class FigureCache:
+    def __init__(self):
+        self._figures: Dict[str, Tuple[Hashable, object]] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, name: str, version: Hashable, build: Callable[[], object]):
+        cached = self._figures.get(name)
+        if cached is not None and cached[0] == version:
+            self.hits += 1
+            return cached[1]
+        self.misses += 1
+        figure = build()
+        self._figures[name] = (version, figure)
+        return figure
+
+
+# Grafik pie distribusi kesulitan
+def difficulty_figure(distribution: Dict[str, int]):
+    import plotly.express as px
+
+    return px.pie(
+        values=list(distribution.values()),
+        names=[d.upper() for d in distribution.keys()],
+        title="📈 Distribusi Tingkat Kesulitan",
+        color_discrete_sequence=px.colors.sequential.RdBu
+    )
+
+
+# Grafik akurasi per soal dari hasil kuis
+def quiz_accuracy_figure(question_accuracy: List[Optional[float]]):
+    import plotly.express as px
+
+    accuracy = [a * 100 if a is not None else 0 for a in question_accuracy]
+    return px.bar(x=[f"#{i + 1}" for i in range(len(accuracy))], y=accuracy,
+                  labels={"x": "Soal", "y": "Akurasi (%)"}, title="🎯 Akurasi per Soal")
+
+
+# Tabel ringkasan bank soal (baris dari QuestionBank.question_stats) sebagai DataFrame
+def bank_stats_frame(rows: List[Tuple[str, str, str, str, int]]):
+    import pandas as pd
+
+    return pd.DataFrame(rows, columns=["day", "concept", "difficulty", "question_type", "questions"])
+
+
+# Jumlah soal tersimpan per hari, ditumpuk per kesulitan
+def bank_timeline_figure(frame):
+    import plotly.express as px
+
+    daily = frame.groupby(["day", "difficulty"], as_index=False, sort=True)["questions"].sum()
+    return px.bar(daily, x="day", y="questions", color="difficulty",
+                  labels={"day": "Tanggal", "questions": "Jumlah soal", "difficulty": "Kesulitan"},
+                  title="📅 Soal Tersimpan per Hari")
+
+
+# Konsep dengan soal terbanyak di bank, beserta komposisi kesulitannya
+def bank_concept_figure(frame, top: int = TOP_CONCEPTS):
+    import plotly.express as px
+
+    frame = frame[frame["concept"] != ""]
+    top_concepts = frame.groupby("concept")["questions"].sum().nlargest(top).index
+    per_concept = (frame[frame["concept"].isin(top_concepts)]
+                   .groupby(["concept", "difficulty"], as_index=False)["questions"].sum())
+    return px.bar(per_concept, x="questions", y="concept", color="difficulty", orientation="h",
+                  category_orders={"concept": list(top_concepts)},
+                  labels={"questions": "Jumlah soal", "concept": "Konsep", "difficulty": "Kesulitan"},
+                  title="🧩 Konsep Terbanyak di Bank Soal")
@@ -1,379 +1,22 @@
 import streamlit as st
-import PyPDF2
-import docx
-import re
-import random
-import pandas as pd
-import base64
-import json
+import functools
+import os
+import time
 from datetime import datetime
-from typing import List, Dict, Tuple
-from dataclasses import dataclass
-import io
-from io import StringIO
-import plotly.express as px
-import plotly.graph_objects as go
-
-# Class untuk merepresentasikan sebuah soal
-@dataclass
-class Question:
-    question_text: str
-    options: List[str]
-    correct_answer: str
-    explanation: str
-    question_type: str = "pilihan_ganda"
-    difficulty: str = "medium"
-    
-    # Convert question to dictionary
-    def to_dict(self) -> Dict:
-        return {
-            "question": self.question_text,
-            "options": self.options,
-            "correct_answer": self.correct_answer,
-            "explanation": self.explanation,
-            "type": self.question_type,
-            "difficulty": self.difficulty
-        }
-
-# Class untuk memproses materi ajar
-class MaterialProcessor:
-    def __init__(self):
-        self.text_content = ""
-
-    # Ekstrak teks dari file PDF
-    def extract_text_from_pdf(self, pdf_file) -> str:
-        try:
-            pdf_reader = PyPDF2.PdfReader(pdf_file)
-            text = ""
-            for page in pdf_reader.pages:
-                text += page.extract_text()
-            return text
-        except Exception as e:
-            st.error(f"Error reading PDF: {e}")
-            return ""
-    
-    # Ekstrak teks dari file DOCX
-    def extract_text_from_docx(self, docx_file) -> str:
-        try:
-            doc = docx.Document(docx_file)
-            text = ""
-            for paragraph in doc.paragraphs:
-                text += paragraph.text + "\n"
-            return text
-        except Exception as e:
-            st.error(f"Error reading DOCX: {e}")
-            return ""
-    
-    # Ekstrak teks dari file TXT
-    def extract_text_from_txt(self, txt_file) -> str:
-        try:
-            stringio = StringIO(txt_file.getvalue().decode("utf-8"))
-            return stringio.read()
-        except Exception as e:
-            st.error(f"Error reading TXT file: {e}")
-            return ""
-    
-    # Proses file yang diupload dan ekstrak teksnya
-    def process_material(self, uploaded_file) -> bool:
-        if uploaded_file is None:
-            return False
-        file_extension = uploaded_file.name.split('.')[-1].lower()
-        if file_extension == "pdf":
-            self.text_content = self.extract_text_from_pdf(uploaded_file)
-        elif file_extension == "docx":
-            self.text_content = self.extract_text_from_docx(uploaded_file)
-        elif file_extension == "txt":
-            self.text_content = self.extract_text_from_txt(uploaded_file)
-        else:
-            st.error("Format file tidak didukung. Gunakan PDF, DOCX, atau TXT.")
-            return False
-        
-        # Bersihkan teks dari karakter yang tidak perlu
-        self.text_content = self.clean_text(self.text_content)
-        if len(self.text_content) < 100:
-            st.warning("Teks yang diekstrak terlalu pendek. Pastikan file berisi materi yang cukup.")
-            return False
-            
-        return True
-    
-    # Hapus karakter khusus dan multiple spaces
-    def clean_text(self, text: str) -> str:
-        text = re.sub(r'\s+', ' ', text)
-        text = re.sub(r'[^\w\s.,!?;:()-]', '', text)
-        return text.strip()
-    
-    def get_key_concepts(self, max_concepts: int = 20) -> List[str]:
-        """Ekstrak konsep-konsep penting dari materi"""
-        sentences = re.split(r'[.!?]', self.text_content)
-        concepts = set()
-        for sentence in sentences:
-            words = sentence.split()
-            for i, word in enumerate(words):
-                # Deteksi kemungkinan konsep penting
-                cleaned_word = re.sub(r'[^a-zA-Z]', '', word)
-                if (len(cleaned_word) > 3 and cleaned_word.isalpha() and 
-                    (cleaned_word.istitle() or (i > 0 and words[i-1][-1] == ':'))):
-                    concepts.add(cleaned_word.lower())
-        
-        return list(concepts)[:max_concepts]
-
-# Class untuk menghasilkan soal dengan AI
-class AdvancedQuestionGenerator:
-    def __init__(self):
-        self.generated_questions = []
-        self.question_templates = {
-            "definition": [
-                "Apa yang dimaksud dengan {concept}?",
-                "Jelaskan pengertian dari {concept}!",
-                "Definisikan konsep {concept}!"
-            ],
-            "cause_effect": [
-                "Apa penyebab dari {concept}?",
-                "Apa dampak dari {concept}?",
-                "Bagaimana {concept} mempengaruhi proses lainnya?"
-            ],
-            "comparison": [
-                "Bandingkan {concept1} dan {concept2}!",
-                "Apa perbedaan antara {concept1} dengan {concept2}?",
-                "Apa persamaan {concept1} dan {concept2}?"
-            ],
-            "application": [
-                "Bagaimana cara menerapkan {concept} dalam kehidupan sehari-hari?",
-                "Berikan contoh penerapan {concept}!",
-                "Aplikasi apa saja yang menggunakan prinsip {concept}?"
-            ],
-            "simple": [
-                "Apa itu {concept}?",
-                "Jelaskan {concept} secara singkat!",
-                "Apa fungsi dari {concept}?"
-            ]
-        }
-    
-    # Generate questions dengan variasi
-    def generate_questions_advanced(self, material_text: str, num_questions: int = 10) -> List[Question]:
-        sentences = self.extract_meaningful_sentences(material_text)
-        concepts = self.extract_key_concepts_advanced(material_text)
-        questions = []
-        
-        # Generate berbagai jenis soal
-        for i in range(num_questions):
-            question = self.generate_single_question(concepts, sentences, material_text, i)
-            if question:
-                questions.append(question)
-        
-        return questions
-    
-    # Ekstrak kalimat yang bermakna dari teks
-    def extract_meaningful_sentences(self, text: str) -> List[str]:
-        sentences = re.split(r'[.!?]', text)
-        meaningful_sentences = []
-        
-        for sentence in sentences:
-            clean_sentence = sentence.strip()
-            words = clean_sentence.split()
-            if len(words) >= 5 and len(clean_sentence) > 20:
-                meaningful_sentences.append(clean_sentence)
-        
-        return meaningful_sentences
-    
-    #Ekstrak konsep kunci
-    def extract_key_concepts_advanced(self, text: str) -> List[str]:
-        # Cari kata-kata yang sering muncul dan penting
-        words = re.findall(r'\b[A-Z][a-z]+\b', text)
-        word_freq = {}
-        # Hanya kata dengan panjang minimal 5 huruf
-        for word in words:
-            if len(word) > 4:
-                word_lower = word.lower()
-                word_freq[word_lower] = word_freq.get(word_lower, 0) + 1
-        # Urutkan berdasarkan frekuensi dan ambil yang paling sering
-        sorted_concepts = sorted(word_freq.items(), key=lambda x: x[1], reverse=True)
-        return [concept[0] for concept in sorted_concepts[:15]]
-    
-    #Generate satu soal dengan handling error
-    def generate_single_question(self, concepts: List[str], sentences: List[str], material_text: str, question_num: int) -> Question:
-        try:
-            if not concepts:
-                return self.create_question_from_sentence(sentences, question_num)
-            
-            # Pilih jenis soal berdasarkan nomor soal
-            question_types = list(self.question_templates.keys())
-            q_type = question_types[question_num % len(question_types)]
-            concept = random.choice(concepts)
-            template = random.choice(self.question_templates[q_type])
-            
-            # Handle template dengan multiple concepts
-            if "{concept1}" in template and "{concept2}" in template:
-                if len(concepts) >= 2:
-                    concept1 = concept
-                    concept2 = random.choice([c for c in concepts if c != concept1])
-                    question_text = template.format(concept1=concept1, concept2=concept2)
-                else:
-                    template = random.choice(self.question_templates["simple"])
-                    question_text = template.format(concept=concept)
-            else:
-                question_text = template.format(concept=concept)
-            
-            # Generate options yang realistis
-            options, correct_answer, explanation = self.generate_smart_options(
-                q_type, concept, concepts, material_text
-            )
-            
-            return Question(
-                question_text=question_text,
-                options=options,
-                correct_answer=correct_answer,
-                explanation=explanation,
-                question_type="pilihan_ganda",
-                difficulty=random.choice(["easy", "medium", "hard"])
-            )
-            
-        except Exception as e:
-            st.error(f"Error generating question {question_num + 1}: {e}")
-            return self.create_fallback_question(question_num)
-    
-    # Buat soal dari kalimat jika tidak ada konsep
-    def create_question_from_sentence(self, sentences: List[str], question_num: int) -> Question:
-        if not sentences:
-            return self.create_fallback_question(question_num)
-        
-        sentence = random.choice(sentences)
-        words = sentence.split()
-        if len(words) < 3:
-            return self.create_fallback_question(question_num)
-        
-        # Buat soal fill-in-the-blank sederhana
-        blank_word = random.choice([w for w in words if len(w) > 4])
-        question_text = sentence.replace(blank_word, "______")
-        question_text = f"Lengkapi kalimat: {question_text}"
-        
-        options = [blank_word]
-        for _ in range(3):
-            options.append(f"Opsi{random.randint(1, 100)}")
-        
-        random.shuffle(options)
-        
-        return Question(
-            question_text=question_text,
-            options=options,
-            correct_answer=blank_word,
-            explanation=f"Kata '{blank_word}' adalah jawaban yang tepat untuk melengkapi kalimat.",
-            difficulty="easy"
-        )
-    
-    # Buat soal fallback jika semua method gagal
-    def create_fallback_question(self, question_num: int) -> Question:
-        question_text = f"Apa yang Anda pahami tentang materi yang telah dipelajari?"
-        options = [
-            "Materi sangat jelas dan mudah dipahami",
-            "Materi cukup jelas dengan beberapa bagian yang rumit", 
-            "Materi cukup sulit dipahami",
-            "Materi sangat sulit dan perlu penjelasan lebih"
-        ]
-        
-        return Question(
-            question_text=question_text,
-            options=options,
-            correct_answer=options[0],
-            explanation="Soal ini menguji pemahaman umum terhadap materi.",
-            difficulty="easy"
-        )
-    
-    # Generate opsi jawaban
-    def generate_smart_options(self, q_type: str, concept: str, concepts: List[str], material_text: str) -> Tuple[List[str], str, str]:
-        correct_answer = self.generate_correct_answer(q_type, concept, material_text)
-        options = [correct_answer]
-        
-        # Generate distractor yang masuk akal
-        distractors = self.generate_plausible_distractors(q_type, concept, concepts, material_text)
-        
-        # Tambahkan distractor hingga 4 opsi
-        for distractor in distractors:
-            if len(options) < 4 and distractor not in options:
-                options.append(distractor)
-        
-        # Jika masih kurang, tambahkan opsi umum
-        while len(options) < 4:
-            generic_option = f"Opsi {len(options) + 1}"
-            options.append(generic_option)
-        
-        random.shuffle(options)
-        explanation = self.generate_explanation(q_type, concept, correct_answer, material_text)
-        
-        return options, correct_answer, explanation
-    
-    # Generate jawaban yang benar berdasarkan jenis soal
-    def generate_correct_answer(self, q_type: str, concept: str, material_text: str) -> str:
-        answers = {
-            "definition": [
-                f"{concept.capitalize()} adalah konsep penting yang dijelaskan dalam materi",
-                f"Definisi {concept} tercantum secara detail dalam pembahasan",
-                f"{concept.capitalize()} merujuk pada pengertian yang spesifik dalam konteks materi"
-            ],
-            "cause_effect": [
-                f"{concept.capitalize()} dipengaruhi oleh berbagai faktor yang saling terkait",
-                f"Dampak {concept} dapat dilihat dari beberapa aspek dalam materi",
-                f"Penyebab {concept} dijelaskan melalui mekanisme tertentu"
-            ],
-            "comparison": [
-                f"Perbandingan menunjukkan perbedaan karakteristik yang signifikan",
-                f"Persamaan dan perbedaan dijelaskan melalui analisis komparatif",
-                f"Kedua konsep memiliki keunikan dan karakteristik masing-masing"
-            ],
-            "application": [
-                f"{concept.capitalize()} dapat diaplikasikan dalam berbagai situasi praktis",
-                f"Penerapan {concept} membutuhkan pemahaman konsep yang mendalam",
-                f"Aplikasi {concept} meliputi beberapa implementasi yang relevan"
-            ],
-            "simple": [
-                f"{concept.capitalize()} adalah elemen fundamental dalam materi",
-                f"Pemahaman {concept} penting untuk menguasai topik ini",
-                f"{concept.capitalize()} memiliki peran kunci dalam pembahasan"
-            ]
-        }
-        
-        return random.choice(answers.get(q_type, answers["simple"]))
-    
-    # Generate distractor
-    def generate_plausible_distractors(self, q_type: str, concept: str, concepts: List[str], material_text: str) -> List[str]:
-        distractors = []
-        general_distractors = [
-            f"Konsep {concept} tidak relevan dengan materi",
-            f"{concept.capitalize()} adalah istilah yang sudah usang",
-            "Tidak ada penjelasan yang cukup dalam materi",
-            "Jawaban tersebut tidak sesuai dengan konteks pembahasan"
-        ]
-        
-        specific_distractors = {
-            "definition": [
-                f"{concept.capitalize()} memiliki pengertian yang berbeda dari penjelasan materi",
-                f"Definisi {concept} tidak konsisten dengan pembahasan"
-            ],
-            "cause_effect": [
-                f"{concept.capitalize()} tidak memiliki hubungan sebab-akibat yang jelas",
-                "Hubungan kausalitas tidak terbukti dalam materi"
-            ],
-            "comparison": [
-                "Perbandingan yang dilakukan tidak akurat",
-                "Tidak ada perbedaan signifikan antara konsep-konsep tersebut"
-            ]
-        }
-        
-        distractors.extend(general_distractors)
-        distractors.extend(specific_distractors.get(q_type, []))
-        
-        return random.sample(distractors, min(3, len(distractors)))
-    
-    # Generate penjelasan untuk jawaban yang benar
-    def generate_explanation(self, q_type: str, concept: str, correct_answer: str, material_text: str) -> str:
-        explanations = {
-            "definition": f"Jawaban benar karena sesuai dengan definisi {concept} yang dijelaskan dalam materi.",
-            "cause_effect": f"Jawaban benar karena mencerminkan hubungan sebab-akibat {concept} yang tepat.",
-            "comparison": f"Jawaban benar karena menunjukkan perbandingan yang akurat berdasarkan materi.",
-            "application": f"Jawaban benar karena sesuai dengan penerapan {concept} dalam konteks yang relevan.",
-            "simple": f"Jawaban benar karena sesuai dengan penjelasan {concept} dalam materi pembelajaran."
-        }
-        return explanations.get(q_type, "Jawaban benar berdasarkan pembahasan dalam materi.")
+from typing import List, Dict, Optional, Tuple
+import jobs
+from analytics import (FigureCache, QuestionAggregates, bank_concept_figure, bank_stats_frame,
+                       bank_timeline_figure, difficulty_figure, quiz_accuracy_figure)
+from concept_scoring import ConceptScorer
+from exporters import EXPORT_FORMATS, export_questions
+from questions import Question, QuestionStore
+from question_bank import QuestionBank
+from question_backends import LLMBackend, TemplateBackend
+from scoring import AnswerKey, QuizStatistics, ScoreReport, score_answers, score_submissions
+from tracing import Tracer
+# Inti pemrosesan dan generate soal ada di modul terpisah yang bisa diimport tanpa Streamlit/plotly
+from processing import ExtractionCache, MaterialProcessor
+from generator import AdvancedQuestionGenerator
 
 # Class untuk mengelola dashboard
 class DashboardManager:
@@ -382,12 +25,18 @@ class DashboardManager:
         self.analytics_data = {}
     
     # Buat data analytics untuk dashboard
-    def create_analytics(self, questions: List[Question], results: List[Dict] = None):
+    def create_analytics(self, questions: List[Question], results: List[Dict] = None,
+                         generation_seconds: float = None):
+        # Agregat dihitung sekali per set soal lalu diperbarui bertahap (misalnya saat kesulitan dikalibrasi kuis)
+        aggregates = QuestionAggregates(questions)
         analytics = {
             "total_questions": len(questions),
-            "difficulty_distribution": self.get_difficulty_distribution(questions),
-            "question_types": self.get_question_types(questions),
-            "generation_time": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            "aggregates": aggregates,
+            "difficulty_distribution": aggregates.difficulty_distribution(),
+            "question_types": dict(aggregates.types),
+            "generation_time": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            # Lama generate (detik), None jika soal diambil dari bank soal
+            "generation_seconds": generation_seconds
         }
         
         if results:
@@ -395,19 +44,13 @@ class DashboardManager:
         
         return analytics
     
-    # Dapatkan distribusi tingkat kesulitan
+    # Dapatkan distribusi tingkat kesulitan (label di luar easy/medium/hard ikut dihitung)
     def get_difficulty_distribution(self, questions: List[Question]) -> Dict:
-        distribution = {"easy": 0, "medium": 0, "hard": 0}
-        for q in questions:
-            distribution[q.difficulty] += 1
-        return distribution
+        return QuestionAggregates(questions).difficulty_distribution()
     
     # Dapatkan distribusi jenis soal
     def get_question_types(self, questions: List[Question]) -> Dict:
-        types_count = {}
-        for q in questions:
-            types_count[q.question_type] = types_count.get(q.question_type, 0) + 1
-        return types_count
+        return dict(QuestionAggregates(questions).types)
     
     # Analisis hasil kuis
     def analyze_quiz_results(self, results: List[Dict]) -> Dict:
@@ -425,6 +68,15 @@ class DashboardManager:
             "performance": "Excellent" if accuracy >= 80 else "Good" if accuracy >= 60 else "Needs Improvement"
         }
     
+    # Perbarui analytics dengan akumulasi hasil kuis dan kalibrasi kesulitan soal dari akurasinya;
+    # hanya statistik per soal yang dibaca, bukan semua jawaban
+    def update_quiz_analytics(self, analytics: Dict, questions: QuestionStore, quiz_stats: QuizStatistics):
+        aggregates = analytics["aggregates"]
+        aggregates.set_difficulties(questions, quiz_stats.difficulties())
+        analytics["quiz_results"] = quiz_stats.summary()
+        analytics["difficulty_distribution"] = aggregates.difficulty_distribution()
+        return analytics
+
     # Hitung rata-rata tingkat kesulitan
     def calculate_average_difficulty(self, diff_data: Dict) -> str:
         weights = {"easy": 1, "medium": 2, "hard": 3}
@@ -442,28 +94,315 @@ class DashboardManager:
         else:
             return "Sulit"
 
-# Membuat link download untuk berbagai format
-def create_download_link(data, filename, file_type):
+# Tombol download dengan data yang baru diserialisasi saat tombol diklik
+def render_download_button(questions: QuestionStore, filename: str, file_type: str):
+    mime, extension = EXPORT_FORMATS[file_type]
+    st.download_button(
+        f"📥 Download {file_type.upper()}",
+        data=functools.partial(export_with_tracing, st.session_state.tracer, questions, file_type),
+        file_name=f"{filename}.{extension}",
+        mime=mime,
+        on_click="ignore",
+        width="stretch"
+    )
+
+# Export soal dengan waktu yang dicatat tracer sesi
+def export_with_tracing(tracer: Tracer, questions: QuestionStore, file_type: str) -> bytes:
+    with tracer.span(f"export_{file_type}"):
+        return export_questions(questions, file_type)
+
+# Tampilkan satu soal beserta jawaban dan penjelasan jika diminta
+def render_question(i: int, question: Question, show_answers: bool):
+    with st.container():
+        
+        # Header soal dengan metadata
+        col1, col2, col3 = st.columns([3, 1, 1])
+        with col1:
+            st.markdown(f"**Soal #{i+1}** - **{question.difficulty.upper()}**")
+        with col2:
+            st.caption(f"Type: {question.question_type}")
+        with col3:
+            st.caption(f"Options: {len(question.options)}")
+            if question.question_id:
+                st.caption(f"ID: {question.question_id}")
+        
+        # Pertanyaan
+        st.markdown(f"**{question.question_text}**")
+        
+        # Opsi jawaban
+        for j, option in enumerate(question.options):
+            st.write(f"**{chr(65+j)}.** {option}")
+        
+        # Jawaban dan penjelasan jika ditampilkan
+        if show_answers:
+            correct_index = question.options.index(question.correct_answer) if question.correct_answer in question.options else 0
+            st.markdown(f'<div class="correct-answer">', unsafe_allow_html=True)
+            st.markdown(f"**✅ Jawaban Benar: {chr(65 + correct_index)}. {question.correct_answer}**")
+            if question.explanation:
+                st.markdown(f"**💡 Penjelasan:** {question.explanation}")
+            st.markdown('</div>', unsafe_allow_html=True)
+        
+        st.markdown('</div>', unsafe_allow_html=True)
+        st.markdown("---")
+
+# Pindahkan hasil job generate yang sudah selesai ke session state
+def collect_generation_job():
+    job_id = st.session_state.generation_job_id
+    if job_id is None:
+        return
+    job = jobs.get_job(job_id)
+    if job is not None and not job.finished:
+        return
+
+    st.session_state.generation_job_id = None
+    if job is None:
+        return
+    jobs.forget_job(job_id)
+    st.session_state.generation_messages = job.reporter.drain()
+    if job.status == "error":
+        st.session_state.generation_messages.append(("error", f"Gagal generate soal: {job.error}"))
+        return
+
+    questions = job.questions
+    save_to_question_bank(job, questions)
+    set_generated_questions(questions, generation_seconds=job.duration)
+    source = st.session_state.generation_source
+    st.session_state.questions_source = source
+    if source is not None and source["previous_ids"] is not None:
+        kept = sum(q.question_id in source["previous_ids"] for q in questions)
+        st.session_state.generation_messages.append(
+            ("success", f"♻️ {kept} soal dipertahankan, {len(questions) - kept} soal baru dari bagian materi "
+                        f"yang berubah (seed: {job.seed})")
+        )
+        return
+    st.session_state.generation_messages.append(
+        ("success", f"✅ Berhasil generate {len(questions)} soal! (seed: {job.seed})")
+    )
+
+# Materi dan bagian-bagiannya saat set soal dibuat, untuk generate ulang sebagian setelah materi diedit
+def material_source(processor: MaterialProcessor, previous_ids: set = None) -> Dict:
+    return {
+        "name": processor.material_name,
+        "material_hash": processor.material_hash,
+        "sections": processor.section_keys(),
+        "previous_ids": previous_ids,
+    }
+
+# Tampilkan set soal di semua tab
+def set_generated_questions(questions: List[Question], generation_seconds: float = None):
+    # Soal disimpan per kolom di session state, objek Question dibuat hanya saat ditampilkan
+    questions = QuestionStore(questions)
+    st.session_state.generated_questions = questions
+    st.session_state.questions_generated = True
+    st.session_state.analytics_data = st.session_state.dashboard_manager.create_analytics(
+        questions, generation_seconds=generation_seconds
+    )
+    # Hasil kuis dan kunci jawaban berlaku untuk satu set soal
+    st.session_state.quiz_stats = QuizStatistics(len(questions))
+    st.session_state.answer_key = AnswerKey(questions)
+    st.session_state.quiz_report = None
+
+# Catat hasil penilaian ke statistik kuis, hitung ulang kesulitan soal dari akurasinya, lalu perbarui analytics
+def record_quiz_report(report: ScoreReport):
+    questions = st.session_state.generated_questions
+    quiz_stats = st.session_state.quiz_stats
+    quiz_stats.add(report)
+    st.session_state.dashboard_manager.update_quiz_analytics(st.session_state.analytics_data, questions, quiz_stats)
+
+# Mode kuis untuk siswa: jawab semua soal lalu nilai langsung
+def render_quiz(questions: QuestionStore):
+    with st.form("quiz_form"):
+        student = st.text_input("Nama siswa:", key="quiz_student")
+        answers = []
+        for i, question in enumerate(questions):
+            st.markdown(f"**{i + 1}. {question.question_text}**")
+            answers.append(st.radio(
+                "Jawaban:", range(len(question.options)), index=None, label_visibility="collapsed",
+                format_func=lambda j, options=question.options: f"{chr(65 + j)}. {options[j]}",
+                key=f"quiz_answer_{question.question_id or i}"
+            ))
+        submitted = st.form_submit_button("✅ Kumpulkan Jawaban", type="primary")
+    if not submitted:
+        return
+
+    with st.session_state.tracer.span("quiz_scoring"):
+        report = score_answers(questions, answers, student=student, key=st.session_state.answer_key)
+    record_quiz_report(report)
+    results = report.results(0, questions)
+    summary = st.session_state.dashboard_manager.analyze_quiz_results(results)
+    st.success(f"🎉 Nilai {student or 'kamu'}: {summary['correct_answers']}/{summary['total_questions']} "
+               f"({summary['accuracy']:.0f}%) - {summary['performance']}")
+    for i, result in enumerate(results):
+        if not result["is_correct"]:
+            st.write(f"❌ Soal #{i + 1}: jawaban benar **{result['correct_answer']}**")
+
+# Nilai jawaban satu kelas dari file JSONL sekaligus
+def render_bulk_scoring(questions: QuestionStore):
+    st.caption('Satu baris per siswa, misalnya {"student": "Andi", "answers": ["A", "C", "B"]} atau '
+               '{"student": "Budi", "answers": {"<id soal>": "D"}}. Jawaban boleh huruf, indeks opsi, atau teks opsi.')
+    submissions = st.file_uploader("Upload jawaban siswa (JSONL)", type=["jsonl"], key="quiz_submissions")
+    if submissions is not None and st.button("📊 Nilai Semua Jawaban"):
+        start = time.perf_counter()
+        with st.session_state.tracer.span("quiz_scoring"):
+            lines = submissions.getvalue().decode("utf-8-sig", errors="replace").splitlines()
+            report = score_submissions(questions, lines, key=st.session_state.answer_key)
+        record_quiz_report(report)
+        st.session_state.quiz_report = (report, time.perf_counter() - start)
+
+    if st.session_state.quiz_report is None:
+        return
+    report, seconds = st.session_state.quiz_report
+    for error in report.errors[:5]:
+        st.warning(f"Dilewati: {error}")
+    col1, col2, col3 = st.columns(3)
+    col1.metric("Jumlah Siswa", len(report))
+    col2.metric("Rata-rata Nilai", f"{report.percentages.mean():.1f}" if len(report) else "N/A")
+    col3.metric("Lama Penilaian", f"{seconds * 1000:.0f} ms")
+    scores = report.to_pandas()
+    st.dataframe(scores, width="stretch", hide_index=True)
+    st.download_button("📥 Download Nilai (CSV)", scores.to_csv(index=False).encode("utf-8"),
+                       file_name="nilai_kuis.csv", mime="text/csv")
+
+# Catat hasil job ke bank soal agar materi yang sama tidak perlu digenerate ulang
+def save_to_question_bank(job: jobs.GenerationJob, questions: List[Question]):
+    if not job.material_digest:
+        return
+    bank = st.session_state.question_bank
+    processor = st.session_state.material_processor
     try:
-        if file_type == "csv":
-            if isinstance(data, list) and data:
-                df = pd.DataFrame(data)
-                csv = df.to_csv(index=False, encoding='utf-8')
-                b64 = base64.b64encode(csv.encode()).decode()
-                href = f'<a href="data:file/csv;base64,{b64}" download="{filename}.csv">📥 Download CSV</a>'
-                return href
-        elif file_type == "json":
-            json_str = json.dumps(data, indent=2, ensure_ascii=False)
-            b64 = base64.b64encode(json_str.encode()).decode()
-            href = f'<a href="data:application/json;base64,{b64}" download="{filename}.json">📥 Download JSON</a>'
-            return href
-        elif file_type == "txt":
-            b64 = base64.b64encode(data.encode()).decode()
-            href = f'<a href="data:file/txt;base64,{b64}" download="{filename}.txt">📥 Download TXT</a>'
-            return href
+        if processor.material_hash == job.material_digest:
+            bank.save_material(job.material_digest, processor.material_name, len(processor.text_content),
+                               processor.preview_text, processor.get_key_concepts())
+        bank.save_generation(job.material_digest, job.total, job.seed, job.generator_key, questions)
     except Exception as e:
-        st.error(f"Error creating download link: {e}")
-        return ""
+        st.session_state.generation_messages.append(("warning", f"Soal tidak tersimpan di bank soal: {e}"))
+
+# Progress job generate, diperbarui tiap detik tanpa menjalankan ulang seluruh halaman
+@st.fragment(run_every=1)
+def render_generation_progress():
+    job = jobs.get_job(st.session_state.generation_job_id)
+    if job is None or job.finished:
+        # Job selesai, jalankan ulang halaman agar hasilnya dipindahkan ke session state
+        st.rerun()
+    questions = job.snapshot()
+    st.progress(job.progress, text=f"⏳ AI sedang generate soal... {len(questions)}/{job.total}")
+    for i, question in enumerate(questions):
+        render_question(i, question, st.session_state.show_answers)
+
+# Proses beberapa file sekaligus dengan progress per file
+def process_course_files(processor: MaterialProcessor, uploaded_files: List, weights: List[float]) -> bool:
+    progress = st.empty()
+
+    def on_file_done(name: str, done: int, total: int):
+        progress.progress(done / total, text=f"📄 {name} selesai ({done}/{total} file)")
+
+    processed = processor.process_materials(uploaded_files, weights, progress_callback=on_file_done)
+    progress.empty()
+    return processed
+
+# Daftar file course beserta bobot dan jumlah soal dari setiap file
+def render_course_files(course, num_questions: int):
+    quotas = course.quotas(num_questions)
+    with st.expander(f"📚 {len(course.files)} file materi digabung"):
+        st.dataframe(
+            [{"File": f.name, "Bobot": f.weight, "Kalimat": len(f.document.meaningful_sentences()), "Kuota soal": quota}
+             for f, quota in zip(course.files, quotas)],
+            width="stretch", hide_index=True
+        )
+
+# Riwayat bank soal per hari dan per konsep, dari tabel ringkasan bank; dibuat ulang hanya jika ada set soal baru
+def render_bank_history(bank: QuestionBank, figures: FigureCache):
+    version = bank.version()
+    if not version:
+        return
+    st.subheader("📚 Riwayat Bank Soal")
+    frame = figures.get("bank_stats", version, lambda: bank_stats_frame(bank.question_stats()))
+    col1, col2 = st.columns(2)
+    with col1:
+        st.plotly_chart(figures.get("bank_timeline", version, lambda: bank_timeline_figure(frame)),
+                        width="stretch")
+    with col2:
+        st.plotly_chart(figures.get("bank_concepts", version, lambda: bank_concept_figure(frame)),
+                        width="stretch")
+
+# Rincian waktu per tahap, kenaikan peak memori, dan hit rate cache dari tracer sesi
+def render_performance_panel(tracer: Tracer):
+    st.subheader("⏱️ Performa per Tahap")
+    data = tracer.snapshot()
+    if not data["stages"] and not data["caches"]:
+        st.caption("Belum ada data, upload materi atau generate soal terlebih dahulu")
+        return
+
+    if data["stages"]:
+        st.dataframe(
+            [{
+                "Tahap": stage["stage"],
+                "Jumlah": stage["count"],
+                "Total (s)": round(stage["total_seconds"], 4),
+                "Rata-rata (ms)": round(stage["mean_seconds"] * 1000, 3),
+                "Maks (ms)": round(stage["max_seconds"] * 1000, 3),
+                "Naik peak RSS (MB)": round(stage["rss_growth_bytes"] / (1024 * 1024), 1),
+            } for stage in data["stages"]],
+            width="stretch", hide_index=True
+        )
+        st.caption("Tahap `generate` mencakup tahap di dalamnya (kalimat, konsep, soal, dedup, LLM)")
+        # plotly baru dimuat saat grafik pertama kali ditampilkan
+        import plotly.express as px
+        fig = px.bar(
+            x=[stage["total_seconds"] for stage in data["stages"]],
+            y=[stage["stage"] for stage in data["stages"]],
+            orientation="h",
+            labels={"x": "Total waktu (s)", "y": "Tahap"},
+            title="Total Waktu per Tahap"
+        )
+        fig.update_yaxes(autorange="reversed")
+        st.plotly_chart(fig, width="stretch")
+
+    columns = st.columns(len(data["caches"]) + 1)
+    for column, cache in zip(columns, data["caches"]):
+        column.metric(f"Cache {cache['cache']}", f"{cache['hit_rate'] * 100:.0f}%",
+                      help=f"{cache['hits']} hit / {cache['misses']} miss")
+    if data["peak_rss_bytes"] is not None:
+        columns[-1].metric("Peak RSS proses", f"{data['peak_rss_bytes'] / (1024 * 1024):.0f} MB")
+
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        st.download_button("📥 Metrik JSON", data=tracer.to_json(), file_name="metrics.json",
+                           mime="application/json", on_click="ignore", width="stretch")
+    with col2:
+        st.download_button("📥 Metrik OpenMetrics", data=tracer.to_openmetrics(), file_name="metrics.txt",
+                           mime="application/openmetrics-text; version=1.0.0; charset=utf-8",
+                           on_click="ignore", width="stretch")
+    with col3:
+        if st.button("🧹 Reset Metrik", width="stretch"):
+            tracer.reset()
+            st.rerun()
+
+# Bank soal lokal, lokasi file bisa diatur lewat environment variable QUESTION_BANK_PATH
+def load_question_bank() -> QuestionBank:
+    return QuestionBank(os.environ.get("QUESTION_BANK_PATH", "question_bank.db"))
+
+# Mesin LLM dari environment variable (None jika tidak dikonfigurasi). Satu instance untuk semua sesi agar batas
+# request/token per menit berlaku untuk semua generate di proses server ini, termasuk job background.
+@st.cache_resource
+def load_llm_backend() -> Optional[LLMBackend]:
+    return LLMBackend.from_env()
+
+# Cache ekstraksi per file dan per bagian materi, dipakai bersama semua sesi di proses server ini.
+# Materi yang sama cukup diekstrak dan dianalisis sekali berapa pun jumlah pengguna yang mengupload,
+# dan total memorinya dibatasi; soal hasil generate tetap milik masing-masing sesi.
+@st.cache_resource
+def load_shared_caches() -> Tuple[ExtractionCache, ExtractionCache]:
+    return ExtractionCache(256 * 1024 * 1024), ExtractionCache(128 * 1024 * 1024)
+
+# Scorer konsep, memakai tabel IDF korpus jika disediakan lewat environment variable CONCEPT_IDF_TABLE.
+# Tidak berubah setelah dibuat, jadi satu instance dipakai semua sesi.
+@st.cache_resource
+def load_concept_scorer() -> ConceptScorer:
+    idf_path = os.environ.get("CONCEPT_IDF_TABLE")
+    if idf_path and os.path.exists(idf_path):
+        return ConceptScorer.from_file(idf_path)
+    return ConceptScorer()
 
 # Main function untuk aplikasi
 def main():
@@ -515,35 +454,99 @@ def main():
     st.markdown("---")
 
     # Inisialisasi session state
+    if 'tracer' not in st.session_state:
+        st.session_state.tracer = Tracer()
     if 'material_processor' not in st.session_state:
-        st.session_state.material_processor = MaterialProcessor()
+        extraction_cache, section_cache = load_shared_caches()
+        st.session_state.material_processor = MaterialProcessor(
+            cache=extraction_cache, section_cache=section_cache,
+            concept_scorer=load_concept_scorer(), tracer=st.session_state.tracer
+        )
     if 'question_generator' not in st.session_state:
-        st.session_state.question_generator = AdvancedQuestionGenerator()
+        st.session_state.question_generator = AdvancedQuestionGenerator(
+            concept_scorer=load_concept_scorer(), tracer=st.session_state.tracer
+        )
+    if 'question_bank' not in st.session_state:
+        st.session_state.question_bank = load_question_bank()
+    if 'llm_backend' not in st.session_state:
+        st.session_state.llm_backend = load_llm_backend()
     if 'dashboard_manager' not in st.session_state:
         st.session_state.dashboard_manager = DashboardManager()
     if 'questions_generated' not in st.session_state:
         st.session_state.questions_generated = False
     if 'generated_questions' not in st.session_state:
-        st.session_state.generated_questions = []
+        st.session_state.generated_questions = QuestionStore()
     if 'show_answers' not in st.session_state:
         st.session_state.show_answers = False
     if 'analytics_data' not in st.session_state:
         st.session_state.analytics_data = {}
+    if 'figure_cache' not in st.session_state:
+        st.session_state.figure_cache = FigureCache()
+    if 'generation_job_id' not in st.session_state:
+        st.session_state.generation_job_id = None
+    if 'generation_messages' not in st.session_state:
+        st.session_state.generation_messages = []
+    if 'quiz_stats' not in st.session_state:
+        st.session_state.quiz_stats = QuizStatistics(len(st.session_state.generated_questions))
+        st.session_state.answer_key = AnswerKey(st.session_state.generated_questions)
+        st.session_state.quiz_report = None
+    if 'questions_source' not in st.session_state:
+        st.session_state.questions_source = None
+    if 'generation_source' not in st.session_state:
+        st.session_state.generation_source = None
+
+    # Ambil hasil generate dari background job jika sudah selesai
+    collect_generation_job()
 
     # Sidebar untuk upload file dan pengaturan
     with st.sidebar:
         st.header("📤 Upload Materi")
-        uploaded_file = st.file_uploader(
+        uploaded_files = st.file_uploader(
             "Pilih file materi Anda",
             type=['pdf', 'docx', 'txt'],
-            help="Upload file materi ajar dalam format PDF, DOCX, atau TXT"
+            accept_multiple_files=True,
+            help="Upload satu atau beberapa file materi ajar (misalnya semua handout satu mata kuliah) "
+                 "dalam format PDF, DOCX, atau TXT"
         )
+        # Bobot file menentukan pengaruhnya pada konsep kunci gabungan dan jumlah soal dari file tersebut
+        file_weights = [1.0] * len(uploaded_files)
+        if len(uploaded_files) > 1:
+            with st.expander("⚖️ Bobot per file"):
+                file_weights = [
+                    st.number_input(f.name, min_value=0.0, max_value=10.0, value=1.0, step=0.5,
+                                    key=f"file_weight_{i}_{f.name}")
+                    for i, f in enumerate(uploaded_files)
+                ]
         st.markdown('</div>', unsafe_allow_html=True)
         st.markdown("---")
 
         st.header("⚙️ Pengaturan")
         num_questions = st.slider("Jumlah soal:", 5, 20, 10)
+        seed = st.number_input(
+            "Seed (0 = acak):", min_value=0, max_value=2 ** 32 - 1, value=0, step=1,
+            help="Gunakan seed yang sama untuk mendapatkan set soal yang sama dari materi yang sama"
+        )
         include_explanations = st.checkbox("Sertakan penjelasan jawaban", value=True)
+
+        # Mesin LLM hanya tersedia jika OPENAI_API_KEY / OPENAI_BASE_URL diset
+        backend_options = ["Template"] + (["LLM"] if st.session_state.llm_backend is not None else [])
+        backend_choice = st.selectbox(
+            "Mesin soal:", backend_options,
+            help="Template: cepat dan offline. LLM: soal dibuat model bahasa lewat API yang kompatibel dengan OpenAI"
+        )
+        if st.session_state.generation_job_id is None:
+            st.session_state.question_generator.backend = (
+                st.session_state.llm_backend if backend_choice == "LLM" else TemplateBackend()
+            )
+        use_question_bank = st.checkbox(
+            "📚 Pakai bank soal jika tersedia", value=True,
+            help="Dengan seed selain 0, ambil set soal yang pernah dibuat dari materi dan seed yang sama "
+                 "alih-alih generate ulang"
+        )
+        avoid_history = st.checkbox(
+            "🆕 Hindari soal yang sudah ada di bank", value=False,
+            help="Generate set baru tanpa soal yang mirip dengan soal tersimpan dari materi yang sama"
+        )
         st.markdown('</div>', unsafe_allow_html=True)
         
         # Quick stats di sidebar
@@ -557,14 +560,26 @@ def main():
                 for diff, count in diff_data.items():
                     st.write(f"- {diff.capitalize()}: {count} soal")
 
+        # Statistik cache ekstraksi materi (bersama semua sesi)
+        cache_stats = st.session_state.material_processor.cache.stats()
+        st.markdown("---")
+        st.caption(
+            f"🗂️ Cache ekstraksi (semua sesi): {cache_stats['hits']} hit / {cache_stats['misses']} miss "
+            f"({cache_stats['hit_rate']:.0f}%), {cache_stats['entries']} file, {cache_stats['size_mb']:.1f} MB"
+        )
+        bank_stats = st.session_state.question_bank.stats()
+        st.caption(f"📚 Bank soal: {bank_stats['questions']} soal dari {bank_stats['materials']} materi")
+
     # Tab utama
-    tab1, tab2, tab3, tab4 = st.tabs(["🏠 Dashboard", "🎯 Generate Soal", "📊 Analytics", "📥 Download"])
+    tab1, tab2, tab_quiz, tab3, tab4 = st.tabs(
+        ["🏠 Dashboard", "🎯 Generate Soal", "📝 Kuis", "📊 Analytics", "📥 Download"]
+    )
     
     with tab1:
         # Dashboard utama dengan metrics cards
         col1, col2, col3, col4 = st.columns(4)
         with col1:
-            st.metric("Status Generator", "Ready" if uploaded_file else "Waiting")
+            st.metric("Status Generator", "Ready" if uploaded_files else "Waiting")
             st.markdown('</div>', unsafe_allow_html=True)
         
         with col2:
@@ -575,8 +590,8 @@ def main():
             st.markdown('</div>', unsafe_allow_html=True)
         
         with col3:
-            file_type = uploaded_file.type if uploaded_file else "None"
-            st.metric("Format File", file_type.split('/')[-1].upper() if uploaded_file else "None")
+            file_types = sorted({f.name.split('.')[-1].upper() for f in uploaded_files})
+            st.metric("Format File", ", ".join(file_types) if uploaded_files else "None")
             st.markdown('</div>', unsafe_allow_html=True)
         
         with col4:
@@ -584,11 +599,18 @@ def main():
             st.markdown('</div>', unsafe_allow_html=True)
         
         # Preview materi
-        if uploaded_file:
+        if uploaded_files:
             st.subheader("📖 Preview Materi")
             with st.spinner("Memproses materi..."):
-                if st.session_state.material_processor.process_material(uploaded_file):
-                    preview_text = st.session_state.material_processor.text_content[:300] + "..."
+                processor = st.session_state.material_processor
+                if len(uploaded_files) == 1:
+                    processed = processor.process_material(uploaded_files[0])
+                else:
+                    processed = process_course_files(processor, uploaded_files, file_weights)
+                if processed:
+                    if processor.course is not None:
+                        render_course_files(processor.course, num_questions)
+                    preview_text = st.session_state.material_processor.preview_text + "..."
                     st.text_area("Preview Materi:", preview_text, height=150, key="preview_area")
                     
                     # Tampilkan key concepts
@@ -603,25 +625,71 @@ def main():
         col1, col2, col3 = st.columns(3)
         
         with col1:
-            if st.button("🎯 Generate Sekarang", type="primary", use_container_width=True):
-                if uploaded_file:
-                    with st.spinner("AI sedang generate soal..."):
-                        questions = st.session_state.question_generator.generate_questions_advanced(
-                            st.session_state.material_processor.text_content, 
-                            num_questions
-                        )
-                        st.session_state.generated_questions = questions
-                        st.session_state.questions_generated = True
-                        st.session_state.analytics_data = st.session_state.dashboard_manager.create_analytics(questions)
-                        st.success(f"✅ Berhasil generate {len(questions)} soal!")
+            processor = st.session_state.material_processor
+            source = st.session_state.questions_source
+            # File yang sama diupload ulang setelah diedit: soal dari bagian yang tidak berubah bisa dipertahankan
+            update_changed = False
+            if uploaded_files and st.session_state.questions_generated and source is not None and \
+                    source["name"] == processor.material_name and source["material_hash"] != processor.material_hash:
+                update_changed = st.checkbox(
+                    "♻️ Generate ulang hanya soal dari bagian yang berubah", value=True,
+                    help="Soal dari bagian materi yang tidak berubah (beserta id-nya) dipertahankan"
+                )
+            if st.button("🎯 Generate Sekarang", type="primary", width="stretch"):
+                stored = None
+                # Bank soal hanya dipakai untuk seed tertentu; seed 0 (acak) selalu generate set baru lalu disimpan
+                lookup_bank = bool(uploaded_files and seed and use_question_bank and not avoid_history and
+                                   not update_changed)
+                if lookup_bank and st.session_state.generation_job_id is None:
+                    stored = st.session_state.question_bank.find_generation(
+                        processor.material_hash, num_questions,
+                        st.session_state.question_generator.generation_key, seed=int(seed)
+                    )
+                if st.session_state.generation_job_id is not None:
+                    st.info("⏳ Generate soal sebelumnya masih berjalan")
+                elif stored is not None:
+                    stored_seed, questions = stored
+                    st.session_state.tracer.record_cache("question_bank", hits=1)
+                    set_generated_questions(questions)
+                    st.session_state.questions_source = material_source(processor)
+                    st.session_state.generation_messages = [
+                        ("success", f"📚 {len(questions)} soal diambil dari bank soal (seed: {stored_seed})")
+                    ]
+                elif uploaded_files:
+                    if lookup_bank:
+                        st.session_state.tracer.record_cache("question_bank", misses=1)
+                    previous_questions = list(st.session_state.generated_questions) if update_changed else None
+                    st.session_state.generation_source = material_source(
+                        processor, {q.question_id for q in previous_questions} if update_changed else None
+                    )
+                    # Generate berjalan di background, interaksi widget tidak membatalkannya
+                    job = jobs.submit_generation(
+                        st.session_state.question_generator,
+                        st.session_state.material_processor.text_content, 
+                        num_questions,
+                        document=st.session_state.material_processor.document,
+                        seed=int(seed) if seed else None,
+                        material_digest=processor.material_hash,
+                        history=st.session_state.question_bank.question_texts(processor.material_hash)
+                        if avoid_history else None,
+                        previous_questions=previous_questions,
+                        previous_sections=source["sections"] if update_changed else None
+                    )
+                    st.session_state.generation_job_id = job.job_id
+                    st.session_state.generation_messages = []
+                    st.info("⏳ AI sedang generate soal, lihat progresnya di tab 'Generate Soal'")
                 else:
                     st.warning("⚠️ Silakan upload materi terlebih dahulu")
+
+            # Pesan dari job generate terakhir
+            for level, message in st.session_state.generation_messages:
+                getattr(st, level)(message)
         
         with col2:
             if st.session_state.questions_generated:
-                if st.button("🔄 Generate Ulang", use_container_width=True):
+                if st.button("🔄 Generate Ulang", width="stretch"):
                     st.session_state.questions_generated = False
-                    st.session_state.generated_questions = []
+                    st.session_state.generated_questions = QuestionStore()
                     st.rerun()
         
         with col3:
@@ -630,7 +698,9 @@ def main():
     
     with tab2:
         st.header("🎯 Soal yang Digenerate")
-        if not st.session_state.questions_generated:
+        if st.session_state.generation_job_id is not None:
+            render_generation_progress()
+        elif not st.session_state.questions_generated:
             st.info("👈 Upload materi dan klik 'Generate Sekarang' di tab Dashboard")
         else:
             # Toggle untuk tampilkan/sembunyikan jawaban
@@ -641,54 +711,51 @@ def main():
             
             # Tampilkan semua soal
             for i, question in enumerate(st.session_state.generated_questions):
-                with st.container():
-                    
-                    # Header soal dengan metadata
-                    col1, col2, col3 = st.columns([3, 1, 1])
-                    with col1:
-                        st.markdown(f"**Soal #{i+1}** - **{question.difficulty.upper()}**")
-                    with col2:
-                        st.caption(f"Type: {question.question_type}")
-                    with col3:
-                        st.caption(f"Options: {len(question.options)}")
-                    
-                    # Pertanyaan
-                    st.markdown(f"**{question.question_text}**")
-                    
-                    # Opsi jawaban
-                    for j, option in enumerate(question.options):
-                        st.write(f"**{chr(65+j)}.** {option}")
-                    
-                    # Jawaban dan penjelasan jika ditampilkan
-                    if st.session_state.show_answers:
-                        correct_index = question.options.index(question.correct_answer) if question.correct_answer in question.options else 0
-                        st.markdown(f'<div class="correct-answer">', unsafe_allow_html=True)
-                        st.markdown(f"**✅ Jawaban Benar: {chr(65 + correct_index)}. {question.correct_answer}**")
-                        if question.explanation:
-                            st.markdown(f"**💡 Penjelasan:** {question.explanation}")
-                        st.markdown('</div>', unsafe_allow_html=True)
-                    
-                    st.markdown('</div>', unsafe_allow_html=True)
-                    st.markdown("---")
+                render_question(i, question, st.session_state.show_answers)
+
+        # Cari soal yang pernah dibuat dari semua materi
+        with st.expander("🔎 Cari di Bank Soal"):
+            col1, col2 = st.columns([3, 1])
+            with col1:
+                search_text = st.text_input("Kata kunci soal:", key="bank_search_text")
+            with col2:
+                search_difficulty = st.selectbox("Kesulitan:", ["semua", "easy", "medium", "hard"],
+                                                 key="bank_search_difficulty")
+            bank = st.session_state.question_bank
+            difficulty = None if search_difficulty == "semua" else search_difficulty
+            if search_text:
+                results = bank.search(search_text, difficulty=difficulty, limit=20)
+            elif difficulty is not None:
+                results = bank.query(difficulty=difficulty, limit=20)
+            else:
+                results = []
+            for i, question in enumerate(results):
+                render_question(i, question, st.session_state.show_answers)
     
+    with tab_quiz:
+        st.header("📝 Mode Kuis")
+        if not st.session_state.questions_generated:
+            st.info("👈 Generate soal terlebih dahulu untuk memulai kuis")
+        else:
+            render_quiz(st.session_state.generated_questions)
+            st.subheader("📦 Nilai Satu Kelas")
+            render_bulk_scoring(st.session_state.generated_questions)
+
     with tab3:
         st.header("📊 Analytics & Insights")
         if not st.session_state.questions_generated:
             st.info("👈 Generate soal terlebih dahulu untuk melihat analytics")
         else:
-            # Visualisasi data
+            # Visualisasi data; grafik dibuat ulang hanya jika versi agregatnya berubah
+            figures = st.session_state.figure_cache
+            aggregates = st.session_state.analytics_data["aggregates"]
             col1, col2 = st.columns(2)
             with col1:
                 # Pie chart untuk distribusi kesulitan
                 diff_data = st.session_state.analytics_data.get("difficulty_distribution", {})
                 if diff_data:
-                    fig = px.pie(
-                        values=list(diff_data.values()),
-                        names=[d.upper() for d in diff_data.keys()],
-                        title="📈 Distribusi Tingkat Kesulitan",
-                        color_discrete_sequence=px.colors.sequential.RdBu
-                    )
-                    st.plotly_chart(fig, use_container_width=True)
+                    fig = figures.get("difficulty", aggregates.version, lambda: difficulty_figure(diff_data))
+                    st.plotly_chart(fig, width="stretch")
             
             # Detailed statistics
             st.subheader("📋 Detail Statistics")
@@ -705,6 +772,23 @@ def main():
                 avg_difficulty = st.session_state.dashboard_manager.calculate_average_difficulty(diff_data)
                 st.metric("Rata-rata Kesulitan", avg_difficulty)
                 st.metric("Waktu Generate", st.session_state.analytics_data.get("generation_time", "N/A"))
+                generation_seconds = st.session_state.analytics_data.get("generation_seconds")
+                st.metric("Lama Generate", f"{generation_seconds:.2f} s" if generation_seconds is not None else "Bank soal")
+
+            # Hasil kuis: kesulitan soal di atas dihitung dari akurasi jawaban siswa jika datanya cukup
+            quiz_results = st.session_state.analytics_data.get("quiz_results")
+            if quiz_results and quiz_results["submissions"]:
+                st.subheader("📝 Hasil Kuis")
+                col1, col2, col3 = st.columns(3)
+                col1.metric("Jawaban Masuk", quiz_results["submissions"])
+                col2.metric("Akurasi Rata-rata", f"{quiz_results['accuracy']:.1f}%")
+                col3.metric("Performa", quiz_results["performance"])
+                fig = figures.get("quiz_accuracy", (aggregates.version, quiz_results["submissions"]),
+                                  lambda: quiz_accuracy_figure(quiz_results["question_accuracy"]))
+                st.plotly_chart(fig, width="stretch")
+
+        render_bank_history(st.session_state.question_bank, st.session_state.figure_cache)
+        render_performance_panel(st.session_state.tracer)
     
     with tab4:
         st.header("📥 Download Soal")
@@ -713,55 +797,27 @@ def main():
         else:
             st.subheader("💾 Pilih Format Download")
             
-            # Persiapan data untuk download
-            questions_data = [q.to_dict() for q in st.session_state.generated_questions]
-            
-            # Format CSV
-            csv_data = []
-            for i, q in enumerate(questions_data):
-                row = {
-                    "No": i+1,
-                    "Soal": q["question"],
-                    "Jawaban_Benar": q["correct_answer"],
-                    "Penjelasan": q.get("explanation", ""),
-                    "Tipe": q["type"],
-                    "Kesulitan": q["difficulty"]
-                }
-                # Tambahkan opsi
-                for j, option in enumerate(q['options']):
-                    row[f"Opsi_{chr(65+j)}"] = option
-                csv_data.append(row)
-            
-            # Format Text
-            text_content = "SOAL DAN JAWABAN\n================\n\n"
-            for i, q in enumerate(questions_data):
-                text_content += f"{i+1}. {q['question']}\n"
-                for j, option in enumerate(q['options']):
-                    text_content += f"   {chr(65+j)}. {option}\n"
-                text_content += f"   ✅ Jawaban: {q['correct_answer']}\n"
-                if q.get('explanation'):
-                    text_content += f"   💡 Penjelasan: {q['explanation']}\n"
-                text_content += "\n"
-            
-            # Tombol download
+            questions = st.session_state.generated_questions
+
+            # Tombol download, file dibuat hanya untuk format yang diklik
             col1, col2, col3 = st.columns(3)
             with col1:
-                st.markdown(create_download_link(csv_data, "soal_dan_jawaban", "csv"), unsafe_allow_html=True)
+                render_download_button(questions, "soal_dan_jawaban", "csv")
             
             with col2:
-                st.markdown(create_download_link(questions_data, "soal_dan_jawaban", "json"), unsafe_allow_html=True)
+                render_download_button(questions, "soal_dan_jawaban", "json")
             
             with col3:
-                st.markdown(create_download_link(text_content, "soal_dan_jawaban", "txt"), unsafe_allow_html=True)
+                render_download_button(questions, "soal_dan_jawaban", "txt")
             
             st.markdown('</div>', unsafe_allow_html=True)
             
             # Preview data yang akan didownload
             st.subheader("👀 Preview Data")
             with st.expander("Lihat Preview"):
-                if questions_data:
+                if questions:
                     # Tampilkan preview 2 soal pertama
-                    st.json(questions_data[:2])
+                    st.json([q.to_dict() for q in questions[:2]])
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
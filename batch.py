@@ -0,0 +1,256 @@
+"""Generate soal secara batch tanpa UI Streamlit.
+
+Contoh:
+    python batch.py materi/ "arsip/**/*.pdf" -o bank_soal.jsonl -n 10 --workers 4
+    python batch.py materi/ -o bank_soal.jsonl --resume
+    python batch.py materi/ -o idf.json --build-idf
+    python batch.py materi/ -o bank_soal.jsonl --idf-table idf.json
+    python batch.py materi/ -o bank_soal.jsonl --bank question_bank.db
+    OPENAI_API_KEY=... python batch.py materi/ -o bank_soal.jsonl --backend llm --workers 1
+
+Setiap file menghasilkan satu baris JSON di file output. Dengan --resume,
+file yang sudah tercatat di output dilewati sehingga batch yang terhenti
+bisa dilanjutkan.
+"""
+import argparse
+import glob
+import io
+import json
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Dict, Iterable, Iterator, List, Set
+
+import extractors
+from concept_scoring import ConceptScorer, build_idf_table, save_idf_table
+from generator import AdvancedQuestionGenerator
+from processing import ExtractionCache, worker_processor
+from question_backends import LLMBackend, RateLimiter, TemplateBackend
+from question_bank import QuestionBank
+from reporting import CollectingReporter, logger
+
+SUPPORTED_EXTENSIONS = ("pdf", "docx", "txt")
+
+# Processor dan generator milik setiap proses worker
+_worker_reporter = None
+_worker_processor = None
+_worker_generator = None
+_worker_bank = None
+
+
+# File lokal dengan antarmuka yang sama seperti file upload Streamlit
+class LocalFile(io.BytesIO):
+    def __init__(self, path: str):
+        with open(path, "rb") as f:
+            super().__init__(f.read())
+        self.name = os.path.basename(path)
+
+
+# Cari semua file materi dari daftar direktori, file, atau pola glob
+def find_material_files(inputs: Iterable[str]) -> List[str]:
+    paths = []
+    for item in inputs:
+        if os.path.isdir(item):
+            candidates = glob.glob(os.path.join(item, "**", "*"), recursive=True)
+        else:
+            candidates = glob.glob(item, recursive=True)
+        for path in candidates:
+            if os.path.isfile(path) and path.rsplit(".", 1)[-1].lower() in SUPPORTED_EXTENSIONS:
+                paths.append(os.path.abspath(path))
+    return sorted(set(paths))
+
+
+# Siapkan processor dan generator sekali per proses worker
+def _init_worker(idf_table: str = None, backend: str = "template", bank_path: str = None, workers: int = 1):
+    global _worker_reporter, _worker_processor, _worker_generator, _worker_bank
+    _worker_reporter = CollectingReporter()
+    concept_scorer = ConceptScorer.from_file(idf_table) if idf_table else ConceptScorer()
+    _worker_processor = worker_processor(reporter=_worker_reporter, concept_scorer=concept_scorer)
+    _worker_generator = AdvancedQuestionGenerator(reporter=_worker_reporter, concept_scorer=concept_scorer,
+                                                  backend=load_backend(backend, workers))
+    _worker_bank = QuestionBank(bank_path) if bank_path else None
+
+
+# Backend soal untuk mode batch, LLM dikonfigurasi lewat OPENAI_API_KEY / OPENAI_BASE_URL / OPENAI_MODEL.
+# Batas request/token per menit dibagi rata ke semua proses worker agar totalnya tetap sesuai batas.
+def load_backend(name: str, workers: int = 1):
+    if name == "llm":
+        backend = LLMBackend.from_env()
+        if backend is None:
+            raise RuntimeError("Backend LLM membutuhkan OPENAI_API_KEY atau OPENAI_BASE_URL")
+        if workers > 1:
+            backend.rate_limiter = RateLimiter(backend.requests_per_minute / workers,
+                                               backend.tokens_per_minute / workers)
+        return backend
+    return TemplateBackend()
+
+
+# Proses satu file menjadi satu record hasil
+def process_file(path: str, num_questions: int, seed: int = None) -> Dict:
+    if _worker_processor is None:
+        _init_worker()
+    record = {"source": path, "material_hash": "", "seed": None, "status": "ok", "from_bank": False,
+              "questions": [], "messages": []}
+    try:
+        material_file = LocalFile(path)
+        if _worker_bank is not None:
+            # Materi yang sudah ada di bank soal tidak perlu diekstrak maupun digenerate ulang
+            with extractors.read_file_view(material_file) as view:
+                material_hash = ExtractionCache.make_key(view, path.rsplit(".", 1)[-1].lower())
+            stored = _worker_bank.find_generation(material_hash, num_questions, _worker_generator.generation_key, seed)
+            if stored is not None:
+                record.update(material_hash=material_hash, seed=stored[0], from_bank=True,
+                              questions=[q.to_dict() for q in stored[1]])
+                return record
+        if _worker_processor.process_material(material_file):
+            questions = _worker_generator.generate_questions_advanced(
+                _worker_processor.text_content,
+                num_questions,
+                document=_worker_processor.document,
+                seed=seed,
+                material_digest=_worker_processor.material_hash
+            )
+            record["seed"] = _worker_generator.last_seed
+            record["questions"] = [q.to_dict() for q in questions]
+            if _worker_bank is not None:
+                _worker_bank.save_material(_worker_processor.material_hash, os.path.basename(path),
+                                           len(_worker_processor.text_content), _worker_processor.preview_text,
+                                           _worker_processor.get_key_concepts())
+                _worker_bank.save_generation(_worker_processor.material_hash, num_questions, record["seed"],
+                                             _worker_generator.generation_key, questions)
+        else:
+            record["status"] = "skipped"
+        record["material_hash"] = _worker_processor.material_hash
+    except Exception as e:
+        record["status"] = "error"
+        _worker_reporter.error(f"Error processing {path}: {e}")
+    finally:
+        record["messages"] = [{"level": level, "message": message} for level, message in _worker_reporter.drain()]
+    return record
+
+
+# Jalankan proses batch dan kirim hasil per file segera setelah selesai
+def iter_batch_results(paths: List[str], num_questions: int = 10, workers: int = None,
+                       seed: int = None, idf_table: str = None, backend: str = "template",
+                       bank_path: str = None) -> Iterator[Dict]:
+    if workers == 1:
+        _init_worker(idf_table, backend, bank_path)
+        for path in paths:
+            yield process_file(path, num_questions, seed)
+        return
+
+    workers = workers or os.cpu_count() or 1
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(idf_table, backend, bank_path, workers),
+                             mp_context=extractors.WORKER_CONTEXT) as executor:
+        futures = {executor.submit(process_file, path, num_questions, seed): path for path in paths}
+        for future in as_completed(futures):
+            try:
+                yield future.result()
+            except Exception as e:
+                # Worker mati (misalnya kehabisan memori), catat sebagai error dan lanjutkan
+                yield {"source": futures[future], "material_hash": "", "seed": None, "status": "error",
+                       "from_bank": False, "questions": [],
+                       "messages": [{"level": "error", "message": f"Worker failed: {e}"}]}
+
+
+# Baca sumber yang sudah selesai dari output sebelumnya, buang baris terakhir yang terpotong
+def load_completed(output_path: str) -> Set[str]:
+    completed = set()
+    if not os.path.exists(output_path):
+        return completed
+
+    valid_size = 0
+    with open(output_path, "rb") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                break
+            if not line.endswith(b"\n"):
+                break
+            valid_size += len(line)
+            # File yang gagal karena error dicoba lagi saat resume
+            if record.get("status") != "error":
+                completed.add(record["source"])
+
+    if valid_size < os.path.getsize(output_path):
+        with open(output_path, "r+b") as f:
+            f.truncate(valid_size)
+    return completed
+
+
+# API utama: proses semua materi dan tulis hasil ke file JSONL
+def generate_batch(inputs: Iterable[str], output_path: str, num_questions: int = 10,
+                   workers: int = None, resume: bool = False, seed: int = None, idf_table: str = None,
+                   backend: str = "template", bank_path: str = None) -> Dict:
+    paths = find_material_files(inputs)
+    completed = load_completed(output_path) if resume else set()
+    pending = [path for path in paths if path not in completed]
+    summary = {"found": len(paths), "skipped_existing": len(paths) - len(pending),
+               "ok": 0, "skipped": 0, "error": 0, "questions": 0}
+
+    with open(output_path, "a" if resume else "w", encoding="utf-8") as output:
+        for record in iter_batch_results(pending, num_questions, workers, seed, idf_table, backend, bank_path):
+            output.write(json.dumps(record, ensure_ascii=False) + "\n")
+            # Flush per record supaya hasil tidak hilang jika proses berhenti mendadak
+            output.flush()
+            os.fsync(output.fileno())
+            summary[record["status"]] += 1
+            summary["questions"] += len(record["questions"])
+            logger.info("%s: %s (%d soal)", record["source"], record["status"], len(record["questions"]))
+
+    return summary
+
+
+# Ambil kandidat konsep satu file untuk tabel IDF korpus
+def extract_terms(path: str) -> List[str]:
+    if _worker_processor is None:
+        _init_worker()
+    try:
+        if _worker_processor.process_material(LocalFile(path)):
+            return _worker_processor.document.term_statistics()[0]
+    except Exception as e:
+        logger.error("Error processing %s: %s", path, e)
+    finally:
+        _worker_reporter.drain()
+    return []
+
+
+# Bangun tabel IDF dari seluruh materi kuliah untuk peringkat konsep tingkat korpus
+def build_corpus_idf(inputs: Iterable[str], output_path: str, workers: int = None) -> Dict:
+    paths = find_material_files(inputs)
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             mp_context=extractors.WORKER_CONTEXT) as executor:
+        table = build_idf_table(terms for terms in executor.map(extract_terms, paths, chunksize=4) if terms)
+    save_idf_table(table, output_path)
+    return {"found": len(paths), "documents": table["num_documents"], "terms": len(table["document_frequency"])}
+
+
+def main(argv: List[str] = None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("inputs", nargs="+", help="Direktori, file, atau pola glob materi (PDF/DOCX/TXT)")
+    parser.add_argument("-o", "--output", required=True, help="File output JSONL")
+    parser.add_argument("-n", "--num-questions", type=int, default=10, help="Jumlah soal per file")
+    parser.add_argument("--workers", type=int, default=None, help="Jumlah proses worker (default: jumlah core)")
+    parser.add_argument("--seed", type=int, default=None, help="Seed generate soal agar hasil bisa diulang")
+    parser.add_argument("--idf-table", default=None, help="Tabel IDF korpus (hasil --build-idf) untuk peringkat konsep")
+    parser.add_argument("--backend", choices=("template", "llm"), default="template",
+                        help="Mesin soal; batas rate LLM dibagi rata ke semua proses worker")
+    parser.add_argument("--bank", default=None,
+                        help="Bank soal SQLite; materi yang sudah ada di bank dipakai ulang, hasil baru disimpan")
+    parser.add_argument("--build-idf", action="store_true", help="Bangun tabel IDF korpus ke file output, bukan generate soal")
+    parser.add_argument("--resume", action="store_true", help="Lanjutkan batch, lewati file yang sudah ada di output")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    if args.build_idf:
+        summary = build_corpus_idf(args.inputs, args.output, args.workers)
+    else:
+        summary = generate_batch(args.inputs, args.output, args.num_questions, args.workers, args.resume,
+                                 args.seed, args.idf_table, args.backend, args.bank)
+    print(json.dumps(summary, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""Benchmark index distractor: waktu membangun index per materi, latensi query kata mirip, dan throughput soal.
+
+Jalankan dari root project:
+    python benchmarks/bench_distractors.py --sizes 100K 1M 10M
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from distractors import DistractorIndex
+from generator import AdvancedQuestionGenerator
+from reporting import CollectingReporter
+from run_benchmarks import format_size, parse_size
+from synthetic import make_text
+from text_pipeline import DocumentModel, clean_text
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", nargs="+", default=["100K", "1M", "10M"])
+    parser.add_argument("--queries", type=int, default=2000)
+    parser.add_argument("--questions", type=int, default=2000)
+    args = parser.parse_args()
+
+    print(f"{'size':>6} {'sentences':>10} {'terms':>6} {'build ms':>9} {'query us':>9} {'cached us':>10} "
+          f"{'blank q/s':>10} {'concept q/s':>12}")
+    for size in args.sizes:
+        document = DocumentModel(clean_text(make_text(parse_size(size))))
+        sentences = document.meaningful_sentences()
+
+        start = time.perf_counter()
+        index = DistractorIndex(sentences)
+        build = time.perf_counter() - start
+
+        # Kata dari kalimat acak, termasuk kata di luar kosakata index
+        rng = random.Random(0)
+        words = [rng.choice(rng.choice(sentences).split()) for _ in range(args.queries)]
+        timings = []
+        for _ in range(2):
+            start = time.perf_counter()
+            for word in words:
+                index.similar_terms(word, 3)
+            timings.append((time.perf_counter() - start) / len(words))
+
+        generator = AdvancedQuestionGenerator(reporter=CollectingReporter())
+        generator.rng.seed(0)
+        generator.get_distractor_index(sentences)
+        start = time.perf_counter()
+        for question_num in range(args.questions):
+            generator.create_question_from_sentence(sentences, question_num)
+        blank_rate = args.questions / (time.perf_counter() - start)
+
+        start = time.perf_counter()
+        generator.generate_questions_advanced(document.text, args.questions, document=document, seed=0)
+        concept_rate = args.questions / (time.perf_counter() - start)
+
+        print(f"{format_size(parse_size(size)):>6} {len(sentences):>10} {len(index.terms):>6} {build * 1000:>9.1f} "
+              f"{timings[0] * 1e6:>9.1f} {timings[1] * 1e6:>10.1f} {blank_rate:>10.0f} {concept_rate:>12.0f}")
+
+
+if __name__ == "__main__":
+    main()
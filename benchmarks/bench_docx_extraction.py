@@ -0,0 +1,95 @@
+"""Benchmark ekstraksi DOCX: jalur lama (paragraf saja, string concat) vs python-docx lengkap vs jalur cepat XML.
+
+Jalankan dari root project:
+    python benchmarks/bench_docx_extraction.py --pages 100 500
+"""
+import argparse
+import functools
+import io
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import docx
+
+import extractors
+from run_benchmarks import peak_rss_mb
+from synthetic import make_docx_pages
+
+
+# Jalur ekstraksi lama, disalin dari MaterialProcessor: hanya doc.paragraphs, tabel dan header terlewat
+def extract_legacy(docx_bytes: bytes) -> str:
+    doc = docx.Document(io.BytesIO(docx_bytes))
+    text = ""
+    for paragraph in doc.paragraphs:
+        text += paragraph.text + "\n"
+    return text
+
+
+def extract_blocks(docx_bytes: bytes, fast: bool) -> str:
+    return "\n".join(extractors.iter_docx_blocks(io.BytesIO(docx_bytes), fast=fast)) + "\n"
+
+
+MODES = {
+    "legacy": extract_legacy,
+    "python-docx": functools.partial(extract_blocks, fast=False),
+    "fast": functools.partial(extract_blocks, fast=True),
+}
+
+
+# Dijalankan di proses anak: kenaikan peak RSS (MB) selama satu mode mengekstrak file
+def _measure_rss(mode: str, path: str):
+    with open(path, "rb") as f:
+        docx_bytes = f.read()
+    before = peak_rss_mb()
+    MODES[mode](docx_bytes)
+    print(peak_rss_mb() - before)
+
+
+# Kenaikan peak RSS (MB) satu mode di proses Python baru, termasuk alokasi C milik lxml yang tidak terlihat tracemalloc
+def peak_rss_growth(mode: str, path: str) -> float:
+    output = subprocess.run([sys.executable, os.path.abspath(__file__), "--measure-rss", mode, path],
+                            check=True, capture_output=True, text=True).stdout
+    return float(output)
+
+
+# Waktu terbaik dari beberapa kali percobaan, beserta hasil terakhir
+def best_time(func, repeat: int):
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pages", type=int, nargs="+", default=[100, 500])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--measure-rss", nargs=2, metavar=("MODE", "PATH"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.measure_rss:
+        _measure_rss(*args.measure_rss)
+        return
+
+    print(f"{'pages':>6} {'mode':<12} {'seconds':>9} {'pages/sec':>10} {'RSS +MB':>8} {'chars':>10}")
+    for num_pages in args.pages:
+        docx_bytes = make_docx_pages(num_pages)
+        with tempfile.NamedTemporaryFile(suffix=".docx", delete=False) as f:
+            f.write(docx_bytes)
+        outputs = {}
+        for name, extract in MODES.items():
+            seconds, outputs[name] = best_time(lambda: extract(docx_bytes), args.repeat)
+            print(f"{num_pages:>6} {name:<12} {seconds:>9.3f} {num_pages / seconds:>10.1f} "
+                  f"{peak_rss_growth(name, f.name):>8.1f} {len(outputs[name]):>10}")
+        os.unlink(f.name)
+        assert outputs["fast"] == outputs["python-docx"], "Jalur cepat berbeda dengan jalur python-docx"
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""Benchmark ekstraksi PDF: jalur lama (satu core, string concat) vs engine paralel.
+
+Jalankan dari root project:
+    python benchmarks/bench_pdf_extraction.py --pages 200 500 --workers 4
+"""
+import argparse
+import io
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import PyPDF2
+
+import extractors
+from synthetic import make_pdf
+
+
+# Jalur ekstraksi lama, disalin dari MaterialProcessor sebelum engine paralel
+def extract_legacy(pdf_bytes: bytes) -> str:
+    pdf_reader = PyPDF2.PdfReader(io.BytesIO(pdf_bytes))
+    text = ""
+    for page in pdf_reader.pages:
+        text += page.extract_text()
+    return text
+
+
+# Jalur baru lewat extractors.iter_pdf_pages
+def extract_engine(pdf_bytes: bytes, workers: int) -> str:
+    return "".join(extractors.iter_pdf_pages(io.BytesIO(pdf_bytes), workers=workers))
+
+
+# Ukur waktu terbaik dari beberapa kali percobaan
+def best_time(func, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pages", type=int, nargs="+", default=[200, 500])
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'pages':>6} {'mode':<22} {'seconds':>9} {'pages/sec':>10}")
+    for num_pages in args.pages:
+        pdf_bytes = make_pdf(num_pages)
+        expected = extract_legacy(pdf_bytes)
+        modes = [
+            ("legacy", lambda: extract_legacy(pdf_bytes)),
+            ("engine workers=1", lambda: extract_engine(pdf_bytes, 1)),
+            (f"engine workers={args.workers}", lambda: extract_engine(pdf_bytes, args.workers)),
+        ]
+        for name, func in modes:
+            assert func() == expected, f"Hasil {name} berbeda dengan jalur lama"
+            seconds = best_time(func, args.repeat)
+            print(f"{num_pages:>6} {name:<22} {seconds:>9.3f} {num_pages / seconds:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
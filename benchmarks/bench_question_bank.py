@@ -0,0 +1,84 @@
+"""Benchmark bank soal SQLite: bulk insert lalu waktu lookup pada jumlah soal besar.
+
+Jalankan dari root project:
+    python benchmarks/bench_question_bank.py --questions 1000000 --db /tmp/bench_bank.db
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from question_bank import QuestionBank
+from questions import Question
+from synthetic import CONCEPTS, make_sentence
+
+QUESTIONS_PER_GENERATION = 10
+GENERATIONS_PER_MATERIAL = 10
+
+
+def make_questions(rng: random.Random):
+    for _ in range(QUESTIONS_PER_GENERATION):
+        concept = rng.choice(CONCEPTS)
+        options = [make_sentence(rng) for _ in range(4)]
+        yield Question(
+            question_text=f"Apa yang dimaksud dengan {concept}? {make_sentence(rng)}",
+            options=options,
+            correct_answer=options[0],
+            explanation=f"Materi menyebutkan: \"{options[0]}\"",
+            difficulty=rng.choice(["easy", "medium", "hard"]),
+            concept=concept
+        )
+
+
+# Waktu rata-rata satu pemanggilan (milidetik)
+def average_ms(func, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--questions", type=int, default=1000000)
+    parser.add_argument("--db", default="bench_question_bank.db")
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    for suffix in ("", "-wal", "-shm"):
+        if os.path.exists(args.db + suffix):
+            os.remove(args.db + suffix)
+    bank = QuestionBank(args.db)
+    rng = random.Random(0)
+
+    num_generations = args.questions // QUESTIONS_PER_GENERATION
+    start = time.perf_counter()
+    for generation in range(num_generations):
+        material_hash = f"material-{generation // GENERATIONS_PER_MATERIAL}"
+        bank.save_generation(material_hash, QUESTIONS_PER_GENERATION, generation, "bench", make_questions(rng))
+    insert_seconds = time.perf_counter() - start
+    print(f"insert {bank.stats()['questions']} soal: {insert_seconds:.1f} s "
+          f"({args.questions / insert_seconds:,.0f} soal/s)")
+
+    num_materials = max(num_generations // GENERATIONS_PER_MATERIAL, 1)
+    lookups = [
+        ("find_generation (hash, n, seed)",
+         lambda: bank.find_generation(f"material-{rng.randrange(num_materials)}", QUESTIONS_PER_GENERATION,
+                                      "bench", rng.randrange(num_generations))),
+        ("find_generation (terbaru)",
+         lambda: bank.find_generation(f"material-{rng.randrange(num_materials)}", QUESTIONS_PER_GENERATION, "bench")),
+        ("query material", lambda: bank.query(material_hash=f"material-{rng.randrange(num_materials)}", limit=20)),
+        ("query concept", lambda: bank.query(concept=rng.choice(CONCEPTS), limit=20)),
+        ("query difficulty+type", lambda: bank.query(difficulty="hard", question_type="pilihan_ganda", limit=20)),
+        ("search teks", lambda: bank.search(rng.choice(CONCEPTS), limit=20)),
+    ]
+    for name, func in lookups:
+        print(f"{name:<32} {average_ms(func, args.repeat):8.3f} ms")
+    bank.close()
+
+
+if __name__ == "__main__":
+    main()
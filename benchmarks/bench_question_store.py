@@ -0,0 +1,101 @@
+"""Benchmark penyimpanan soal: list dataclass (cara lama) vs QuestionStore kolumnar.
+
+Jalankan dari root project:
+    python benchmarks/bench_question_store.py --questions 10000 50000
+"""
+import argparse
+import os
+import random
+import sys
+import time
+import tracemalloc
+from dataclasses import dataclass
+from typing import Dict, Iterator, List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pandas as pd
+
+from questions import Question, QuestionStore
+from synthetic import CONCEPTS, make_sentence
+
+
+# Class soal lama (dataclass dengan __dict__ per objek), disalin sebelum QuestionStore
+@dataclass
+class LegacyQuestion:
+    question_text: str
+    options: List[str]
+    correct_answer: str
+    explanation: str
+    question_type: str = "pilihan_ganda"
+    difficulty: str = "medium"
+    concept: str = ""
+
+    def to_dict(self) -> Dict:
+        return {
+            "question": self.question_text,
+            "options": self.options,
+            "correct_answer": self.correct_answer,
+            "explanation": self.explanation,
+            "type": self.question_type,
+            "difficulty": self.difficulty,
+            "concept": self.concept
+        }
+
+
+# Data soal sintetis; setiap soal punya string sendiri seperti hasil generate sungguhan
+def iter_rows(num_questions: int, seed: int = 0) -> Iterator[Dict]:
+    rng = random.Random(seed)
+    for _ in range(num_questions):
+        concept = rng.choice(CONCEPTS)
+        options = [make_sentence(rng) for _ in range(4)]
+        yield {
+            "question_text": f"Apa yang dimaksud dengan {concept}?",
+            "options": options,
+            "correct_answer": options[0],
+            "explanation": f"Materi menyebutkan: \"{options[0]}\"",
+            # Nilai kategori dibuat ulang per soal, seperti string yang datang dari JSON/LLM
+            "difficulty": "".join(rng.choice(["easy", "medium", "hard"])),
+            "concept": "".join(concept),
+        }
+
+
+# Memori yang ditambahkan saat membangun struktur (byte)
+def measure_memory(build):
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    result = build()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, after - before
+
+
+def best_time(func, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--questions", type=int, nargs="+", default=[10000, 50000])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'questions':>9} {'mode':<10} {'bytes/question':>15} {'to_pandas s':>12}")
+    for num_questions in args.questions:
+        # Memori yang diukur adalah semua yang tetap hidup setelah data masuk, termasuk string isi soal
+        legacy, legacy_bytes = measure_memory(lambda: [LegacyQuestion(**row) for row in iter_rows(num_questions)])
+        store, store_bytes = measure_memory(lambda: QuestionStore(Question(**row) for row in iter_rows(num_questions)))
+
+        legacy_seconds = best_time(lambda: pd.DataFrame([q.to_dict() for q in legacy]), args.repeat)
+        store_seconds = best_time(store.to_pandas, args.repeat)
+        print(f"{num_questions:>9} {'legacy':<10} {legacy_bytes / num_questions:>15.0f} {legacy_seconds:>12.3f}")
+        print(f"{num_questions:>9} {'store':<10} {store_bytes / num_questions:>15.0f} {store_seconds:>12.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""Benchmark penilaian kuis: loop per siswa per soal (cara lama) vs matriks NumPy di scoring.py.
+
+Jalankan dari root project:
+    python benchmarks/bench_quiz_scoring.py --students 500 5000 50000 --questions 20
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import time
+from typing import List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from questions import Question, QuestionStore
+from scoring import AnswerKey, QuizStatistics, score_submissions
+from synthetic import CONCEPTS, make_sentence
+
+
+# Set soal sintetis dengan id soal seperti hasil generate
+def make_store(num_questions: int, seed: int = 0) -> QuestionStore:
+    rng = random.Random(seed)
+    store = QuestionStore()
+    for i in range(num_questions):
+        options = [make_sentence(rng) for _ in range(4)]
+        store.append(Question(
+            question_text=f"Apa yang dimaksud dengan {rng.choice(CONCEPTS)}?",
+            options=options,
+            correct_answer=options[rng.randrange(4)],
+            explanation="",
+            question_id=f"materi-{i + 1}",
+        ))
+    return store
+
+
+# Baris JSONL jawaban siswa; sebagian memakai huruf, sebagian dict id soal -> huruf
+def make_submissions(store: QuestionStore, num_students: int, seed: int = 0) -> List[str]:
+    rng = random.Random(seed)
+    lines = []
+    for i in range(num_students):
+        answers = [rng.choice("ABCD") for _ in range(len(store))]
+        if i % 2:
+            answers = dict(zip(store.question_ids, answers))
+        lines.append(json.dumps({"student": f"Siswa {i + 1}", "answers": answers}))
+    return lines
+
+
+# Cara lama: setiap jawaban dibandingkan satu per satu dengan correct_answer soal
+def score_legacy(store: QuestionStore, lines: List[str]) -> List[int]:
+    questions = list(store)
+    scores = []
+    for line in lines:
+        answers = json.loads(line)["answers"]
+        if isinstance(answers, dict):
+            answers = [answers.get(q.question_id) for q in questions]
+        correct = 0
+        for question, answer in zip(questions, answers):
+            index = ord(answer) - ord("A") if answer else -1
+            if 0 <= index < len(question.options) and question.options[index] == question.correct_answer:
+                correct += 1
+        scores.append(correct)
+    return scores
+
+
+def best_time(func, repeat: int):
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--students", type=int, nargs="+", default=[500, 5000, 50000])
+    parser.add_argument("--questions", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    store = make_store(args.questions)
+    key = AnswerKey(store)
+    print(f"{'students':>9} {'mode':<10} {'seconds':>9} {'students/s':>11}")
+    for num_students in args.students:
+        lines = make_submissions(store, num_students)
+        legacy_seconds, legacy_scores = best_time(lambda: score_legacy(store, lines), args.repeat)
+
+        def score_vectorized():
+            report = score_submissions(store, lines, key=key)
+            QuizStatistics(len(store)).add(report)
+            return report
+
+        vector_seconds, report = best_time(score_vectorized, args.repeat)
+        assert report.scores.tolist() == legacy_scores
+        for mode, seconds in (("legacy", legacy_seconds), ("vectorized", vector_seconds)):
+            print(f"{num_students:>9} {mode:<10} {seconds:>9.3f} {num_students / seconds:>11.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""Benchmark ingest TXT: cara lama (getvalue().decode lalu StringIO) vs decode langsung vs mode streaming.
+
+Setiap mode dijalankan di proses Python baru; kenaikan peak RSS diukur setelah file dibaca,
+jadi angka 1.0x berarti satu salinan tambahan seukuran file.
+
+Jalankan dari root project:
+    python benchmarks/bench_txt_ingestion.py --sizes 10M 100M
+    python benchmarks/bench_txt_ingestion.py --sizes 100M --encoding cp1252
+"""
+import argparse
+import io
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from io import StringIO
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from processing import MaterialProcessor
+from reporting import CollectingReporter
+from run_benchmarks import format_size, parse_size, peak_rss_mb
+from synthetic import make_text
+
+
+# Cara lama, disalin dari MaterialProcessor.extract_text_from_txt sebelumnya
+def extract_legacy(data: bytes) -> int:
+    stringio = StringIO(io.BytesIO(data).getvalue().decode("utf-8"))
+    return len(stringio.read())
+
+
+def extract_decode(data: bytes) -> int:
+    return len(MaterialProcessor(reporter=CollectingReporter()).extract_text_from_txt(io.BytesIO(data)))
+
+
+# Mode streaming (file di atas streaming_threshold_bytes): decode per potongan langsung ke model dokumen.
+# Panjang yang dilaporkan adalah teks setelah dibersihkan.
+def extract_streaming(data: bytes) -> int:
+    processor = MaterialProcessor(reporter=CollectingReporter())
+    return processor.extract_material_streaming(io.BytesIO(data), "txt").text_length
+
+
+MODES = {
+    "legacy": extract_legacy,
+    "decode": extract_decode,
+    "streaming": extract_streaming,
+}
+
+
+# Dijalankan di proses anak: waktu, kenaikan peak RSS (MB), dan panjang teks satu mode
+def _measure(mode: str, path: str):
+    with open(path, "rb") as f:
+        data = f.read()
+    before = peak_rss_mb()
+    start = time.perf_counter()
+    try:
+        chars = MODES[mode](data)
+    except UnicodeDecodeError:
+        chars = None
+    seconds = time.perf_counter() - start
+    print(json.dumps({"seconds": seconds, "rss_mb": peak_rss_mb() - before, "chars": chars}))
+
+
+def run_mode(mode: str, path: str) -> dict:
+    output = subprocess.run([sys.executable, os.path.abspath(__file__), "--measure", mode, path],
+                            check=True, capture_output=True, text=True).stdout
+    return json.loads(output)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", nargs="+", default=["10M", "100M"])
+    parser.add_argument("--encoding", default="utf-8", help="Encoding file TXT sintetis, misalnya cp1252")
+    parser.add_argument("--measure", nargs=2, metavar=("MODE", "PATH"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.measure:
+        _measure(*args.measure)
+        return
+
+    print(f"{'size':>6} {'mode':<10} {'seconds':>9} {'MB/s':>8} {'RSS +MB':>8} {'x file':>7} {'chars':>11}")
+    for size in args.sizes:
+        num_bytes = parse_size(size)
+        # Materi sintetis ASCII, ditambah huruf beraksen agar encoding selain UTF-8 benar-benar berbeda
+        data = (make_text(num_bytes) + "\nCatatan: café, naïve, résumé.\n").encode(args.encoding)
+        with tempfile.NamedTemporaryFile(suffix=".txt", delete=False) as f:
+            f.write(data)
+        for mode in MODES:
+            result = run_mode(mode, f.name)
+            if result["chars"] is None:
+                print(f"{format_size(num_bytes):>6} {mode:<10} {'gagal decode':>9}")
+                continue
+            megabytes = len(data) / 1e6
+            print(f"{format_size(num_bytes):>6} {mode:<10} {result['seconds']:>9.3f} "
+                  f"{megabytes / result['seconds']:>8.1f} {result['rss_mb']:>8.1f} "
+                  f"{result['rss_mb'] * 1024 * 1024 / len(data):>7.2f} {result['chars']:>11}")
+        os.unlink(f.name)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,334 @@
+"""Benchmark tahap utama: ekstraksi, pemrosesan teks, generate soal, dan export.
+
+Jalankan dari root project:
+    python benchmarks/run_benchmarks.py -o hasil.json
+    python benchmarks/run_benchmarks.py --sizes 1K 1M 100M --formats txt -o hasil.json
+
+Deteksi regresi: simpan hasil dari commit acuan di mesin yang sama, lalu bandingkan
+(waktu dan memori bergantung mesin, jadi tidak ada baseline yang disimpan di repo):
+    python benchmarks/run_benchmarks.py -o baseline.json
+    python benchmarks/run_benchmarks.py -o hasil.json --baseline baseline.json
+
+Materi sintetis (TXT/DOCX/PDF) dibuat dengan seed tetap. Setiap kasus berjalan di
+proses baru (spawn) sehingga peak RSS satu kasus tidak terbawa ke kasus lain. Hasil
+ditulis sebagai JSON bersama waktu import modul utama (--imports); dengan --baseline, waktu atau peak RSS yang naik lebih dari
+--tolerance ditandai sebagai regresi dan exit code menjadi 1.
+"""
+import argparse
+import io
+import json
+import multiprocessing
+import os
+import platform
+import subprocess
+import sys
+import time
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+DEFAULT_SIZES = ["1K", "100K", "1M", "10M"]
+DEFAULT_FORMATS = ["txt", "docx", "pdf"]
+DEFAULT_QUESTION_COUNTS = [5, 100, 1000, 10000]
+# Modul inti (tanpa Streamlit/plotly), CLI batch, dan aplikasi Streamlit
+DEFAULT_IMPORT_MODULES = ["processing", "generator", "batch", "app"]
+EXPORT_FORMATS = ["csv", "json", "txt"]
+# Tahap yang lebih lama dari ini hanya diukur sekali
+SINGLE_RUN_SECONDS = 2.0
+_UNITS = {"K": 1024, "M": 1024 ** 2, "G": 1024 ** 3}
+
+
+def parse_size(text: str) -> int:
+    text = text.strip().upper().rstrip("B")
+    if text and text[-1] in _UNITS:
+        return int(float(text[:-1]) * _UNITS[text[-1]])
+    return int(text)
+
+
+def format_size(num_bytes: int) -> str:
+    for unit in ("G", "M", "K"):
+        if num_bytes >= _UNITS[unit] and num_bytes % _UNITS[unit] == 0:
+            return f"{num_bytes // _UNITS[unit]}{unit}"
+    return str(num_bytes)
+
+
+# Peak RSS proses ini (MB), None jika platform tidak mendukung. Di Linux dibaca dari VmHWM karena
+# ru_maxrss ikut mewarisi peak proses induk setelah fork/exec
+def peak_rss_mb() -> Optional[float]:
+    try:
+        with open("/proc/self/status") as status:
+            for line in status:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux melaporkan KB, macOS byte
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+# Waktu terbaik dari beberapa kali percobaan; setup dijalankan sebelum tiap percobaan tanpa dihitung
+def best_time(func: Callable, repeat: int, setup: Callable = None):
+    best, result = float("inf"), None
+    for attempt in range(repeat):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        result = func()
+        seconds = time.perf_counter() - start
+        best = min(best, seconds)
+        if seconds > SINGLE_RUN_SECONDS:
+            break
+    return best, result
+
+
+# Kosongkan cache di model dokumen agar tiap percobaan mengukur perhitungan penuh
+def reset_document_caches(document):
+    document._meaningful_sentences = None
+    document._concept_indexes = {}
+    document.concept_rankings = {}
+    document._statistics = None
+
+
+def record(case: str, stage: str, seconds: float, units: float = None, unit: str = "MB") -> Dict:
+    result = {"case": case, "stage": stage, "seconds": round(seconds, 6), "peak_rss_mb": peak_rss_mb()}
+    if units is not None:
+        result["throughput"] = round(units / seconds, 3) if seconds > 0 else None
+        result["throughput_unit"] = f"{unit}/s"
+    return result
+
+
+# Satu kasus materi: ekstraksi lalu tahap-tahap pemrosesan teks
+def run_material_case(file_format: str, num_bytes: int, repeat: int) -> List[Dict]:
+    import synthetic
+    from generator import AdvancedQuestionGenerator
+    from processing import MaterialProcessor
+    from reporting import LoggingReporter
+    from text_pipeline import DocumentModel
+
+    if file_format == "txt":
+        data = synthetic.make_text(num_bytes).encode("utf-8")
+    elif file_format == "docx":
+        data = synthetic.make_docx(num_bytes)
+    else:
+        data = synthetic.make_pdf_of_size(num_bytes)
+    case = f"{file_format}-{format_size(num_bytes)}"
+    input_rss = peak_rss_mb()
+
+    reporter = LoggingReporter()
+    processor = MaterialProcessor(reporter=reporter)
+    generator = AdvancedQuestionGenerator(reporter=reporter)
+    extract = getattr(processor, f"extract_text_from_{file_format}")
+    results = []
+
+    seconds, raw_text = best_time(lambda: extract(io.BytesIO(data)), repeat)
+    results.append(record(case, f"extract_text_from_{file_format}", seconds, len(data) / 1e6))
+    text_mb = len(raw_text.encode("utf-8")) / 1e6
+
+    seconds, text = best_time(lambda: processor.clean_text(raw_text), repeat)
+    results.append(record(case, "clean_text", seconds, text_mb))
+    del raw_text
+
+    seconds, document = best_time(lambda: DocumentModel(text), repeat)
+    results.append(record(case, "document_model", seconds, text_mb))
+    processor.document = document
+    generator.document = document
+
+    def reset():
+        reset_document_caches(document)
+
+    for stage, func in (
+        ("extract_meaningful_sentences", lambda: generator.extract_meaningful_sentences(text)),
+        ("get_key_concepts", processor.get_key_concepts),
+        ("extract_key_concepts_advanced", lambda: generator.extract_key_concepts_advanced(text)),
+    ):
+        seconds, _ = best_time(func, repeat, setup=reset)
+        results.append(record(case, stage, seconds, text_mb))
+
+    for result in results:
+        result.update(input_bytes=len(data), input_rss_mb=input_rss)
+    return results
+
+
+# Satu kasus generate: generate_questions_advanced untuk num_questions soal lalu export semua format
+def run_generation_case(num_questions: int, material_bytes: int, repeat: int) -> List[Dict]:
+    import synthetic
+    from generator import AdvancedQuestionGenerator
+    from exporters import export_questions
+    from questions import QuestionStore
+    from reporting import LoggingReporter
+    from text_pipeline import DocumentModel, clean_text
+
+    text = clean_text(synthetic.make_text(material_bytes))
+    document = DocumentModel(text)
+    generator = AdvancedQuestionGenerator(reporter=LoggingReporter())
+    case = f"generate-{num_questions}"
+    input_rss = peak_rss_mb()
+    results = []
+
+    # Seed berbeda di setiap percobaan agar cache hasil generate tidak terpakai
+    seeds = iter(range(repeat))
+    seconds, questions = best_time(
+        lambda: generator.generate_questions_advanced(text, num_questions, document=document, seed=next(seeds)),
+        repeat
+    )
+    results.append(record(case, "generate_questions_advanced", seconds, num_questions, "questions"))
+
+    store = QuestionStore(questions)
+    for file_format in EXPORT_FORMATS:
+        seconds, data = best_time(lambda: export_questions(store, file_format), repeat)
+        size = len(data)
+        result = record(case, f"export_{file_format}", seconds, num_questions, "questions")
+        result["output_bytes"] = size
+        results.append(result)
+
+    for result in results:
+        result.update(input_bytes=len(text), input_rss_mb=input_rss)
+    return results
+
+
+# Total waktu import (detik) per modul dari output `python -X importtime`
+def parse_importtime(output: str) -> Dict[str, float]:
+    timings = {}
+    for line in output.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        if cumulative.strip().isdigit():
+            timings.setdefault(name.strip(), int(cumulative) / 1e6)
+    return timings
+
+
+# Satu kasus import: waktu import modul di interpreter baru dan paket yang paling berat
+def run_import_case(module: str, repeat: int) -> List[Dict]:
+    best, heaviest = float("inf"), []
+    for _ in range(repeat):
+        completed = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                                   cwd=ROOT, capture_output=True, text=True, check=True)
+        timings = parse_importtime(completed.stderr)
+        if timings[module] < best:
+            best = timings[module]
+            packages = [(name, seconds) for name, seconds in timings.items() if "." not in name and name != module]
+            heaviest = sorted(packages, key=lambda item: item[1], reverse=True)[:5]
+    result = record(f"import-{module}", "import", best)
+    # Peak RSS interpreter yang mengimport modul, bukan proses benchmark ini
+    result["peak_rss_mb"] = children_peak_rss_mb()
+    result["heaviest_imports"] = [{"module": name, "seconds": round(seconds, 6)} for name, seconds in heaviest]
+    return [result]
+
+
+def children_peak_rss_mb() -> Optional[float]:
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def _run_case(kind: str, args: tuple) -> List[Dict]:
+    if kind == "material":
+        return run_material_case(*args)
+    if kind == "import":
+        return run_import_case(*args)
+    return run_generation_case(*args)
+
+
+# Jalankan satu kasus di proses baru agar pengukuran memori terpisah
+def run_isolated(kind: str, args: tuple) -> List[Dict]:
+    context = multiprocessing.get_context("spawn")
+    with context.Pool(1) as pool:
+        return pool.apply(_run_case, (kind, args))
+
+
+# Bandingkan hasil dengan baseline; regresi jika lebih lambat/boros memori melebihi toleransi
+def find_regressions(results: List[Dict], baseline: Dict, tolerance: float, min_seconds: float) -> List[Dict]:
+    previous = {(r["case"], r["stage"]): r for r in baseline.get("results", [])}
+    regressions = []
+    for result in results:
+        old = previous.get((result["case"], result["stage"]))
+        if old is None:
+            continue
+        # Tahap yang sangat cepat terlalu dipengaruhi noise, hanya dibandingkan jika di atas min_seconds
+        if result["seconds"] > min_seconds and result["seconds"] > old["seconds"] * (1 + tolerance):
+            regressions.append({"case": result["case"], "stage": result["stage"], "metric": "seconds",
+                                "baseline": old["seconds"], "current": result["seconds"]})
+        if result.get("peak_rss_mb") and old.get("peak_rss_mb") and \
+                result["peak_rss_mb"] > old["peak_rss_mb"] * (1 + tolerance):
+            regressions.append({"case": result["case"], "stage": result["stage"], "metric": "peak_rss_mb",
+                                "baseline": old["peak_rss_mb"], "current": result["peak_rss_mb"]})
+    return regressions
+
+
+def environment_info() -> Dict:
+    return {
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+    }
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("-o", "--output", required=True, help="File output JSON")
+    parser.add_argument("--sizes", nargs="+", default=DEFAULT_SIZES, help="Ukuran materi, misalnya 1K 1M 100M")
+    parser.add_argument("--formats", nargs="+", default=DEFAULT_FORMATS, choices=DEFAULT_FORMATS)
+    parser.add_argument("--max-pdf-size", default="10M",
+                        help="Ukuran PDF terbesar yang diuji (ekstraksi PDF jauh lebih lambat dari format lain)")
+    parser.add_argument("--questions", type=int, nargs="+", default=DEFAULT_QUESTION_COUNTS,
+                        help="Jumlah soal untuk benchmark generate dan export")
+    parser.add_argument("--generation-material-size", default="100K", help="Ukuran materi untuk benchmark generate")
+    parser.add_argument("--imports", nargs="*", default=DEFAULT_IMPORT_MODULES,
+                        help="Modul yang diukur waktu import-nya (kosongkan untuk melewati)")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--baseline", default=None, help="Hasil sebelumnya untuk deteksi regresi")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Kenaikan relatif yang dianggap regresi")
+    parser.add_argument("--min-seconds", type=float, default=0.01)
+    args = parser.parse_args(argv)
+
+    cases = [("import", (module, args.repeat)) for module in args.imports]
+    max_pdf_bytes = parse_size(args.max_pdf_size)
+    for size in sorted(parse_size(size) for size in args.sizes):
+        for file_format in args.formats:
+            if file_format == "pdf" and size > max_pdf_bytes:
+                continue
+            cases.append(("material", (file_format, size, args.repeat)))
+    generation_bytes = parse_size(args.generation_material_size)
+    for num_questions in args.questions:
+        cases.append(("generation", (num_questions, generation_bytes, args.repeat)))
+
+    results = []
+    print(f"{'case':<16} {'stage':<32} {'seconds':>10} {'throughput':>16} {'peak RSS MB':>12}")
+    for kind, case_args in cases:
+        for result in run_isolated(kind, case_args):
+            results.append(result)
+            throughput = f"{result['throughput']:.1f} {result['throughput_unit']}" if result.get("throughput") else "-"
+            peak = f"{result['peak_rss_mb']:.1f}" if result["peak_rss_mb"] is not None else "-"
+            print(f"{result['case']:<16} {result['stage']:<32} {result['seconds']:>10.4f} {throughput:>16} {peak:>12}")
+
+    report = {"environment": environment_info(), "results": results, "regressions": []}
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        report["regressions"] = find_regressions(results, baseline, args.tolerance, args.min_seconds)
+        for regression in report["regressions"]:
+            print(f"REGRESI {regression['case']} {regression['stage']} {regression['metric']}: "
+                  f"{regression['baseline']} -> {regression['current']}")
+        if not report["regressions"]:
+            print("Tidak ada regresi dibanding baseline")
+
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    return 1 if report["regressions"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,146 @@
+import io
+import random
+from typing import List
+
+# Kosakata untuk membuat materi sintetis yang mirip materi ajar
+CONCEPTS = [
+    "Algoritma", "Variabel", "Fungsi", "Perulangan", "Percabangan", "Rekursi",
+    "Struktur", "Array", "Objek", "Kelas", "Pewarisan", "Enkapsulasi",
+    "Polimorfisme", "Database", "Jaringan", "Protokol", "Sistem", "Memori",
+    "Prosesor", "Kompiler", "Interpreter", "Sintaks", "Modul", "Library"
+]
+WORDS = [
+    "adalah", "yang", "digunakan", "untuk", "menyimpan", "data", "dalam",
+    "program", "komputer", "dengan", "cara", "tertentu", "sehingga", "dapat",
+    "diproses", "secara", "efisien", "oleh", "pengguna", "setiap", "bagian",
+    "memiliki", "peran", "penting", "pada", "proses", "eksekusi", "kode"
+]
+
+
+# Buat satu kalimat sintetis yang berisi satu atau dua konsep
+def make_sentence(rng: random.Random) -> str:
+    words = [rng.choice(CONCEPTS)]
+    words.extend(rng.choice(WORDS) for _ in range(rng.randint(6, 14)))
+    if rng.random() < 0.3:
+        words.insert(rng.randint(2, len(words)), rng.choice(CONCEPTS))
+    return " ".join(words) + "."
+
+
+# Buat daftar baris teks sintetis dengan ukuran kira-kira num_bytes
+def make_lines(num_bytes: int, seed: int = 0) -> List[str]:
+    rng = random.Random(seed)
+    lines = []
+    size = 0
+    while size < num_bytes:
+        line = make_sentence(rng)
+        lines.append(line)
+        size += len(line) + 1
+    return lines
+
+
+# Buat teks sintetis berukuran kira-kira num_bytes
+def make_text(num_bytes: int, seed: int = 0) -> str:
+    return "\n".join(make_lines(num_bytes, seed))
+
+
+# Escape karakter khusus untuk string literal PDF
+def _pdf_escape(text: str) -> str:
+    return text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+# Buat PDF sederhana (font Helvetica standar) tanpa library tambahan
+def make_pdf(num_pages: int, lines_per_page: int = 45, seed: int = 0) -> bytes:
+    rng = random.Random(seed)
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        None,  # daftar halaman diisi setelah semua halaman dibuat
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    page_ids = []
+    for _ in range(num_pages):
+        lines = [_pdf_escape(make_sentence(rng)[:95]) for _ in range(lines_per_page)]
+        stream = "BT /F1 10 Tf 40 800 Td 16 TL " + " ".join(f"({line}) Tj T*" for line in lines) + " ET"
+        stream = stream.encode("latin-1")
+        objects.append(b"<< /Length %d >>\nstream\n%s\nendstream" % (len(stream), stream))
+        content_id = len(objects)
+        objects.append(
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] "
+            b"/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>" % content_id
+        )
+        page_ids.append(len(objects))
+    kids = " ".join(f"{page_id} 0 R" for page_id in page_ids).encode()
+    objects[1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (kids, num_pages)
+
+    output = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(output))
+        output += b"%d 0 obj\n%s\nendobj\n" % (number, body)
+    xref_offset = len(output)
+    output += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    for offset in offsets:
+        output += b"%010d 00000 n \n" % offset
+    output += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref_offset)
+    return bytes(output)
+
+
+# Run berisi text box (mc:Choice untuk Word baru dan mc:Fallback VML untuk Word lama, isinya sama)
+_TEXT_BOX_RUN = """<w:r xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+ xmlns:mc="http://schemas.openxmlformats.org/markup-compatibility/2006"
+ xmlns:wps="http://schemas.microsoft.com/office/word/2010/wordprocessingShape"
+ xmlns:v="urn:schemas-microsoft-com:vml"><mc:AlternateContent>
+<mc:Choice Requires="wps"><w:drawing><wps:wsp><wps:txbx><w:txbxContent>
+<w:p><w:r><w:t>{text}</w:t></w:r></w:p></w:txbxContent></wps:txbx></wps:wsp></w:drawing></mc:Choice>
+<mc:Fallback><w:pict><v:shape><v:textbox><w:txbxContent>
+<w:p><w:r><w:t>{text}</w:t></w:r></w:p></w:txbxContent></v:textbox></v:shape></w:pict></mc:Fallback>
+</mc:AlternateContent></w:r>"""
+
+
+# Buat DOCX sintetis mirip catatan kuliah: per halaman ada judul, paragraf, tabel istilah, dan sesekali
+# text box; dokumen punya header dan footer
+def make_docx_pages(num_pages: int, seed: int = 0, paragraphs_per_page: int = 8) -> bytes:
+    import docx
+    from docx.enum.text import WD_BREAK
+    from lxml import etree
+
+    rng = random.Random(seed)
+    document = docx.Document()
+    section = document.sections[0]
+    section.header.paragraphs[0].text = "Catatan Kuliah Pemrograman Dasar"
+    section.footer.paragraphs[0].text = "Materi ini hanya untuk pembelajaran internal."
+    for page in range(num_pages):
+        document.add_heading(f"Bab {page + 1}: {rng.choice(CONCEPTS)}", level=2)
+        for _ in range(paragraphs_per_page):
+            document.add_paragraph(" ".join(make_sentence(rng) for _ in range(3)))
+        table = document.add_table(rows=4, cols=2)
+        for row in table.rows:
+            row.cells[0].text = rng.choice(CONCEPTS)
+            row.cells[1].text = make_sentence(rng)
+        paragraph = document.add_paragraph(make_sentence(rng))
+        if page % 5 == 0:
+            paragraph._p.append(etree.fromstring(_TEXT_BOX_RUN.format(text=make_sentence(rng))))
+        paragraph.add_run().add_break(WD_BREAK.PAGE)
+    output = io.BytesIO()
+    document.save(output)
+    return output.getvalue()
+
+
+# Perkiraan teks per halaman PDF sintetis (45 baris x ~75 karakter)
+PDF_BYTES_PER_PAGE = 3400
+
+
+# Buat PDF sintetis dengan teks kira-kira num_bytes
+def make_pdf_of_size(num_bytes: int, seed: int = 0) -> bytes:
+    return make_pdf(max(1, num_bytes // PDF_BYTES_PER_PAGE), seed=seed)
+
+
+# Buat DOCX sintetis berukuran teks kira-kira num_bytes, satu paragraf per baris
+def make_docx(num_bytes: int, seed: int = 0) -> bytes:
+    import docx
+
+    document = docx.Document()
+    for line in make_lines(num_bytes, seed):
+        document.add_paragraph(line)
+    output = io.BytesIO()
+    document.save(output)
+    return output.getvalue()
@@ -0,0 +1,89 @@
+import hashlib
+import json
+from typing import Dict, Iterable, List
+
+import numpy as np
+
+from text_pipeline import DocumentModel
+
+
+# Peringkat konsep dengan TF-IDF di atas matriks kemunculan kalimat x istilah
+class ConceptScorer:
+    def __init__(self, document_frequency: Dict[str, int] = None, num_documents: int = 0):
+        # Tabel IDF tingkat korpus (seluruh materi kuliah), opsional
+        self.document_frequency = document_frequency or {}
+        self.num_documents = num_documents
+        if num_documents:
+            digest = hashlib.sha256(json.dumps(sorted(self.document_frequency.items())).encode())
+            self.key = f"tfidf-corpus:{num_documents}:{digest.hexdigest()[:16]}"
+        else:
+            self.key = "tfidf-local"
+
+    # Muat tabel IDF korpus dari file JSON hasil build_idf_table
+    @classmethod
+    def from_file(cls, path: str) -> "ConceptScorer":
+        with open(path, encoding="utf-8") as f:
+            table = json.load(f)
+        return cls(table["document_frequency"], table["num_documents"])
+
+    # Skor TF-IDF untuk setiap istilah, urut sesuai daftar istilah dari term_statistics dokumen
+    def score(self, document: DocumentModel) -> np.ndarray:
+        return self._score_statistics(document.term_statistics())
+
+    def _score_statistics(self, statistics) -> np.ndarray:
+        terms, term_frequency, sentence_frequency, num_sentences = statistics
+        if not terms:
+            return np.zeros(0)
+        tf = term_frequency.astype(np.float64)
+
+        if self.num_documents:
+            # IDF dari korpus: istilah yang muncul di banyak materi dianggap umum
+            df = np.fromiter(
+                (self.document_frequency.get(term, 0) for term in terms),
+                dtype=np.float64, count=len(terms)
+            )
+            num_units = self.num_documents
+        else:
+            # Tanpa korpus, setiap kalimat dianggap satu dokumen
+            df = sentence_frequency.astype(np.float64)
+            num_units = max(num_sentences, 1)
+
+        idf = np.log((1 + num_units) / (1 + df)) + 1
+        return tf * idf
+
+    # Ambil k konsep dengan skor tertinggi tanpa mengurutkan semua istilah
+    def top_k(self, document: DocumentModel, k: int) -> List[str]:
+        cache_key = (self.key, k)
+        ranking = document.concept_rankings.get(cache_key)
+        if ranking is not None:
+            return list(ranking)
+
+        statistics = document.term_statistics()
+        scores = self._score_statistics(statistics)
+        k = min(k, len(scores))
+        if k == 0:
+            return []
+        candidates = np.argpartition(-scores, k - 1)[:k]
+        # Skor tertinggi dulu, skor sama diurutkan berdasarkan kemunculan pertama
+        order = np.lexsort((candidates, -scores[candidates]))
+        terms = statistics[0]
+        ranking = [terms[i] for i in candidates[order]]
+        document.concept_rankings[cache_key] = ranking
+        return list(ranking)
+
+
+# Hitung document frequency istilah dari kumpulan dokumen
+def build_idf_table(documents: Iterable[Iterable[str]]) -> Dict:
+    document_frequency = {}
+    num_documents = 0
+    for terms in documents:
+        num_documents += 1
+        for term in set(terms):
+            document_frequency[term] = document_frequency.get(term, 0) + 1
+    return {"num_documents": num_documents, "document_frequency": document_frequency}
+
+
+# Simpan tabel IDF ke file JSON
+def save_idf_table(table: Dict, path: str):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(table, f, ensure_ascii=False)
@@ -0,0 +1,137 @@
+import hashlib
+import sys
+from itertools import chain
+from typing import Dict, Iterable, List, Tuple
+
+import numpy as np
+
+from text_pipeline import DocumentModel
+
+
+# Satu file materi di dalam course beserta bobotnya
+class CourseFile:
+    __slots__ = ("name", "material_hash", "material", "weight")
+
+    def __init__(self, name: str, material_hash: str, material, weight: float = 1.0):
+        self.name = name
+        self.material_hash = material_hash
+        # ExtractedMaterial hasil ekstraksi file ini
+        self.material = material
+        self.weight = weight
+
+    @property
+    def document(self) -> DocumentModel:
+        return self.material.document
+
+
+# Model gabungan beberapa file materi (satu course). Dipakai generator dan scorer konsep seperti
+# DocumentModel: statistik istilah tiap file dinormalisasi lalu digabung sesuai bobot file,
+# sehingga file yang panjang tidak menenggelamkan konsep dari file yang pendek.
+class CourseModel:
+    # Statistik tiap file dinormalisasi sebelum digabung; False untuk bagian-bagian dari satu dokumen
+    normalize_files = True
+
+    def __init__(self, files: Iterable[CourseFile]):
+        self.files = list(files)
+        self.text = "\n".join(f.material.text for f in self.files)
+        # Hash gabungan isi dan bobot file, dipakai sebagai kunci cache dan bank soal
+        digest = hashlib.sha256()
+        for f in self.files:
+            digest.update(f"{f.material_hash}:{f.weight:g};".encode())
+        self.key = digest.hexdigest()
+        self.concept_rankings = {}
+        self._statistics = None
+        self._meaningful_sentences = None
+        self._concept_indexes = {}
+
+    @property
+    def num_tokens(self) -> int:
+        return sum(f.document.num_tokens for f in self.files)
+
+    # Kalimat bermakna semua file, urut sesuai urutan file
+    def meaningful_sentences(self) -> List[str]:
+        if self._meaningful_sentences is None:
+            self._meaningful_sentences = [s for f in self.files for s in f.document.meaningful_sentences()]
+        return self._meaningful_sentences
+
+    # Index konsep -> nomor kalimat pada daftar meaningful_sentences gabungan
+    def concept_index(self, concepts: Iterable[str]) -> Dict[str, List[int]]:
+        concepts = tuple(concepts)
+        index = self._concept_indexes.get(concepts)
+        if index is None:
+            index = {concept: [] for concept in concepts}
+            offset = 0
+            for f in self.files:
+                for concept, sentence_ids in f.document.concept_index(concepts).items():
+                    index[concept].extend(offset + i for i in sentence_ids)
+                offset += len(f.document.meaningful_sentences())
+            self._concept_indexes[concepts] = index
+        return index
+
+    # Statistik istilah gabungan berbobot, format sama dengan DocumentModel.term_statistics
+    def term_statistics(self) -> Tuple[List[str], np.ndarray, np.ndarray, int]:
+        if self._statistics is None:
+            self._statistics = self._merge_statistics()
+        return self._statistics
+
+    def _merge_statistics(self) -> Tuple[List[str], np.ndarray, np.ndarray, int]:
+        per_file = [f.document.term_statistics() for f in self.files]
+        # Istilah semua file diberi id gabungan sekali jalan (lookup dict di level C, tanpa loop Python per file)
+        all_terms = list(chain.from_iterable(terms for terms, _, _, _ in per_file))
+        term_ids = {term: i for i, term in enumerate(dict.fromkeys(all_terms))}
+        ids = np.fromiter(map(term_ids.__getitem__, all_terms), dtype=np.int64, count=len(all_terms))
+        num_sentences = sum(ns for _, _, _, ns in per_file)
+        if not all_terms:
+            return [], np.zeros(0, dtype=np.float64), np.zeros(0, dtype=np.int64), num_sentences
+        # Frekuensi tiap file dibagi total kemunculan istilahnya, dikali bobot file dan rata-rata total
+        totals = [int(tf.sum()) for _, tf, _, _ in per_file]
+        mean_total = sum(totals) / max(len([t for t in totals if t]), 1)
+        scales = [
+            (f.weight * mean_total / total if self.normalize_files else 1.0) if total else 0.0
+            for f, total in zip(self.files, totals)
+        ]
+        lengths = [len(terms) for terms, _, _, _ in per_file]
+        term_frequency = np.bincount(
+            ids, weights=np.concatenate([tf for _, tf, _, _ in per_file]) * np.repeat(scales, lengths),
+            minlength=len(term_ids)
+        )
+        sentence_frequency = np.bincount(
+            ids, weights=np.concatenate([sf for _, _, sf, _ in per_file]), minlength=len(term_ids)
+        ).astype(np.int64)
+        return list(term_ids), term_frequency, sentence_frequency, num_sentences
+
+    # File atau bagian terkecil (daun) dari model; file yang dibagi per bagian diganti bagian-bagiannya
+    def leaves(self) -> List[CourseFile]:
+        leaves = []
+        for f in self.files:
+            if isinstance(f.document, CourseModel):
+                leaves.extend(f.document.leaves())
+            else:
+                leaves.append(f)
+        return leaves
+
+    # Kunci semua bagian (daun), urut sesuai materi
+    def section_keys(self) -> List[str]:
+        return [leaf.material_hash for leaf in self.leaves()]
+
+    # Kunci bagian untuk setiap kalimat di meaningful_sentences
+    def sentence_sections(self) -> List[str]:
+        return [leaf.material_hash for leaf in self.leaves() for _ in leaf.document.meaningful_sentences()]
+
+    # Jumlah soal per file sebanding bobotnya (metode sisa terbesar); file tanpa kalimat tidak dapat kuota
+    def quotas(self, num_questions: int) -> List[int]:
+        weights = [f.weight if f.document.meaningful_sentences() else 0.0 for f in self.files]
+        total = sum(weights)
+        if total <= 0:
+            return [num_questions] + [0] * (len(self.files) - 1) if self.files else []
+        shares = [num_questions * w / total for w in weights]
+        quotas = [int(share) for share in shares]
+        remaining = num_questions - sum(quotas)
+        by_remainder = sorted(range(len(shares)), key=lambda i: shares[i] - quotas[i], reverse=True)
+        for i in by_remainder[:remaining]:
+            quotas[i] += 1
+        return quotas
+
+    # Perkiraan ukuran memori dalam byte (teks gabungan + model tiap file)
+    def size_bytes(self) -> int:
+        return sys.getsizeof(self.text) + sum(f.document.size_bytes() for f in self.files)
@@ -0,0 +1,102 @@
+import re
+import zlib
+from typing import Dict, Iterable, List, Set
+
+import numpy as np
+
+# Bilangan prima > 2^32 untuk keluarga hash (a * x + b) mod P
+_HASH_PRIME = np.uint64(4294967311)
+_NON_WORD = re.compile(r"[^\w]+")
+
+
+# Normalisasi teks lalu ambil n-gram karakter (shingle); teks pendek tetap punya satu shingle
+def shingles(text: str, size: int = 4) -> Set[str]:
+    normalized = _NON_WORD.sub(" ", text.lower()).strip()
+    if len(normalized) <= size:
+        return {normalized}
+    return {normalized[i:i + size] for i in range(len(normalized) - size + 1)}
+
+
+# Kemiripan Jaccard dua himpunan shingle
+def jaccard(a: Set[str], b: Set[str]) -> float:
+    if not a and not b:
+        return 1.0
+    return len(a & b) / len(a | b)
+
+
+# Cek cepat dua teks pendek (misalnya opsi jawaban) hampir sama
+def is_near_duplicate(a: str, b: str, threshold: float = 0.8) -> bool:
+    return jaccard(shingles(a), shingles(b)) >= threshold
+
+
+# Index MinHash + LSH: cek teks hampir sama tanpa membandingkan dengan semua teks yang sudah ada
+class NearDuplicateIndex:
+    # 16 band x 6 baris: pasangan dengan Jaccard 0.7 menjadi kandidat ~87%, Jaccard 0.3 hanya ~1%
+    def __init__(self, threshold: float = 0.7, num_perm: int = 96, bands: int = 16, seed: int = 1):
+        if num_perm % bands:
+            raise ValueError("num_perm harus habis dibagi bands")
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        # Parameter permutasi tetap (tidak bergantung hash() Python) agar hasil sama di semua proses
+        rng = np.random.RandomState(seed)
+        self._a = rng.randint(1, 1 << 31, size=num_perm).astype(np.uint64)
+        self._b = rng.randint(0, 1 << 31, size=num_perm).astype(np.uint64)
+        # Signature disimpan sebagai matriks yang tumbuh berlipat, kandidat dibandingkan sekaligus
+        self.signatures = np.zeros((0, num_perm), dtype=np.uint64)
+        self.size = 0
+        self.buckets: List[Dict[bytes, List[int]]] = [{} for _ in range(bands)]
+
+    def __len__(self) -> int:
+        return self.size
+
+    # Signature MinHash: nilai minimum setiap permutasi hash atas semua shingle
+    def signature(self, text: str) -> np.ndarray:
+        hashes = np.fromiter((zlib.crc32(s.encode("utf-8")) for s in shingles(text)), dtype=np.uint64)
+        permuted = (self._a[:, None] * hashes[None, :] + self._b[:, None]) % _HASH_PRIME
+        return permuted.min(axis=1)
+
+    def _band_keys(self, signature: np.ndarray) -> List[bytes]:
+        return [signature[i * self.rows:(i + 1) * self.rows].tobytes() for i in range(self.bands)]
+
+    # Apakah teks hampir sama dengan teks yang sudah ada di index
+    def contains(self, text: str) -> bool:
+        return self._find(self.signature(text))
+
+    def _find(self, signature: np.ndarray) -> bool:
+        # Hanya kandidat yang berbagi minimal satu band yang dibandingkan
+        candidates = set()
+        for band, key in enumerate(self._band_keys(signature)):
+            candidates.update(self.buckets[band].get(key, ()))
+        if not candidates:
+            return False
+        rows = self.signatures[np.fromiter(candidates, dtype=np.int64, count=len(candidates))]
+        # Persentase nilai MinHash yang sama = perkiraan kemiripan Jaccard
+        return bool(((rows == signature).mean(axis=1) >= self.threshold).any())
+
+    def add(self, text: str):
+        self._add(self.signature(text))
+
+    def _add(self, signature: np.ndarray):
+        item = self.size
+        if item == len(self.signatures):
+            grown = np.zeros((max(16, item * 2), self.num_perm), dtype=np.uint64)
+            grown[:item] = self.signatures
+            self.signatures = grown
+        self.signatures[item] = signature
+        self.size += 1
+        for band, key in enumerate(self._band_keys(signature)):
+            self.buckets[band].setdefault(key, []).append(item)
+
+    # Tambahkan teks jika belum ada yang mirip; kembalikan False jika teks hampir sama dengan yang ada
+    def add_if_new(self, text: str) -> bool:
+        signature = self.signature(text)
+        if self._find(signature):
+            return False
+        self._add(signature)
+        return True
+
+    def update(self, texts: Iterable[str]):
+        for text in texts:
+            self.add(text)
@@ -0,0 +1,196 @@
+import re
+import zlib
+from array import array
+from typing import Dict, Iterable, List, Sequence, Set
+
+import numpy as np
+
+# Ukuran vektor konteks (proyeksi acak kookurensi dalam kalimat) dan vektor n-gram karakter
+CONTEXT_DIM = 128
+NGRAM_DIM = 64
+# Bobot kemiripan konteks terhadap kemiripan bentuk kata di skor gabungan
+CONTEXT_WEIGHT = 0.75
+# Batas kosakata dan jumlah kalimat (diambil merata) yang dipakai membangun index
+MAX_TERMS = 5000
+MAX_SENTENCES = 5000
+# Kata yang muncul di lebih dari bagian kalimat ini dianggap kata umum (jika kalimatnya cukup banyak)
+MAX_SENTENCE_SHARE = 0.3
+MIN_SENTENCES_FOR_SHARE = 20
+# Jumlah tetangga terdekat yang disimpan per kata setelah dihitung sekali
+NEIGHBOR_CACHE_SIZE = 32
+
+# Kata berhuruf saja, minimal 4 huruf
+_WORD_RE = re.compile(r"[^\W\d_]{4,}")
+# Kata fungsi bahasa Indonesia yang tidak layak dijadikan pilihan jawaban
+_STOPWORDS = frozenset((
+    "adalah", "akan", "agar", "antara", "apabila", "atau", "bagi", "bahwa", "baik", "banyak", "beberapa",
+    "belum", "bisa", "dalam", "dapat", "dari", "dengan", "harus", "hingga", "jika", "juga", "kami", "karena",
+    "kata", "kecuali", "kemudian", "kepada", "ketika", "lain", "lainnya", "lebih", "maka", "masih", "melalui",
+    "menjadi", "merupakan", "mereka", "misalnya", "namun", "oleh", "pada", "para", "saat", "sama", "sangat",
+    "sebagai", "sebelum", "sedang", "sehingga", "sejak", "selain", "semua", "sendiri", "seperti", "serta",
+    "setelah", "setiap", "sudah", "tanpa", "telah", "tentang", "terhadap", "tersebut", "tetapi", "untuk",
+    "yaitu", "yakni", "yang",
+))
+
+
+# Vektor n-gram karakter (trigram dengan penanda awal/akhir kata) yang di-hash ke NGRAM_DIM dimensi
+def ngram_vectors(words: Sequence[str]) -> np.ndarray:
+    rows, columns, signs = array("I"), array("I"), array("f")
+    for row, word in enumerate(words):
+        padded = f"<{word}>"
+        for i in range(len(padded) - 2):
+            # crc32 agar hasilnya sama di semua proses (hash() bawaan diacak per proses)
+            h = zlib.crc32(padded[i:i + 3].encode("utf-8"))
+            rows.append(row)
+            columns.append(h % NGRAM_DIM)
+            signs.append(1.0 if h & 0x80000000 else -1.0)
+    vectors = np.zeros((len(words), NGRAM_DIM), dtype=np.float32)
+    np.add.at(vectors, (np.frombuffer(rows, dtype=np.uint32), np.frombuffer(columns, dtype=np.uint32)),
+              np.frombuffer(signs, dtype=np.float32))
+    return vectors
+
+
+# Normalisasi setiap baris ke panjang 1 (baris nol tetap nol)
+def _normalize_rows(vectors: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors / np.maximum(norms, 1e-12)
+
+
+# Index kemiripan kata untuk satu materi, dibangun sekali dari kalimat-kalimatnya. Setiap kata punya vektor
+# gabungan: kookurensi dalam kalimat (kata yang dipakai dalam konteks serupa) dan n-gram karakter (bentuk kata
+# serupa). Dipakai untuk mencari pilihan jawaban yang masuk akal tetapi salah.
+class DistractorIndex:
+    def __init__(self, sentences: Sequence[str], max_terms: int = MAX_TERMS, max_sentences: int = MAX_SENTENCES):
+        self.sentences = sentences
+        step = -(-len(sentences) // max_sentences) if len(sentences) > max_sentences else 1
+        sentence_ids = range(0, len(sentences), step)
+
+        # Kemunculan kata per kalimat (satu kali per kalimat), urut kalimat
+        vocabulary: Dict[str, int] = {}
+        occurrence_terms, occurrence_sentences = array("I"), array("I")
+        for sentence_id in sentence_ids:
+            words = dict.fromkeys(_WORD_RE.findall(sentences[sentence_id].lower()))
+            occurrence_terms.extend(vocabulary.setdefault(word, len(vocabulary)) for word in words)
+            occurrence_sentences.extend([sentence_id] * len(words))
+        all_terms = list(vocabulary)
+        terms = np.frombuffer(occurrence_terms, dtype=np.uint32).astype(np.int64)
+        occurrences = np.frombuffer(occurrence_sentences, dtype=np.uint32).astype(np.int64)
+
+        # Kosakata: kata bukan kata fungsi dan tidak terlalu umum, yang paling sering muncul lebih dulu
+        sentence_frequency = np.bincount(terms, minlength=len(all_terms))
+        keep = np.fromiter((term not in _STOPWORDS for term in all_terms), dtype=bool, count=len(all_terms))
+        if len(sentence_ids) >= MIN_SENTENCES_FOR_SHARE:
+            keep &= sentence_frequency <= MAX_SENTENCE_SHARE * len(sentence_ids)
+        kept = np.flatnonzero(keep)
+        kept = kept[np.argsort(-sentence_frequency[kept], kind="stable")[:max_terms]]
+        self.terms: List[str] = [all_terms[i] for i in kept]
+        self.term_ids = {term: i for i, term in enumerate(self.terms)}
+
+        remap = np.full(len(all_terms), -1, dtype=np.int64)
+        remap[kept] = np.arange(len(kept))
+        terms = remap[terms]
+        mask = terms >= 0
+        self._occurrence_terms = terms[mask]
+        self._occurrence_sentences = occurrences[mask]
+
+        context = self._context_vectors(self._occurrence_terms, self._occurrence_sentences, len(self.terms))
+        self.embeddings = np.hstack([
+            np.sqrt(CONTEXT_WEIGHT) * _normalize_rows(context),
+            np.sqrt(1 - CONTEXT_WEIGHT) * _normalize_rows(ngram_vectors(self.terms)),
+        ]).astype(np.float32)
+        self._neighbors: Dict[str, np.ndarray] = {}
+        self._postings: Dict[int, List[int]] = {}
+        self._rankings: Dict[tuple, List[str]] = {}
+
+    # Vektor konteks = jumlah kata lain di kalimat-kalimat yang memuat kata itu, diproyeksikan acak ke
+    # CONTEXT_DIM dimensi (matriks kalimat x kata A: A^T A R tanpa diagonal, tanpa membentuk A^T A)
+    @staticmethod
+    def _context_vectors(terms: np.ndarray, sentences: np.ndarray, num_terms: int) -> np.ndarray:
+        projection = np.random.default_rng(0).standard_normal((num_terms, CONTEXT_DIM)).astype(np.float32)
+        if not len(terms):
+            return np.zeros((num_terms, CONTEXT_DIM), dtype=np.float32)
+        # Jumlah proyeksi kata per kalimat; kemunculan sudah urut kalimat
+        starts = np.flatnonzero(np.r_[True, sentences[1:] != sentences[:-1]])
+        sentence_vectors = np.add.reduceat(projection[terms], starts)
+        sentence_of_occurrence = np.repeat(np.arange(len(starts)), np.diff(np.r_[starts, len(terms)]))
+        # Jumlah vektor kalimat per kata, lalu kurangi proyeksi kata itu sendiri
+        order = np.argsort(terms, kind="stable")
+        sorted_terms = terms[order]
+        term_starts = np.flatnonzero(np.r_[True, sorted_terms[1:] != sorted_terms[:-1]])
+        context = np.zeros((num_terms, CONTEXT_DIM), dtype=np.float32)
+        context[sorted_terms[term_starts]] = np.add.reduceat(
+            sentence_vectors[sentence_of_occurrence[order]], term_starts
+        )
+        context -= np.bincount(terms, minlength=num_terms)[:, None] * projection
+        return context
+
+    # Vektor gabungan untuk kata di luar kosakata: hanya bagian n-gram
+    def _vector(self, word: str) -> np.ndarray:
+        term_id = self.term_ids.get(word)
+        if term_id is not None:
+            return self.embeddings[term_id]
+        ngram = _normalize_rows(ngram_vectors([word]))[0] * np.sqrt(1 - CONTEXT_WEIGHT)
+        return np.concatenate([np.zeros(CONTEXT_DIM, dtype=np.float32), ngram]).astype(np.float32)
+
+    # Kandidat (misalnya konsep lain) urut dari yang paling mirip dengan word; urutan per kata dan daftar
+    # kandidat yang sama dihitung sekali
+    def rank(self, word: str, candidates: Sequence[str]) -> List[str]:
+        key = (word, tuple(candidates))
+        ranked = self._rankings.get(key)
+        if ranked is None:
+            ids = [self.term_ids.get(candidate.lower()) for candidate in candidates]
+            if None in ids:
+                vectors = np.stack([self._vector(candidate.lower()) for candidate in candidates])
+            else:
+                vectors = self.embeddings[ids]
+            scores = vectors @ self._vector(word.lower()) if candidates else np.zeros(0)
+            ranked = self._rankings[key] = [candidates[i] for i in np.argsort(-scores, kind="stable")]
+        return list(ranked)
+
+    # Sampai k kata paling mirip dengan word (huruf kecil), tanpa kata itu sendiri, variasi imbuhannya
+    # (salah satu awalan yang lain), dan kata di exclude. Tetangga terdekat dihitung sekali per kata.
+    def similar_terms(self, word: str, k: int, exclude: Iterable[str] = ()) -> List[str]:
+        word = word.lower()
+        neighbors = self._neighbors.get(word)
+        if neighbors is None:
+            scores = self.embeddings @ self._vector(word)
+            n = min(NEIGHBOR_CACHE_SIZE, len(scores))
+            if n == 0:
+                return []
+            neighbors = np.argpartition(-scores, n - 1)[:n]
+            neighbors = neighbors[np.lexsort((neighbors, -scores[neighbors]))]
+            self._neighbors[word] = neighbors
+        exclude = set(exclude)
+        similar = []
+        for term_id in neighbors:
+            term = self.terms[term_id]
+            if term in exclude or term.startswith(word) or word.startswith(term):
+                continue
+            similar.append(term)
+            if len(similar) == k:
+                break
+        return similar
+
+    # Nomor kalimat (dari kalimat yang dipakai membangun index) yang memuat kata
+    def sentences_with(self, word: str) -> List[int]:
+        term_id = self.term_ids.get(word.lower())
+        if term_id is None:
+            return []
+        postings = self._postings.get(term_id)
+        if postings is None:
+            postings = self._postings[term_id] = self._occurrence_sentences[self._occurrence_terms == term_id].tolist()
+        return postings
+
+
+# Kata (huruf kecil, minimal 4 huruf) di dalam teks, misalnya untuk mengecualikan kata yang sudah ada di soal
+def content_words(text: str) -> Set[str]:
+    return set(_WORD_RE.findall(text.lower()))
+
+
+# Samakan huruf besar/kecil pilihan jawaban dengan kata aslinya
+def match_case(word: str, like: str) -> str:
+    if like.isupper() and len(like) > 1:
+        return word.upper()
+    if like[:1].isupper():
+        return word.capitalize()
+    return word
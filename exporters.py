@@ -0,0 +1,67 @@
+import csv
+import io
+import json
+from typing import Iterable, TextIO
+
+# Format export yang didukung: (mime type, ekstensi file)
+EXPORT_FORMATS = {
+    "csv": ("text/csv", "csv"),
+    "json": ("application/json", "json"),
+    "txt": ("text/plain", "txt"),
+}
+
+
+# Tulis soal sebagai CSV, satu baris per soal
+def write_questions_csv(questions: Iterable, output: TextIO):
+    questions = list(questions)
+    max_options = max((len(q.options) for q in questions), default=0)
+    writer = csv.writer(output)
+    writer.writerow(["No", "Soal", "Jawaban_Benar", "Penjelasan", "Tipe", "Kesulitan"] +
+                    [f"Opsi_{chr(65 + j)}" for j in range(max_options)])
+    for i, q in enumerate(questions):
+        options = list(q.options) + [""] * (max_options - len(q.options))
+        writer.writerow([i + 1, q.question_text, q.correct_answer, q.explanation or "",
+                         q.question_type, q.difficulty] + options)
+
+
+# Tulis soal sebagai array JSON, satu soal per elemen tanpa membangun list dict utuh
+def write_questions_json(questions: Iterable, output: TextIO):
+    output.write("[")
+    for i, q in enumerate(questions):
+        output.write(",\n  " if i else "\n  ")
+        item = json.dumps(q.to_dict(), indent=2, ensure_ascii=False)
+        output.write(item.replace("\n", "\n  "))
+    output.write("\n]\n")
+
+
+# Tulis soal sebagai teks yang mudah dibaca
+def write_questions_txt(questions: Iterable, output: TextIO):
+    output.write("SOAL DAN JAWABAN\n================\n\n")
+    for i, q in enumerate(questions):
+        output.write(f"{i+1}. {q.question_text}\n")
+        for j, option in enumerate(q.options):
+            output.write(f"   {chr(65+j)}. {option}\n")
+        output.write(f"   ✅ Jawaban: {q.correct_answer}\n")
+        if q.explanation:
+            output.write(f"   💡 Penjelasan: {q.explanation}\n")
+        output.write("\n")
+
+
+_WRITERS = {
+    "csv": write_questions_csv,
+    "json": write_questions_json,
+    "txt": write_questions_txt,
+}
+
+
+# Serialisasi soal menjadi bytes UTF-8 yang siap diunduh. st.download_button hanya menerima str/bytes/BytesIO
+# dari callable data-nya dan tetap membaca seluruh isinya ke memori, jadi hasilnya langsung bytes.
+def export_questions(questions: Iterable, file_type: str) -> bytes:
+    if file_type not in _WRITERS:
+        raise ValueError(f"Format export tidak didukung: {file_type}")
+    buffer = io.BytesIO()
+    text_output = io.TextIOWrapper(buffer, encoding="utf-8", newline="")
+    _WRITERS[file_type](questions, text_output)
+    text_output.flush()
+    text_output.detach()
+    return buffer.getvalue()
@@ -0,0 +1,410 @@
+import codecs
+import hashlib
+import io
+import itertools
+import mmap
+import multiprocessing
+import os
+import posixpath
+from typing import Iterator, List, Optional, Sequence, Tuple
+
+# Ukuran sampel awal file TXT untuk deteksi encoding
+TXT_SAMPLE_BYTES = 64 * 1024
+# Encoding materi lama dari Windows, dipakai jika file TXT bukan UTF-8 yang valid
+TXT_FALLBACK_ENCODING = "cp1252"
+
+# Byte order mark dan encoding-nya; UTF-32 dicek lebih dulu karena BOM UTF-32 LE diawali BOM UTF-16 LE
+_TXT_BOMS = (
+    (codecs.BOM_UTF32_LE, "utf-32"),
+    (codecs.BOM_UTF32_BE, "utf-32"),
+    (codecs.BOM_UTF8, "utf-8-sig"),
+    (codecs.BOM_UTF16_LE, "utf-16"),
+    (codecs.BOM_UTF16_BE, "utf-16"),
+)
+
+# Jumlah halaman minimal sebelum ekstraksi PDF dibagi ke beberapa proses
+PARALLEL_MIN_PAGES = 16
+# Proses worker dibuat dengan spawn, bukan fork: fork dari server Streamlit yang multithread bisa mewarisi lock
+# yang sedang dipegang thread lain, sehingga worker macet selamanya
+WORKER_CONTEXT = multiprocessing.get_context("spawn")
+
+# Jumlah blok level body DOCX yang diproses sekaligus oleh jalur cepat sebelum dibuang dari pohon XML
+DOCX_BATCH_BLOCKS = 256
+
+# Reader PDF milik setiap proses worker, dibuka sekali saat worker dimulai
+_worker_reader = None
+
+
+# Buka PDF di proses worker
+def _init_pdf_worker(pdf_bytes: bytes):
+    global _worker_reader
+    import PyPDF2
+    _worker_reader = PyPDF2.PdfReader(io.BytesIO(pdf_bytes))
+
+
+# Ekstrak teks satu halaman di proses worker
+def _extract_pdf_page(page_number: int) -> str:
+    return _worker_reader.pages[page_number].extract_text() or ""
+
+
+# Ambil isi file upload sebagai bytes
+def read_file_bytes(file) -> bytes:
+    if hasattr(file, "getvalue"):
+        return file.getvalue()
+    file.seek(0)
+    return file.read()
+
+
+# Tampilan memoryview isi file tanpa menyalin bytes (lepaskan dengan `with` setelah dipakai).
+# getvalue BytesIO (termasuk file upload Streamlit) memakai buffer yang sama, sedangkan getbuffer menyalin
+# seluruh isi jika buffer itu masih dibagi dengan bytes awalnya. File di disk di-mmap.
+def read_file_view(file) -> memoryview:
+    if hasattr(file, "getvalue"):
+        return memoryview(file.getvalue())
+    try:
+        fileno = file.fileno()
+        return memoryview(mmap.mmap(fileno, 0, access=mmap.ACCESS_READ))
+    except (AttributeError, OSError, ValueError):
+        # Bukan file di disk, atau file kosong (mmap tidak bisa memetakan 0 byte)
+        return memoryview(read_file_bytes(file))
+
+
+# Encoding file TXT dari BOM atau sampel awal: UTF-8 jika sampel valid, selain itu cp1252
+def detect_txt_encoding(view, sample_bytes: int = TXT_SAMPLE_BYTES) -> str:
+    head = bytes(view[:4])
+    for bom, encoding in _TXT_BOMS:
+        if head.startswith(bom):
+            return encoding
+    try:
+        # Decoder bertahap agar karakter multi-byte yang terpotong di akhir sampel tidak dianggap rusak
+        codecs.getincrementaldecoder("utf-8")().decode(view[:sample_bytes])
+    except UnicodeDecodeError:
+        return TXT_FALLBACK_ENCODING
+    return "utf-8"
+
+
+# Decode seluruh isi file TXT menjadi satu string tanpa salinan bytes perantara.
+# Jika UTF-8 ternyata rusak setelah sampel, sisa file mulai dari byte rusak pertama dibaca sebagai cp1252.
+def decode_txt(txt_file) -> str:
+    with read_file_view(txt_file) as view:
+        encoding = detect_txt_encoding(view)
+        if encoding != "utf-8":
+            return str(view, encoding, "replace")
+        try:
+            return str(view, "utf-8")
+        except UnicodeDecodeError as e:
+            return str(view[:e.start], "utf-8") + str(view[e.start:], TXT_FALLBACK_ENCODING, "replace")
+
+
+# Decode file TXT bertahap per potongan dengan encoding hasil deteksi (hasil sama dengan decode_txt)
+def iter_txt_chunks(txt_file, chunk_size: int = 1024 * 1024) -> Iterator[str]:
+    with read_file_view(txt_file) as view:
+        encoding = detect_txt_encoding(view)
+        errors = "strict" if encoding == "utf-8" else "replace"
+        decoder = codecs.getincrementaldecoder(encoding)(errors)
+        # Potongan kosong terakhir (final) mengosongkan sisa byte; byte terpotong di akhir file juga bisa rusak
+        for offset in itertools.chain(range(0, len(view), chunk_size), [None]):
+            final = offset is None
+            chunk = b"" if final else view[offset:offset + chunk_size]
+            try:
+                text = decoder.decode(chunk, final)
+            except UnicodeDecodeError as e:
+                # UTF-8 rusak setelah sampel: seperti decode_txt, mulai dari byte rusak pertama dibaca sebagai cp1252.
+                # Posisi error dihitung dari byte sisa potongan sebelumnya + potongan ini.
+                data = decoder.getstate()[0] + bytes(chunk)
+                decoder = codecs.getincrementaldecoder(TXT_FALLBACK_ENCODING)("replace")
+                text = str(data[:e.start], "utf-8") + decoder.decode(data[e.start:], final)
+            yield text
+
+
+# Hash semua yang dibaca ekstraksi teks sebuah halaman PDF (tanpa ekstraksi teks): content stream dan pohon
+# /Resources yang sudah di-resolve penuh (font, Form XObject beserta resource-nya, dan seterusnya).
+# Halaman yang isi dan resource-nya sama mendapat hash sama; isi XObject atau font yang berbeda berarti hash berbeda.
+def pdf_page_digests(pdf_file) -> List[str]:
+    import PyPDF2
+    from PyPDF2.generic import ArrayObject, DictionaryObject, IndirectObject, StreamObject
+
+    # Hash objek tidak langsung per (id, generasi), jadi font/XObject yang dipakai banyak halaman di-hash sekali
+    memo = {}
+
+    def object_digest(obj) -> bytes:
+        if isinstance(obj, IndirectObject):
+            ref = (obj.idnum, obj.generation)
+            cached = memo.get(ref)
+            if cached is None:
+                # Penanda sementara untuk objek yang merujuk dirinya sendiri (siklus)
+                memo[ref] = f"ref:{ref}".encode()
+                cached = memo[ref] = object_digest(obj.get_object())
+            return cached
+        digest = hashlib.sha256(type(obj).__name__.encode())
+        if isinstance(obj, DictionaryObject):
+            for key in sorted(obj):
+                # /Parent dan /P menunjuk ke atas (pohon halaman), bukan bagian isi halaman ini
+                if key in ("/Parent", "/P"):
+                    continue
+                digest.update(key.encode("utf-8", "backslashreplace"))
+                digest.update(object_digest(obj.raw_get(key)))
+            if isinstance(obj, StreamObject):
+                digest.update(obj.get_data())
+        elif isinstance(obj, ArrayObject):
+            for item in obj:
+                digest.update(object_digest(item))
+        else:
+            digest.update(repr(obj).encode("utf-8", "backslashreplace"))
+        return digest.digest()
+
+    digests = []
+    for page in PyPDF2.PdfReader(pdf_file).pages:
+        # /Resources bisa diwarisi dari node induk di pohon halaman, dicari seperti saat ekstraksi teks
+        node = page
+        while node is not None and "/Resources" not in node:
+            parent = node.get("/Parent")
+            node = parent.get_object() if parent is not None else None
+        digest = hashlib.sha256()
+        for key, value in (("/Contents", page.raw_get("/Contents") if "/Contents" in page else None),
+                           ("/Resources", node.raw_get("/Resources") if node is not None else None)):
+            digest.update(key.encode())
+            if value is not None:
+                digest.update(object_digest(value))
+        digests.append(digest.hexdigest())
+    return digests
+
+
+# Ekstrak teks halaman PDF satu per satu di proses utama
+def iter_pdf_pages_sequential(pdf_reader, page_numbers: Sequence[int]) -> Iterator[str]:
+    for page_number in page_numbers:
+        yield pdf_reader.pages[page_number].extract_text() or ""
+
+
+# Ekstrak teks halaman PDF di proses worker (paralel jika workers > 1), hasil tetap berurutan sesuai nomor halaman
+def iter_pdf_pages_parallel(pdf_bytes: bytes, page_numbers: Sequence[int], workers: int,
+                            page_timeout: float) -> Iterator[str]:
+    page_numbers = list(page_numbers)
+    start = 0
+    while start < len(page_numbers):
+        stalled, finished = None, []
+        with WORKER_CONTEXT.Pool(min(workers, len(page_numbers) - start), initializer=_init_pdf_worker,
+                                 initargs=(pdf_bytes,)) as pool:
+            results = [pool.apply_async(_extract_pdf_page, (i,)) for i in page_numbers[start:]]
+            for position, result in enumerate(results):
+                try:
+                    text = result.get(timeout=page_timeout)
+                except multiprocessing.TimeoutError:
+                    # Worker yang macet tetap sibuk dengan halaman ini; hasil berikutnya yang sudah selesai diambil
+                    # lalu pool dihentikan dan dibuat ulang, agar halaman sisanya tidak ikut menunggu page_timeout
+                    stalled = position
+                    for later in results[position + 1:]:
+                        if not (later.ready() and later.successful()):
+                            break
+                        finished.append(later.get())
+                    break
+                except Exception:
+                    # Halaman yang rusak dilewati, workernya masih bisa dipakai
+                    text = ""
+                yield text
+        # Keluar dari blok with memanggil terminate(), worker yang macet ikut dihentikan
+        if stalled is None:
+            return
+        yield ""
+        yield from finished
+        start += stalled + 1 + len(finished)
+
+
+# Generator teks per halaman PDF (semua halaman atau hanya page_numbers). Halaman diekstrak di proses worker agar
+# halaman yang macet bisa dihentikan setelah page_timeout detik (pool lalu dibuat ulang untuk halaman sisanya):
+# paralel jika halamannya cukup banyak, selain itu satu worker. page_timeout=None berarti tanpa batas waktu, halaman diekstrak langsung di proses ini.
+def iter_pdf_pages(pdf_file, workers: int = None, page_timeout: Optional[float] = 30.0,
+                   page_numbers: Sequence[int] = None) -> Iterator[str]:
+    # PyPDF2 baru dimuat saat ada file PDF yang diproses
+    import PyPDF2
+    pdf_reader = PyPDF2.PdfReader(pdf_file)
+    if page_numbers is None:
+        page_numbers = range(len(pdf_reader.pages))
+    num_pages = len(page_numbers)
+    if num_pages == 0:
+        return
+    if page_timeout is None:
+        yield from iter_pdf_pages_sequential(pdf_reader, page_numbers)
+        return
+
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if num_pages < PARALLEL_MIN_PAGES:
+        workers = 1
+    workers = max(min(workers, num_pages), 1)
+    yield from iter_pdf_pages_parallel(read_file_bytes(pdf_file), page_numbers, workers, page_timeout)
+
+
+# Tag WordprocessingML yang dibaca ekstraktor DOCX
+_W = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+_W_BODY, _W_HDR, _W_FTR = _W + "body", _W + "hdr", _W + "ftr"
+_W_P, _W_TBL, _W_TR, _W_TC, _W_SDT = _W + "p", _W + "tbl", _W + "tr", _W + "tc", _W + "sdt"
+_W_T, _W_TAB, _W_BR, _W_CR = _W + "t", _W + "tab", _W + "br", _W + "cr"
+_W_TXBX_CONTENT, _W_TYPE, _W_VAL = _W + "txbxContent", _W + "type", _W + "val"
+# Text box ditulis dua kali (mc:Choice dan mc:Fallback untuk Word lama), bagian Fallback diabaikan
+_MC_FALLBACK = "{http://schemas.openxmlformats.org/markup-compatibility/2006}Fallback"
+_RELATIONSHIP = "{http://schemas.openxmlformats.org/package/2006/relationships}Relationship"
+_OFFICE_DOCUMENT_TYPE = "http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument"
+
+
+# Teks satu paragraf; text box di dalamnya menjadi blok sendiri sebelum paragrafnya.
+# special=False berarti paragraf tidak berisi tab, pindah baris, atau text box (sudah dicek oleh _iter_blocks).
+def _paragraph_blocks(paragraph, special: bool = True) -> Iterator[str]:
+    if not special:
+        # Paragraf biasa (hampir semua): gabungkan teks w:t langsung di level C tanpa membuat objek elemen
+        yield "".join(paragraph.itertext(_W_T, with_tail=False))
+        return
+
+    if next(paragraph.iter(_MC_FALLBACK, _W_TXBX_CONTENT), None) is not None:
+        for fallback in list(paragraph.iter(_MC_FALLBACK)):
+            fallback.clear()
+        nested = set()
+        for box in list(paragraph.iter(_W_TXBX_CONTENT)):
+            if box in nested:
+                continue
+            nested.update(box.iter(_W_TXBX_CONTENT))
+            yield from _iter_blocks(box)
+            box.clear()
+
+    parts = []
+    for element in paragraph.iter(_W_T, _W_TAB, _W_BR, _W_CR):
+        tag = element.tag
+        if tag == _W_T:
+            parts.append(element.text or "")
+        elif tag == _W_TAB:
+            # w:tab dengan w:val adalah posisi tab stop di properti paragraf, bukan karakter tab
+            if element.get(_W_VAL) is None:
+                parts.append("\t")
+        elif element.get(_W_TYPE) not in ("page", "column"):
+            # Pindah halaman/kolom bukan bagian teks, hanya pindah baris yang ditulis
+            parts.append("\n")
+    # Pindah baris di awal/akhir paragraf akan menjadi baris kosong (batas paragraf palsu)
+    yield "".join(parts).strip("\n")
+
+
+# Satu blok per baris tabel, sel dipisah tab; isi tabel bersarang masuk ke sel induknya
+def _table_blocks(table, special: set) -> Iterator[str]:
+    for row in table.iter(_W_TR):
+        # iter() juga menemukan baris tabel bersarang; yang dipakai hanya baris milik tabel ini
+        if _enclosing_table(row) is not table:
+            continue
+        cells = []
+        for cell in row.iter(_W_TC):
+            if _enclosing_table(cell) is table:
+                cells.append(" ".join(text for text in _iter_blocks(cell, special=special) if text.strip()))
+        text = "\t".join(cell for cell in cells if cell)
+        if text:
+            yield text
+
+
+# Tabel terdekat yang memuat elemen (baris atau sel)
+def _enclosing_table(element):
+    parent = element.getparent()
+    while parent is not None and parent.tag != _W_TBL:
+        parent = parent.getparent()
+    return parent
+
+
+# Semua elemen di bawah container yang memuat tab, pindah baris, atau text box (beserta leluhurnya sampai
+# container). Dicari dengan satu scan, karena memanggil iter() per paragraf jauh lebih mahal daripada membaca
+# teksnya; paragraf dan sel yang tidak ada di himpunan ini dibaca lewat jalur biasa.
+def _special_elements(container) -> set:
+    special = set()
+    for element in container.iter(_W_TAB, _W_BR, _W_CR, _MC_FALLBACK, _W_TXBX_CONTENT):
+        while element is not None and element is not container and element not in special:
+            special.add(element)
+            element = element.getparent()
+    return special
+
+
+# Blok teks dari anak-anak satu elemen (body, header/footer, sel tabel, text box) sesuai urutan dokumen,
+# atau hanya anak-anak tertentu (children). Elemen pembungkus seperti content control (w:sdt) dibuka rekursif.
+def _iter_blocks(container, children: Sequence = None, special: set = None) -> Iterator[str]:
+    if special is None:
+        special = _special_elements(container)
+    for child in container if children is None else children:
+        tag = child.tag
+        if tag == _W_P:
+            yield from _paragraph_blocks(child, child in special)
+        elif tag == _W_TBL:
+            yield from _table_blocks(child, special)
+        elif tag != _MC_FALLBACK and isinstance(tag, str) and len(child):
+            yield from _iter_blocks(child, special=special)
+
+
+# Path part di dalam paket OPC dari target relationship (relatif terhadap folder part sumber)
+def _resolve_part(source_dir: str, target: str) -> str:
+    if target.startswith("/"):
+        return target[1:]
+    return posixpath.normpath(posixpath.join(source_dir, target))
+
+
+# (tipe, path part) dari file .rels, urut seperti di file
+def _read_relationships(archive, rels_path: str, source_dir: str) -> List[Tuple[str, str]]:
+    from xml.etree import ElementTree
+
+    try:
+        data = archive.read(rels_path)
+    except KeyError:
+        return []
+    root = ElementTree.fromstring(data)
+    return [
+        (rel.get("Type", ""), _resolve_part(source_dir, rel.get("Target", "")))
+        for rel in root.iter(_RELATIONSHIP) if rel.get("TargetMode") != "External"
+    ]
+
+
+# Jalur cepat DOCX: XML dokumen, header, dan footer dibaca langsung dari zip dengan parser XML bertahap, tanpa
+# membangun object model python-docx. Blok di level body diproses per DOCX_BATCH_BLOCKS lalu dibuang, jadi memori
+# tidak tumbuh dengan panjang dokumen. Header ditulis sebelum isi dokumen, footer sesudahnya.
+def iter_docx_blocks_fast(docx_file) -> Iterator[str]:
+    import zipfile
+    from lxml import etree
+
+    with zipfile.ZipFile(docx_file) as archive:
+        main_part = next((part for rel_type, part in _read_relationships(archive, "_rels/.rels", "")
+                          if rel_type == _OFFICE_DOCUMENT_TYPE), "word/document.xml")
+        main_dir, main_name = posixpath.split(main_part)
+        related = _read_relationships(archive, posixpath.join(main_dir, "_rels", main_name + ".rels"), main_dir)
+        headers = [part for rel_type, part in related if rel_type.endswith("/header")]
+        footers = [part for rel_type, part in related if rel_type.endswith("/footer")]
+        names = set(archive.namelist())
+        for part in headers + [main_part] + footers:
+            if part not in names:
+                continue
+            with archive.open(part) as stream:
+                container, pending = None, 0
+                for _, element in etree.iterparse(stream, events=("end",), tag=(_W_P, _W_TBL, _W_SDT),
+                                                  huge_tree=True):
+                    container = element.getparent()
+                    if container is None or container.tag not in (_W_BODY, _W_HDR, _W_FTR):
+                        continue
+                    pending += 1
+                    if pending >= DOCX_BATCH_BLOCKS:
+                        # Parser bisa sudah membaca sebagian elemen sesudahnya; yang diproses hanya sampai elemen ini
+                        done = container.index(element) + 1
+                        yield from _iter_blocks(container, container[:done])
+                        del container[:done]
+                        pending = 0
+                if container is not None and container.tag in (_W_BODY, _W_HDR, _W_FTR):
+                    yield from _iter_blocks(container)
+
+
+# Ekstraksi DOCX lewat python-docx (object model lengkap), urutan dan hasil sama dengan jalur cepat
+def iter_docx_blocks_python_docx(docx_file) -> Iterator[str]:
+    import docx
+    from docx.opc.constants import RELATIONSHIP_TYPE
+
+    document = docx.Document(docx_file)
+    rels = [rel for rel in document.part.rels.values() if not rel.is_external]
+    headers = [rel.target_part.element for rel in rels if rel.reltype == RELATIONSHIP_TYPE.HEADER]
+    footers = [rel.target_part.element for rel in rels if rel.reltype == RELATIONSHIP_TYPE.FOOTER]
+    for element in headers + [document.element.body] + footers:
+        yield from _iter_blocks(element)
+
+
+# Generator teks per blok DOCX (paragraf, baris tabel, header/footer, text box) sesuai urutan dokumen
+def iter_docx_blocks(docx_file, fast: bool = True) -> Iterator[str]:
+    if fast:
+        return iter_docx_blocks_fast(docx_file)
+    return iter_docx_blocks_python_docx(docx_file)
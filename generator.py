@@ -0,0 +1,596 @@
+import hashlib
+import random
+import re
+from collections import OrderedDict
+from typing import Callable, Iterable, List, Optional, Sequence, Tuple
+
+from concept_scoring import ConceptScorer
+from course import CourseModel
+from dedup import NearDuplicateIndex, is_near_duplicate
+from distractors import DistractorIndex, content_words, match_case
+from question_backends import QuestionBackend, TemplateBackend
+from questions import Question
+from reporting import Reporter, StreamlitReporter
+from sections import SectionedDocument
+from text_pipeline import DocumentModel, mask_concept, shorten_sentence
+from tracing import Tracer
+
+# Versi template soal, naikkan jika template/logika generate berubah agar cache hasil lama tidak terpakai
+TEMPLATE_VERSION = "7"
+
+# Jumlah kata/konsep termirip yang diacak sebagai kandidat distractor, agar soal tentang kata yang sama
+# tidak selalu mendapat pilihan yang sama
+SIMILAR_POOL_SIZE = 6
+# Pilihan salah terakhir jika kandidat distractor habis (hampir sama dengan opsi lain)
+LAST_RESORT_OPTIONS = (
+    "Tidak ada jawaban yang tepat",
+    "Tidak disebutkan dalam materi",
+    "Semua pilihan lain benar",
+)
+
+# Class untuk menghasilkan soal dengan AI
+class AdvancedQuestionGenerator:
+    def __init__(self, reporter: Reporter = None, max_cached_results: int = 32,
+                 concept_scorer: ConceptScorer = None, backend: QuestionBackend = None,
+                 duplicate_threshold: float = 0.7, max_attempts_per_question: int = 5, tracer: Tracer = None):
+        self.generated_questions = []
+        self.document = None
+        self.reporter = reporter if reporter is not None else StreamlitReporter()
+        self.concept_scorer = concept_scorer if concept_scorer is not None else ConceptScorer()
+        # Mesin pembuat soal: template bawaan atau LLM
+        self.backend = backend if backend is not None else TemplateBackend()
+        # Semua pilihan acak memakai instance ini agar hasil bisa diulang dengan seed yang sama
+        self.rng = random.Random()
+        self.last_seed = None
+        # Kalimat bermakna dan index konsep -> kalimat untuk materi yang sedang diproses
+        self.sentences = []
+        self.concept_index = {}
+        # Kunci bagian materi untuk setiap kalimat (kosong jika materi tidak dibagi per bagian) dan
+        # kalimat pendukung soal terakhir, untuk mencatat bagian sumber setiap soal
+        self.sentence_sections = []
+        self.support_sentence_id = None
+        # Index kemiripan kata untuk distractor, dibangun sekali per daftar kalimat materi
+        self.distractor_index = None
+        # Soal yang sudah dibuat di run ini (dan riwayat), soal yang hampir sama ditolak
+        self.duplicate_threshold = duplicate_threshold
+        self.max_attempts_per_question = max_attempts_per_question
+        self.seen_questions = NearDuplicateIndex(duplicate_threshold)
+        # Cache hasil generate berdasarkan (hash materi, jumlah soal, seed, generation_key)
+        self.result_cache = OrderedDict()
+        self.max_cached_results = max_cached_results
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.tracer = tracer if tracer is not None else Tracer()
+        self.question_templates = {
+            "definition": [
+                "Apa yang dimaksud dengan {concept}?",
+                "Jelaskan pengertian dari {concept}!",
+                "Definisikan konsep {concept}!"
+            ],
+            "cause_effect": [
+                "Apa penyebab dari {concept}?",
+                "Apa dampak dari {concept}?",
+                "Bagaimana {concept} mempengaruhi proses lainnya?"
+            ],
+            "comparison": [
+                "Bandingkan {concept1} dan {concept2}!",
+                "Apa perbedaan antara {concept1} dengan {concept2}?",
+                "Apa persamaan {concept1} dan {concept2}?"
+            ],
+            "application": [
+                "Bagaimana cara menerapkan {concept} dalam kehidupan sehari-hari?",
+                "Berikan contoh penerapan {concept}!",
+                "Aplikasi apa saja yang menggunakan prinsip {concept}?"
+            ],
+            "simple": [
+                "Apa itu {concept}?",
+                "Jelaskan {concept} secara singkat!",
+                "Apa fungsi dari {concept}?"
+            ]
+        }
+    
+    # Generate questions dengan variasi
+    def generate_questions_advanced(self, material_text: str, num_questions: int = 10, document: DocumentModel = None,
+                                    seed: int = None, material_digest: str = None,
+                                    progress_callback: Callable[[int, Question], None] = None,
+                                    history: List[str] = None, previous_questions: Sequence[Question] = None,
+                                    previous_sections: Iterable[str] = None) -> List[Question]:
+        # Seed acak jika tidak ditentukan, disimpan agar set soal bisa dibuat ulang
+        if seed is None:
+            seed = random.randrange(2 ** 32)
+        self.last_seed = seed
+        if material_digest is None:
+            material_digest = hashlib.sha256(material_text.encode("utf-8")).hexdigest()
+
+        # Set soal yang sama pernah dibuat, kembalikan langsung dari cache
+        cache_key = (material_digest, num_questions, seed, self.generation_key)
+        if history:
+            # Soal riwayat yang dihindari ikut menentukan hasil
+            history_digest = hashlib.sha256("\n".join(history).encode("utf-8")).hexdigest()
+            cache_key += (history_digest,)
+        if previous_questions:
+            previous_questions = list(previous_questions)
+            previous_sections = list(previous_sections) if previous_sections is not None else None
+            # Hasil generate ulang bergantung pada soal lama dan bagian materi saat soal itu dibuat
+            previous_digest = hashlib.sha256("\n".join(
+                [q.question_id for q in previous_questions] + ["--"] + (previous_sections or [])
+            ).encode("utf-8")).hexdigest()
+            cache_key += ("incremental", previous_digest)
+        cached = self.result_cache.get(cache_key)
+        if cached is not None:
+            self.result_cache.move_to_end(cache_key)
+            self.cache_hits += 1
+            self.tracer.record_cache("generation_result", hits=1)
+            return list(cached)
+        self.cache_misses += 1
+        self.tracer.record_cache("generation_result", misses=1)
+
+        with self.tracer.span("generate"):
+            # Pakai model dokumen dari MaterialProcessor agar teks tidak di-scan ulang
+            if document is not None:
+                self.document = document
+            self.rng.seed(seed)
+            with self.tracer.span("extract_sentences"):
+                sentences = self.extract_meaningful_sentences(material_text)
+            with self.tracer.span("extract_concepts"):
+                concepts = self.extract_key_concepts_advanced(material_text)
+                # Index dibuat sekali per dokumen, tiap soal cukup lookup kalimat pendukungnya
+                self.sentences = sentences
+                self.concept_index = self.get_document(material_text).concept_index(concepts)
+                self.sentence_sections = self.document.sentence_sections() \
+                    if isinstance(self.document, CourseModel) else []
+            self.seen_questions = NearDuplicateIndex(self.duplicate_threshold)
+            self.seen_questions.update(history or ())
+
+            # Generate berbagai jenis soal lewat backend yang dipilih
+            if previous_questions and isinstance(self.document, CourseModel):
+                questions = self.regenerate_changed_questions(self.document, concepts, num_questions,
+                                                              previous_questions, previous_sections,
+                                                              progress_callback)
+            elif isinstance(self.document, CourseModel) and not isinstance(self.document, SectionedDocument):
+                questions = self.generate_course_questions(self.document, concepts, num_questions,
+                                                           progress_callback)
+            else:
+                questions = self.backend.generate(self, material_text, concepts, sentences, num_questions,
+                                                  progress_callback)
+                self.attribute_sections(questions)
+            self.assign_question_ids(questions)
+
+        self.result_cache[cache_key] = list(questions)
+        while len(self.result_cache) > self.max_cached_results:
+            self.result_cache.popitem(last=False)
+        return questions
+    
+    # Materi beberapa file: konsep dari model gabungan, jumlah soal tiap file sesuai kuota bobotnya
+    def generate_course_questions(self, course: CourseModel, concepts: List[str], num_questions: int,
+                                  progress_callback: Callable[[int, Question], None] = None) -> List[Question]:
+        questions = []
+        for course_file, quota in zip(course.files, course.quotas(num_questions)):
+            if quota == 0:
+                continue
+            document = course_file.document
+            sentences = document.meaningful_sentences()
+            concept_index = document.concept_index(concepts)
+            # Konsep course yang muncul di file ini; file tanpa konsep course tetap memakai semua konsep
+            file_concepts = [concept for concept in concepts if concept_index[concept]] or concepts
+            self.sentences = sentences
+            self.concept_index = concept_index
+            self.sentence_sections = document.sentence_sections() if isinstance(document, CourseModel) \
+                else [course_file.material_hash] * len(sentences)
+
+            on_question = None
+            if progress_callback is not None:
+                def on_question(question_num: int, question: Question, offset: int = len(questions)):
+                    progress_callback(offset + question_num, question)
+            file_questions = self.backend.generate(self, document.text, file_concepts, sentences, quota, on_question)
+            self.attribute_sections(file_questions)
+            questions.extend(file_questions)
+
+        self.sentences = course.meaningful_sentences()
+        self.concept_index = course.concept_index(concepts)
+        self.sentence_sections = course.sentence_sections()
+        return questions
+
+    # Generate ulang hanya soal dari bagian materi yang berubah. Soal lama yang bagian sumbernya masih ada
+    # dipertahankan beserta id-nya; penggantinya dibuat dari bagian yang belum ada di previous_sections
+    # (bagian materi saat soal lama dibuat) dan mengisi posisi soal yang dibuang. Kalimat dan index konsep
+    # hanya dibangun untuk bagian yang berubah, jadi kerjanya sebanding dengan besar perubahan.
+    def regenerate_changed_questions(self, document: CourseModel, concepts: List[str], num_questions: int,
+                                     previous_questions: List[Question], previous_sections: List[str] = None,
+                                     progress_callback: Callable[[int, Question], None] = None) -> List[Question]:
+        current_sections = set(document.section_keys())
+        kept = [q for q in previous_questions if q.section_id in current_sections][:num_questions]
+        for question_num, question in enumerate(kept):
+            self.seen_questions.add(question.question_text)
+            if progress_callback is not None:
+                progress_callback(question_num, question)
+
+        new_questions = []
+        num_new = num_questions - len(kept)
+        if num_new > 0:
+            covered = {q.section_id for q in kept}
+            old_sections = set(previous_sections) if previous_sections is not None else covered
+            leaves = document.leaves()
+            changed = [leaf for leaf in leaves if leaf.material_hash not in old_sections]
+            # Materi hanya dihapus (tidak ada bagian baru): pengganti dari bagian yang belum punya soal
+            if not any(leaf.document.meaningful_sentences() for leaf in changed):
+                changed = [leaf for leaf in leaves if leaf.material_hash not in covered] or leaves
+            pool = SectionedDocument(changed)
+            self.sentences = pool.meaningful_sentences()
+            self.concept_index = pool.concept_index(concepts)
+            self.sentence_sections = pool.sentence_sections()
+            pool_concepts = [concept for concept in concepts if self.concept_index[concept]] or concepts
+
+            on_question = None
+            if progress_callback is not None:
+                def on_question(question_num: int, question: Question):
+                    progress_callback(len(kept) + question_num, question)
+            new_questions = self.backend.generate(self, pool.text, pool_concepts, self.sentences, num_new,
+                                                  on_question)
+            self.attribute_sections(new_questions)
+            self.sentences = document.meaningful_sentences()
+            self.concept_index = document.concept_index(concepts)
+            self.sentence_sections = document.sentence_sections()
+
+        # Urutan soal lama dipertahankan, soal baru mengisi posisi soal yang bagiannya berubah
+        kept_ids = {id(q) for q in kept}
+        replacements = iter(new_questions)
+        questions = []
+        for question in previous_questions:
+            if id(question) in kept_ids:
+                questions.append(question)
+            else:
+                replacement = next(replacements, None)
+                if replacement is not None:
+                    questions.append(replacement)
+        questions.extend(replacements)
+        return questions
+
+    # Bagian materi tempat kalimat dengan nomor sentence_id berada
+    def section_of(self, sentence_id: Optional[int]) -> str:
+        if sentence_id is None or sentence_id >= len(self.sentence_sections):
+            return ""
+        return self.sentence_sections[sentence_id]
+
+    # Soal tanpa kalimat pendukung (misalnya dari LLM) dikaitkan ke bagian kalimat pertama yang memuat konsepnya
+    def attribute_sections(self, questions: List[Question]):
+        for question in questions:
+            if not question.section_id:
+                sentence_ids = self.concept_index.get(question.concept)
+                question.section_id = self.section_of(sentence_ids[0]) if sentence_ids else ""
+
+    # Id soal = awal kunci bagian sumber + nomor urut di bagian itu; id yang sudah dipakai tidak diulang
+    def assign_question_ids(self, questions: List[Question]):
+        used = {q.question_id for q in questions if q.question_id}
+        counters = {}
+        for question in questions:
+            if question.question_id:
+                continue
+            prefix = question.section_id[:12] or "materi"
+            number = counters.get(prefix, 0) + 1
+            while f"{prefix}-{number}" in used:
+                number += 1
+            counters[prefix] = number
+            question.question_id = f"{prefix}-{number}"
+            used.add(question.question_id)
+
+    # Identitas konfigurasi generate (template, scorer konsep, backend); set soal hanya bisa dipakai ulang jika sama
+    @property
+    def generation_key(self) -> str:
+        return f"{TEMPLATE_VERSION}:{self.concept_scorer.key}:{self.backend.key}"
+
+    # Terima soal jika belum ada soal yang hampir sama di run ini atau riwayat
+    def accept_question(self, question: Question) -> bool:
+        with self.tracer.span("dedup_check"):
+            return self.seen_questions.add_if_new(question.question_text)
+
+    # Ambil soal acak sampai ada num_questions soal yang berbeda, dilanjutkan dari daftar questions
+    def sample_distinct_questions(self, concepts: List[str], sentences: List[str], material_text: str,
+                                  num_questions: int, questions: List[Question] = None,
+                                  progress_callback: Callable[[int, Question], None] = None) -> List[Question]:
+        questions = list(questions or [])
+        attempt = len(questions)
+        max_attempts = attempt + (num_questions - len(questions)) * self.max_attempts_per_question
+        while len(questions) < num_questions:
+            with self.tracer.span("generate_question"):
+                question = self.generate_single_question(concepts, sentences, material_text, attempt)
+            attempt += 1
+            if not question:
+                continue
+            # Jika variasi materi sudah habis, sisa soal diterima walaupun mirip agar jumlahnya tetap
+            if attempt <= max_attempts and not self.accept_question(question):
+                continue
+            questions.append(question)
+            # Laporkan soal yang sudah jadi agar UI bisa menampilkannya sebelum semua selesai
+            if progress_callback is not None:
+                progress_callback(len(questions) - 1, question)
+        return questions
+
+    # Ambil model dokumen untuk teks, scan hanya jika teksnya berbeda dari sebelumnya
+    def get_document(self, text: str) -> DocumentModel:
+        if self.document is None or self.document.text is not text:
+            self.document = DocumentModel(text)
+        return self.document
+
+    # Index kemiripan kata untuk daftar kalimat, dibangun ulang hanya jika daftar kalimatnya berganti
+    def get_distractor_index(self, sentences: List[str]) -> DistractorIndex:
+        if self.distractor_index is None or self.distractor_index.sentences is not sentences:
+            with self.tracer.span("distractor_index"):
+                self.distractor_index = DistractorIndex(sentences)
+        return self.distractor_index
+
+    # Ekstrak kalimat yang bermakna dari teks
+    def extract_meaningful_sentences(self, text: str) -> List[str]:
+        return self.get_document(text).meaningful_sentences()
+    
+    #Ekstrak konsep kunci
+    def extract_key_concepts_advanced(self, text: str) -> List[str]:
+        # Peringkat TF-IDF dari kemunculan istilah per kalimat, ambil 15 teratas
+        return self.concept_scorer.top_k(self.get_document(text), 15)
+    
+    #Generate satu soal dengan handling error
+    def generate_single_question(self, concepts: List[str], sentences: List[str], material_text: str, question_num: int) -> Question:
+        self.support_sentence_id = None
+        try:
+            if not concepts:
+                return self.create_question_from_sentence(sentences, question_num)
+            
+            # Pilih jenis soal berdasarkan nomor soal
+            question_types = list(self.question_templates.keys())
+            q_type = question_types[question_num % len(question_types)]
+            concept = self.rng.choice(concepts)
+            template = self.rng.choice(self.question_templates[q_type])
+            
+            # Handle template dengan multiple concepts
+            concept2 = None
+            if "{concept1}" in template and "{concept2}" in template:
+                if len(concepts) >= 2:
+                    concept1 = concept
+                    concept2 = self.rng.choice([c for c in concepts if c != concept1])
+                    question_text = template.format(concept1=concept1, concept2=concept2)
+                else:
+                    q_type = "simple"
+                    template = self.rng.choice(self.question_templates["simple"])
+                    question_text = template.format(concept=concept)
+            else:
+                question_text = template.format(concept=concept)
+            
+            # Generate options yang realistis
+            options, correct_answer, explanation = self.generate_smart_options(
+                q_type, concept, concepts, material_text, concept2
+            )
+            
+            return Question(
+                question_text=question_text,
+                options=options,
+                correct_answer=correct_answer,
+                explanation=explanation,
+                question_type="pilihan_ganda",
+                difficulty=self.rng.choice(["easy", "medium", "hard"]),
+                concept=concept,
+                section_id=self.section_of(self.support_sentence_id)
+            )
+            
+        except Exception as e:
+            self.reporter.error(f"Error generating question {question_num + 1}: {e}")
+            return self.create_fallback_question(question_num)
+    
+    # Buat soal dari kalimat jika tidak ada konsep
+    def create_question_from_sentence(self, sentences: List[str], question_num: int) -> Question:
+        if not sentences:
+            return self.create_fallback_question(question_num)
+        
+        sentence_id = self.rng.randrange(len(sentences))
+        sentence = sentences[sentence_id]
+        words = sentence.split()
+        if len(words) < 3:
+            return self.create_fallback_question(question_num)
+        
+        # Buat soal fill-in-the-blank sederhana
+        candidates = [w for w in words if len(w) > 4 and w.isalpha()]
+        if not candidates:
+            return self.create_fallback_question(question_num)
+        blank_word = self.rng.choice(candidates)
+        question_text = re.sub(r"\b" + re.escape(blank_word) + r"\b", "______", sentence)
+        question_text = f"Lengkapi kalimat: {question_text}"
+
+        # Distractor: kata materi yang paling mirip konteks dan bentuknya, yang tidak ada di kalimat ini
+        index = self.get_distractor_index(sentences)
+        exclude = content_words(sentence)
+        similar = index.similar_terms(blank_word, SIMILAR_POOL_SIZE, exclude=exclude)
+        distractors = self.rng.sample(similar, min(3, len(similar)))
+        if len(distractors) < 3:
+            # Materi kecil: lengkapi dengan kata materi lain, lalu pilihan salah umum, soalnya tetap dari kalimat
+            used = exclude | set(distractors) | {blank_word.lower()}
+            others = [term for term in index.terms if term not in used]
+            distractors += self.rng.sample(others, min(3 - len(distractors), len(others)))
+        options = [blank_word] + [match_case(word, blank_word) for word in distractors]
+        options.extend(LAST_RESORT_OPTIONS[:4 - len(options)])
+
+        self.rng.shuffle(options)
+        
+        return Question(
+            question_text=question_text,
+            options=options,
+            correct_answer=blank_word,
+            explanation=f"Kata '{blank_word}' adalah jawaban yang tepat untuk melengkapi kalimat.",
+            difficulty="easy",
+            section_id=self.section_of(sentence_id)
+        )
+    
+    # Buat soal fallback jika semua method gagal
+    def create_fallback_question(self, question_num: int) -> Question:
+        question_text = f"Apa yang Anda pahami tentang materi yang telah dipelajari?"
+        options = [
+            "Materi sangat jelas dan mudah dipahami",
+            "Materi cukup jelas dengan beberapa bagian yang rumit", 
+            "Materi cukup sulit dipahami",
+            "Materi sangat sulit dan perlu penjelasan lebih"
+        ]
+        
+        return Question(
+            question_text=question_text,
+            options=options,
+            correct_answer=options[0],
+            explanation="Soal ini menguji pemahaman umum terhadap materi.",
+            difficulty="easy"
+        )
+    
+    # Cari kalimat materi yang memuat konsep (dan konsep kedua untuk soal perbandingan)
+    def find_supporting_sentence(self, concept: str, concept2: str = None) -> Optional[str]:
+        sentence_ids = self.concept_index.get(concept, [])
+        if concept2 is not None:
+            other_ids = set(self.concept_index.get(concept2, []))
+            sentence_ids = [sentence_id for sentence_id in sentence_ids if sentence_id in other_ids]
+        if not sentence_ids:
+            return None
+        self.support_sentence_id = self.rng.choice(sentence_ids)
+        return self.sentences[self.support_sentence_id]
+
+    # Generate opsi jawaban
+    def generate_smart_options(self, q_type: str, concept: str, concepts: List[str], material_text: str,
+                               concept2: str = None) -> Tuple[List[str], str, str]:
+        # Jawaban dan penjelasan diambil dari kalimat materi jika ada
+        support = self.find_supporting_sentence(concept, concept2)
+        correct_answer = self.generate_correct_answer(q_type, concept, material_text, support)
+        options = [correct_answer]
+        
+        # Generate distractor yang masuk akal
+        distractors = self.generate_plausible_distractors(
+            q_type, concept, concepts, material_text, grounded=support is not None
+        )
+        
+        # Tambahkan distractor hingga 4 opsi, lewati yang hampir sama dengan opsi lain
+        for distractor in distractors:
+            if len(options) >= 4:
+                break
+            if not any(is_near_duplicate(distractor, option) for option in options):
+                options.append(distractor)
+        
+        # Jika masih kurang, tambahkan pilihan salah umum
+        for option in LAST_RESORT_OPTIONS[:4 - len(options)]:
+            options.append(option)
+        
+        self.rng.shuffle(options)
+        explanation = self.generate_explanation(q_type, concept, correct_answer, material_text, support)
+        
+        return options, correct_answer, explanation
+    
+    # Generate jawaban yang benar berdasarkan jenis soal
+    def generate_correct_answer(self, q_type: str, concept: str, material_text: str, support: str = None) -> str:
+        # Soal perbandingan menampilkan kedua konsep, jenis lain menyembunyikan konsep yang ditanyakan
+        if support is not None:
+            if q_type == "comparison":
+                return shorten_sentence(support)
+            return mask_concept(shorten_sentence(support), concept)
+
+        answers = {
+            "definition": [
+                f"{concept.capitalize()} adalah konsep penting yang dijelaskan dalam materi",
+                f"Definisi {concept} tercantum secara detail dalam pembahasan",
+                f"{concept.capitalize()} merujuk pada pengertian yang spesifik dalam konteks materi"
+            ],
+            "cause_effect": [
+                f"{concept.capitalize()} dipengaruhi oleh berbagai faktor yang saling terkait",
+                f"Dampak {concept} dapat dilihat dari beberapa aspek dalam materi",
+                f"Penyebab {concept} dijelaskan melalui mekanisme tertentu"
+            ],
+            "comparison": [
+                f"Perbandingan menunjukkan perbedaan karakteristik yang signifikan",
+                f"Persamaan dan perbedaan dijelaskan melalui analisis komparatif",
+                f"Kedua konsep memiliki keunikan dan karakteristik masing-masing"
+            ],
+            "application": [
+                f"{concept.capitalize()} dapat diaplikasikan dalam berbagai situasi praktis",
+                f"Penerapan {concept} membutuhkan pemahaman konsep yang mendalam",
+                f"Aplikasi {concept} meliputi beberapa implementasi yang relevan"
+            ],
+            "simple": [
+                f"{concept.capitalize()} adalah elemen fundamental dalam materi",
+                f"Pemahaman {concept} penting untuk menguasai topik ini",
+                f"{concept.capitalize()} memiliki peran kunci dalam pembahasan"
+            ]
+        }
+        
+        return self.rng.choice(answers.get(q_type, answers["simple"]))
+    
+    # Generate distractor
+    def generate_plausible_distractors(self, q_type: str, concept: str, concepts: List[str], material_text: str,
+                                       grounded: bool = False) -> List[str]:
+        # Distractor dari kalimat materi tentang konsep lain yang tidak memuat konsep ini
+        grounded_distractors = []
+        if grounded:
+            used_ids = set(self.concept_index.get(concept, []))
+            index = self.get_distractor_index(self.sentences)
+            # Konsep lain urut kemiripannya dengan konsep ini; beberapa yang termirip diacak urutannya
+            others = index.rank(concept, [c for c in concepts if c != concept and self.concept_index.get(c)])
+            head = others[:SIMILAR_POOL_SIZE]
+            self.rng.shuffle(head)
+            for other in head + others[SIMILAR_POOL_SIZE:]:
+                self.add_grounded_distractor(grounded_distractors, used_ids, other, self.concept_index[other], q_type)
+                if len(grounded_distractors) == 3:
+                    return grounded_distractors
+            # Konsep habis: kalimat tentang kata materi yang mirip dengan konsep ini
+            for term in index.similar_terms(concept, SIMILAR_POOL_SIZE, exclude=content_words(concept)):
+                self.add_grounded_distractor(grounded_distractors, used_ids, term, index.sentences_with(term), q_type)
+                if len(grounded_distractors) == 3:
+                    return grounded_distractors
+
+        distractors = []
+        general_distractors = [
+            f"Konsep {concept} tidak relevan dengan materi",
+            f"{concept.capitalize()} adalah istilah yang sudah usang",
+            "Tidak ada penjelasan yang cukup dalam materi",
+            "Jawaban tersebut tidak sesuai dengan konteks pembahasan"
+        ]
+        
+        specific_distractors = {
+            "definition": [
+                f"{concept.capitalize()} memiliki pengertian yang berbeda dari penjelasan materi",
+                f"Definisi {concept} tidak konsisten dengan pembahasan"
+            ],
+            "cause_effect": [
+                f"{concept.capitalize()} tidak memiliki hubungan sebab-akibat yang jelas",
+                "Hubungan kausalitas tidak terbukti dalam materi"
+            ],
+            "comparison": [
+                "Perbandingan yang dilakukan tidak akurat",
+                "Tidak ada perbedaan signifikan antara konsep-konsep tersebut"
+            ]
+        }
+        
+        distractors.extend(general_distractors)
+        distractors.extend(specific_distractors.get(q_type, []))
+        
+        # Lengkapi distractor dari materi dengan distractor umum; semua dikembalikan (urutan acak) sebagai
+        # cadangan jika ada yang hampir sama dengan opsi lain
+        return grounded_distractors + self.rng.sample(distractors, len(distractors))
+    
+    # Tambahkan kalimat acak tentang term (yang belum dipakai) sebagai distractor, term disembunyikan
+    # kecuali di soal perbandingan
+    def add_grounded_distractor(self, distractors: List[str], used_ids: set, term: str, sentence_ids: List[int],
+                                q_type: str):
+        candidate_ids = [i for i in sentence_ids if i not in used_ids]
+        if not candidate_ids:
+            return
+        sentence_id = self.rng.choice(candidate_ids)
+        used_ids.add(sentence_id)
+        sentence = shorten_sentence(self.sentences[sentence_id])
+        if q_type != "comparison":
+            sentence = mask_concept(sentence, term)
+        distractors.append(sentence)
+
+    # Generate penjelasan untuk jawaban yang benar
+    def generate_explanation(self, q_type: str, concept: str, correct_answer: str, material_text: str,
+                             support: str = None) -> str:
+        explanations = {
+            "definition": f"Jawaban benar karena sesuai dengan definisi {concept} yang dijelaskan dalam materi.",
+            "cause_effect": f"Jawaban benar karena mencerminkan hubungan sebab-akibat {concept} yang tepat.",
+            "comparison": f"Jawaban benar karena menunjukkan perbandingan yang akurat berdasarkan materi.",
+            "application": f"Jawaban benar karena sesuai dengan penerapan {concept} dalam konteks yang relevan.",
+            "simple": f"Jawaban benar karena sesuai dengan penjelasan {concept} dalam materi pembelajaran."
+        }
+        explanation = explanations.get(q_type, "Jawaban benar berdasarkan pembahasan dalam materi.")
+        if support is not None:
+            explanation += f' Materi menyebutkan: "{shorten_sentence(support)}"'
+        return explanation
@@ -0,0 +1,124 @@
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+
+from reporting import CollectingReporter
+
+# Executor bersama untuk semua sesi, generate soal berjalan di luar thread script Streamlit
+MAX_GENERATION_WORKERS = 4
+# Job yang sudah selesai dihapus dari registry setelah waktu ini (detik)
+FINISHED_JOB_TTL = 30 * 60
+
+_executor = ThreadPoolExecutor(max_workers=MAX_GENERATION_WORKERS, thread_name_prefix="generation")
+_jobs: Dict[str, "GenerationJob"] = {}
+_jobs_lock = threading.Lock()
+
+
+# Status satu job generate soal di background
+class GenerationJob:
+    def __init__(self, total: int):
+        self.job_id = uuid.uuid4().hex
+        self.total = total
+        self.status = "pending"
+        self.error = ""
+        self.questions: List = []
+        self.reporter = CollectingReporter()
+        self.seed = None
+        self.material_digest = None
+        self.generator_key = ""
+        self.started_at = None
+        self.finished_at = None
+        self._lock = threading.Lock()
+
+    # Dipanggil generator setiap kali satu soal selesai
+    def add_question(self, question_num: int, question):
+        with self._lock:
+            self.questions.append(question)
+
+    # Salinan soal yang sudah selesai, aman dibaca dari thread UI
+    def snapshot(self) -> List:
+        with self._lock:
+            return list(self.questions)
+
+    @property
+    def progress(self) -> float:
+        if self.total <= 0:
+            return 1.0
+        return min(len(self.questions) / self.total, 1.0)
+
+    # Lama job berjalan (detik), None jika belum selesai
+    @property
+    def duration(self) -> Optional[float]:
+        if self.started_at is None or self.finished_at is None:
+            return None
+        return self.finished_at - self.started_at
+
+    @property
+    def finished(self) -> bool:
+        return self.status in ("done", "error")
+
+
+# Jalankan generate_questions_advanced di executor bersama dan kembalikan job-nya
+def submit_generation(generator, material_text: str, num_questions: int, **kwargs) -> GenerationJob:
+    job = GenerationJob(num_questions)
+    # Disimpan bersama job agar hasilnya bisa dicatat ke bank soal saat diambil
+    job.material_digest = kwargs.get("material_digest")
+    job.generator_key = generator.generation_key
+    if kwargs.get("history"):
+        # Set yang menghindari riwayat berbeda dari set biasa dengan seed yang sama
+        job.generator_key += ":history"
+    if kwargs.get("previous_questions"):
+        # Set hasil generate ulang sebagian bergantung pada soal lama, bukan hanya materi dan seed
+        job.generator_key += ":incremental"
+
+    def run():
+        job.status = "running"
+        job.started_at = time.time()
+        # Pesan error dari thread background tidak bisa ditampilkan langsung di UI
+        original_reporter = generator.reporter
+        generator.reporter = job.reporter
+        try:
+            questions = generator.generate_questions_advanced(
+                material_text, num_questions, progress_callback=job.add_question, **kwargs
+            )
+            # Hasil dari cache tidak memanggil progress_callback, jadi isi ulang dari hasil akhir
+            with job._lock:
+                job.questions = list(questions)
+            job.seed = generator.last_seed
+            job.status = "done"
+        except Exception as e:
+            job.error = str(e)
+            job.status = "error"
+        finally:
+            generator.reporter = original_reporter
+            job.finished_at = time.time()
+
+    _cleanup_finished_jobs()
+    with _jobs_lock:
+        _jobs[job.job_id] = job
+    _executor.submit(run)
+    return job
+
+
+# Ambil job berdasarkan id, None jika tidak ada atau sudah dibersihkan
+def get_job(job_id: str) -> Optional[GenerationJob]:
+    with _jobs_lock:
+        return _jobs.get(job_id)
+
+
+# Hapus job dari registry setelah hasilnya diambil
+def forget_job(job_id: str):
+    with _jobs_lock:
+        _jobs.pop(job_id, None)
+
+
+# Buang job selesai yang tidak pernah diambil (misalnya sesi browser sudah ditutup)
+def _cleanup_finished_jobs():
+    now = time.time()
+    with _jobs_lock:
+        expired = [job_id for job_id, job in _jobs.items()
+                   if job.finished_at is not None and now - job.finished_at > FINISHED_JOB_TTL]
+        for job_id in expired:
+            del _jobs[job_id]
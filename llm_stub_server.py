@@ -0,0 +1,108 @@
+"""Server lokal tiruan API chat completions (kompatibel OpenAI) untuk menguji mesin LLM tanpa internet.
+
+Contoh:
+    python llm_stub_server.py --port 8765
+    OPENAI_BASE_URL=http://127.0.0.1:8765/v1 streamlit run app.py
+
+Jawaban dibuat deterministik dari konsep dan kalimat materi di prompt. Dengan
+--fail-every N, setiap request ke-N dijawab HTTP 429 untuk menguji retry.
+"""
+import argparse
+import json
+import re
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List
+
+
+# Buat respons soal dari isi prompt
+def build_answer(prompt: str) -> Dict:
+    count_match = re.search(r"Buat (\d+) soal", prompt)
+    count = int(count_match.group(1)) if count_match else 1
+    concept_match = re.search(r"satu soal per konsep: (.+)", prompt)
+    concepts = concept_match.group(1).split("; ") if concept_match else []
+    sentences = [line[2:] for line in prompt.splitlines() if line.startswith("- ")] or ["Materi tidak tersedia."]
+
+    questions = []
+    for i in range(count):
+        concept = concepts[i % len(concepts)] if concepts else f"bagian {i + 1}"
+        correct = sentences[i % len(sentences)]
+        options = [correct] + [sentences[(i + j) % len(sentences)] + f" (bukan {j})" for j in range(1, 4)]
+        questions.append({
+            "question": f"Pernyataan mana yang benar tentang {concept}?",
+            "options": options,
+            "correct_answer": correct,
+            "explanation": f"Materi menyebutkan: \"{correct}\"",
+            "difficulty": ("easy", "medium", "hard")[i % 3],
+            "concept": concept
+        })
+    return {"questions": questions}
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    def do_POST(self):
+        server = self.server
+        with server.lock:
+            server.request_count += 1
+            request_number = server.request_count
+        body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+
+        if not self.path.rstrip("/").endswith("/chat/completions"):
+            self._send(404, {"error": {"message": "not found"}})
+            return
+        if server.fail_every and request_number % server.fail_every == 0:
+            self._send(429, {"error": {"message": "rate limited"}}, {"Retry-After": "0"})
+            return
+
+        prompt = body.get("messages", [{}])[-1].get("content", "")
+        content = json.dumps(build_answer(prompt), ensure_ascii=False)
+        self._send(200, {
+            "id": f"stub-{request_number}",
+            "object": "chat.completion",
+            "model": body.get("model", "stub"),
+            "choices": [{"index": 0, "message": {"role": "assistant", "content": content}, "finish_reason": "stop"}],
+            "usage": {"prompt_tokens": len(prompt) // 4, "completion_tokens": len(content) // 4}
+        })
+
+    def _send(self, status: int, payload: Dict, headers: Dict = None):
+        data = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def create_server(port: int = 0, fail_every: int = 0) -> ThreadingHTTPServer:
+    server = ThreadingHTTPServer(("127.0.0.1", port), StubHandler)
+    server.lock = threading.Lock()
+    server.request_count = 0
+    server.fail_every = fail_every
+    return server
+
+
+# Jalankan server stub di thread background, kembalikan server-nya (panggil shutdown() setelah selesai)
+def serve_in_thread(port: int = 0, fail_every: int = 0) -> ThreadingHTTPServer:
+    server = create_server(port, fail_every)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main(argv: List[str] = None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--fail-every", type=int, default=0, help="Balas HTTP 429 setiap request ke-N")
+    args = parser.parse_args(argv)
+
+    server = create_server(args.port, args.fail_every)
+    print(f"Stub LLM berjalan di http://127.0.0.1:{args.port}/v1")
+    server.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
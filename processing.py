@@ -0,0 +1,518 @@
+import functools
+import hashlib
+import io
+import os
+import sys
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+import extractors
+from concept_scoring import ConceptScorer
+from course import CourseFile, CourseModel
+from reporting import CollectingReporter, Reporter, StreamlitReporter
+from sections import MAX_SECTION_CHARS, SectionedDocument, group_sections, split_paragraphs, split_sentence_edges
+from text_pipeline import DocumentModel, StreamingDocumentBuilder, clean_text
+from tracing import Tracer
+
+# Versi ekstraktor, naikkan jika logika ekstraksi/pembersihan berubah agar cache lama tidak terpakai
+EXTRACTOR_VERSION = "7"
+
+# Hasil ekstraksi materi yang disimpan di cache
+@dataclass
+class ExtractedMaterial:
+    document: DocumentModel
+    # Awal teks materi untuk preview dan panjang teks bersih keseluruhan
+    preview: str = ""
+    text_length: int = 0
+    # Untuk satu bagian materi: teks mentah sebelum akhir kalimat pertama (None jika tidak ada) dan sesudah
+    # akhir kalimat terakhir. document hanya berisi kalimat utuh di antaranya.
+    head: Optional[str] = None
+    tail: str = ""
+
+    @property
+    def text(self) -> str:
+        return self.document.text
+
+    @property
+    def sentences(self) -> List[str]:
+        return self.document.meaningful_sentences()
+
+    # Perkiraan ukuran memori entry dalam byte
+    def size_bytes(self) -> int:
+        size = sys.getsizeof(self.text) + sys.getsizeof(self.preview) + self.document.size_bytes()
+        size += sum(sys.getsizeof(s) for s in self.sentences)
+        size += sys.getsizeof(self.head) + sys.getsizeof(self.tail)
+        return size
+
+# Cache LRU hasil ekstraksi berdasarkan hash isi file, dibatasi total ukuran memori.
+# Aman dipakai bersama oleh banyak sesi (thread) sekaligus; lihat get_or_create.
+class ExtractionCache:
+    def __init__(self, max_bytes: int = 256 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        # Key yang sedang diekstrak: [event selesai, hasil] milik thread yang pertama meminta
+        self._pending: Dict[str, list] = {}
+
+    # Buat key dari isi file dan versi ekstraktor
+    @staticmethod
+    def make_key(data: bytes, file_extension: str) -> str:
+        digest = hashlib.sha256()
+        digest.update(f"{EXTRACTOR_VERSION}:{file_extension}:".encode())
+        digest.update(data)
+        return digest.hexdigest()
+
+    # Ambil entry dari cache dan tandai sebagai yang terakhir dipakai
+    def get(self, key: str) -> Optional[ExtractedMaterial]:
+        with self._lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    # Simpan entry, buang entry paling lama jika melebihi batas memori
+    def put(self, key: str, material: ExtractedMaterial):
+        size = material.size_bytes()
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            if key in self.entries:
+                self.current_bytes -= self.entries.pop(key)[1]
+            self.entries[key] = (material, size)
+            self.current_bytes += size
+            while self.current_bytes > self.max_bytes:
+                _, (_, old_size) = self.entries.popitem(last=False)
+                self.current_bytes -= old_size
+
+    # Ambil entry, atau buat dengan create() jika belum ada. Jika beberapa sesi meminta key yang sama
+    # bersamaan, hanya satu yang mengekstrak; yang lain menunggu dan memakai hasilnya. Hasil tanpa teks (file
+    # rusak atau hasil scan) juga disimpan agar tidak diekstrak ulang setiap rerun; hanya exception yang dicoba lagi.
+    # Mengembalikan (material, True jika tidak diekstrak oleh pemanggil ini).
+    def get_or_create(self, key: str, create: Callable[[], ExtractedMaterial]) -> Tuple[ExtractedMaterial, bool]:
+        while True:
+            with self._lock:
+                entry = self.entries.get(key)
+                if entry is not None:
+                    self.entries.move_to_end(key)
+                    self.hits += 1
+                    return entry[0], True
+                pending = self._pending.get(key)
+                if pending is None:
+                    self.misses += 1
+                    pending = self._pending[key] = [threading.Event(), None]
+                    break
+            pending[0].wait()
+            if pending[1] is not None:
+                with self._lock:
+                    self.hits += 1
+                return pending[1], True
+            # Ekstraksi pemilik gagal dengan exception: coba lagi, pemanggil ini bisa menjadi pemilik baru
+
+        try:
+            material = pending[1] = create()
+            self.put(key, material)
+        finally:
+            with self._lock:
+                del self._pending[key]
+            pending[0].set()
+        return material, False
+
+    # Statistik cache untuk ditampilkan di UI
+    def stats(self) -> Dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": (self.hits / lookups) * 100 if lookups > 0 else 0,
+                "entries": len(self.entries),
+                "size_mb": self.current_bytes / (1024 * 1024)
+            }
+
+# Class untuk memproses materi ajar
+class MaterialProcessor:
+    def __init__(self, cache: ExtractionCache = None, pdf_workers: int = None, pdf_page_timeout: Optional[float] = 30.0,
+                 reporter: Reporter = None, concept_scorer: ConceptScorer = None,
+                 streaming_threshold_bytes: int = 20 * 1024 * 1024, reservoir_size: int = 5000,
+                 tracer: Tracer = None, file_workers: int = None, section_cache: ExtractionCache = None,
+                 docx_fast_path: bool = True):
+        self.text_content = ""
+        self.preview_text = ""
+        self.document = None
+        self.sentences = []
+        self.material_hash = ""
+        self.material_name = ""
+        # Model gabungan jika materi terdiri dari beberapa file, None untuk satu file
+        self.course = None
+        self.cache = cache if cache is not None else ExtractionCache()
+        # None berarti pakai semua core yang tersedia
+        self.pdf_workers = pdf_workers
+        # Batas waktu per halaman PDF (detik), None berarti halaman diekstrak di proses ini tanpa batas waktu
+        self.pdf_page_timeout = pdf_page_timeout
+        self.reporter = reporter if reporter is not None else StreamlitReporter()
+        self.concept_scorer = concept_scorer if concept_scorer is not None else ConceptScorer()
+        # File di atas batas ini diproses per potongan, hanya sampel kalimat yang disimpan
+        self.streaming_threshold_bytes = streaming_threshold_bytes
+        self.reservoir_size = reservoir_size
+        # Waktu tiap tahap ekstraksi dan hit rate cache, ditampilkan di tab Analytics
+        self.tracer = tracer if tracer is not None else Tracer()
+        # Jumlah proses untuk ekstraksi beberapa file sekaligus, None berarti semua core
+        self.file_workers = file_workers
+        # Hasil per bagian (halaman PDF, kelompok paragraf) berdasarkan hash isinya; file yang diedit
+        # lalu diupload ulang hanya memproses bagian yang berubah
+        self.section_cache = section_cache if section_cache is not None else ExtractionCache(128 * 1024 * 1024)
+        # DOCX dibaca langsung dari XML-nya (True) atau lewat object model python-docx (False), hasilnya sama
+        self.docx_fast_path = docx_fast_path
+
+    # Ekstrak teks dari file PDF, halaman diproses paralel lalu digabung sekali di akhir
+    def extract_text_from_pdf(self, pdf_file) -> str:
+        try:
+            pages = extractors.iter_pdf_pages(
+                pdf_file,
+                workers=self.pdf_workers,
+                page_timeout=self.pdf_page_timeout
+            )
+            return "".join(pages)
+        except Exception as e:
+            self.reporter.error(f"Error reading PDF: {e}")
+            return ""
+    
+    # Ekstrak teks dari file DOCX: paragraf, baris tabel, header/footer, dan text box, satu blok per baris
+    def extract_text_from_docx(self, docx_file) -> str:
+        try:
+            blocks = list(extractors.iter_docx_blocks(docx_file, fast=self.docx_fast_path))
+            return "\n".join(blocks) + "\n" if blocks else ""
+        except Exception as e:
+            self.reporter.error(f"Error reading DOCX: {e}")
+            return ""
+    
+    # Ekstrak teks dari file TXT (UTF-8, UTF-16/32 dengan BOM, atau cp1252 untuk materi lama)
+    def extract_text_from_txt(self, txt_file) -> str:
+        try:
+            return extractors.decode_txt(txt_file)
+        except Exception as e:
+            self.reporter.error(f"Error reading TXT file: {e}")
+            return ""
+    
+    # Proses file yang diupload dan ekstrak teksnya
+    def process_material(self, uploaded_file) -> bool:
+        if uploaded_file is None:
+            return False
+        file_extension = uploaded_file.name.split('.')[-1].lower()
+        if file_extension not in ("pdf", "docx", "txt"):
+            self.reporter.error("Format file tidak didukung. Gunakan PDF, DOCX, atau TXT.")
+            return False
+
+        # Pakai hasil ekstraksi sebelumnya jika isi file sama
+        with extractors.read_file_view(uploaded_file) as view:
+            key = ExtractionCache.make_key(view, file_extension)
+            streaming = len(view) > self.streaming_threshold_bytes
+        if streaming:
+            extract = functools.partial(self.extract_material_streaming, uploaded_file, file_extension)
+        else:
+            extract = functools.partial(self.extract_material, uploaded_file, file_extension)
+        material, cached = self.cache.get_or_create(key, extract)
+        self.tracer.record_cache("extraction", hits=cached, misses=not cached)
+
+        self.material_hash = key
+        self.material_name = uploaded_file.name
+        self.course = None
+        self.document = material.document
+        self.text_content = material.text
+        self.preview_text = material.preview
+        self.sentences = material.sentences
+        if material.text_length < 100:
+            self.reporter.warning("Teks yang diekstrak terlalu pendek. Pastikan file berisi materi yang cukup.")
+            return False
+            
+        return True
+    
+    # Proses beberapa file (satu course) menjadi satu model gabungan. Setiap file diambil lewat cache.get_or_create
+    # seperti process_material, jadi sesi lain yang mengupload file yang sama menunggu hasil ekstraksi ini. File yang
+    # belum ada di cache diekstrak paralel di proses terpisah, file terbesar lebih dulu agar total waktu mendekati
+    # file terbesar. progress_callback(nama file, jumlah selesai, total) dipanggil setiap satu file selesai.
+    def process_materials(self, uploaded_files: Sequence, weights: Sequence[float] = None,
+                          progress_callback: Callable[[str, int, int], None] = None) -> bool:
+        if weights is None:
+            weights = [1.0] * len(uploaded_files)
+        entries = []
+        for uploaded_file, weight in zip(uploaded_files, weights):
+            file_extension = uploaded_file.name.split('.')[-1].lower()
+            if file_extension not in ("pdf", "docx", "txt"):
+                self.reporter.error(f"{uploaded_file.name}: format file tidak didukung. Gunakan PDF, DOCX, atau TXT.")
+                continue
+            with extractors.read_file_view(uploaded_file) as view:
+                key = ExtractionCache.make_key(view, file_extension)
+                size = len(view)
+            entries.append(_MaterialUpload(uploaded_file, file_extension, key, size, weight, None))
+
+        total = len(entries)
+        for done, entry in enumerate(self._extract_many(sorted(entries, key=lambda e: e.size, reverse=True)), 1):
+            if progress_callback is not None:
+                progress_callback(entry.file.name, done, total)
+
+        files = []
+        for entry in entries:
+            if entry.material.text_length < 100:
+                self.reporter.warning(f"{entry.file.name}: teks yang diekstrak terlalu pendek, file dilewati.")
+                continue
+            files.append(CourseFile(entry.file.name, entry.key, entry.material, entry.weight))
+        if not files:
+            return False
+
+        course = CourseModel(files)
+        # Model yang sama (isi dan bobot file tidak berubah) dipakai ulang beserta peringkat konsepnya
+        if self.course is not None and self.course.key == course.key:
+            course = self.course
+        self.course = course
+        self.document = course
+        self.material_hash = course.key
+        self.material_name = ", ".join(f.name for f in files)
+        self.text_content = course.text
+        self.preview_text = "\n".join(f"[{f.name}] {f.material.preview[:300 // len(files) + 50]}" for f in files)
+        self.sentences = course.meaningful_sentences()
+        return True
+
+    # Ambil hasil ekstraksi setiap file lewat cache.get_or_create (mengisi entry.material), dikembalikan sesuai
+    # urutan selesai. File yang belum ada di cache diekstrak di proses worker; pool worker baru dibuat jika ada
+    # file yang perlu diekstrak, jadi rerun dengan semua file di cache tidak menjalankan proses baru.
+    def _extract_many(self, entries: List["_MaterialUpload"]) -> Iterator["_MaterialUpload"]:
+        workers = min(self.file_workers or os.cpu_count() or 1, len(entries))
+        if workers <= 1:
+            for entry in entries:
+                if entry.size > self.streaming_threshold_bytes:
+                    extract = functools.partial(self.extract_material_streaming, entry.file, entry.extension)
+                else:
+                    extract = functools.partial(self.extract_material, entry.file, entry.extension)
+                entry.material, cached = self.cache.get_or_create(entry.key, extract)
+                self.tracer.record_cache("extraction", hits=cached, misses=not cached)
+                yield entry
+            return
+
+        executor, executor_lock = None, threading.Lock()
+
+        # Dijalankan di thread: get_or_create menunggu jika file yang sama sedang diekstrak sesi lain
+        def lookup(entry: "_MaterialUpload"):
+            outputs = []
+
+            def extract_in_worker() -> ExtractedMaterial:
+                nonlocal executor
+                with executor_lock:
+                    if executor is None:
+                        executor = ProcessPoolExecutor(max_workers=workers, mp_context=extractors.WORKER_CONTEXT)
+                future = executor.submit(_extract_in_worker, extractors.read_file_bytes(entry.file), entry.extension,
+                                         entry.size > self.streaming_threshold_bytes, self.reservoir_size,
+                                         self.docx_fast_path)
+                material, messages, snapshot = future.result()
+                outputs.append((messages, snapshot))
+                # Bagian hasil worker disimpan agar upload ulang file yang diedit bisa memakainya
+                if isinstance(material.document, SectionedDocument):
+                    for key, section in material.document.sections:
+                        self.section_cache.put(key, section)
+                return material
+
+            material, cached = self.cache.get_or_create(entry.key, extract_in_worker)
+            return material, cached, outputs
+
+        try:
+            with ThreadPoolExecutor(max_workers=len(entries)) as threads:
+                futures = {threads.submit(lookup, entry): entry for entry in entries}
+                for future in as_completed(futures):
+                    entry = futures[future]
+                    try:
+                        entry.material, cached, outputs = future.result()
+                    except Exception as e:
+                        # Worker mati (misalnya kehabisan memori): tidak disimpan di cache, dicoba lagi saat rerun
+                        self.tracer.record_cache("extraction", misses=1)
+                        self.reporter.error(f"{entry.file.name}: gagal diproses ({e})")
+                        entry.material = ExtractedMaterial(document=DocumentModel(""))
+                        yield entry
+                        continue
+                    self.tracer.record_cache("extraction", hits=cached, misses=not cached)
+                    # Pesan dan waktu tiap tahap di worker dilaporkan dari thread ini, ikut tercatat di tracer sesi
+                    for messages, snapshot in outputs:
+                        for level, message in messages:
+                            getattr(self.reporter, level)(f"{entry.file.name}: {message}")
+                        self.tracer.merge(snapshot)
+                    yield entry
+        finally:
+            if executor is not None:
+                executor.shutdown()
+
+    # Ekstrak materi per bagian: halaman PDF, atau kelompok paragraf DOCX/TXT dengan batas yang ditentukan isinya.
+    # Bagian yang hash isinya sudah ada di section_cache dipakai ulang, hanya bagian baru yang diekstrak,
+    # dibersihkan, dan di-scan menjadi model dokumen; model dokumen utuh adalah gabungan bagian-bagian itu.
+    def extract_material(self, uploaded_file, file_extension: str) -> ExtractedMaterial:
+        with self.tracer.span(f"extract_{file_extension}"):
+            keys, load_sections = self.split_material(uploaded_file, file_extension)
+            materials = [self.section_cache.get(key) for key in keys]
+            missing = [i for i, material in enumerate(materials) if material is None]
+            self.tracer.record_cache("section", hits=len(keys) - len(missing), misses=len(missing))
+            raw_sections = load_sections(missing)
+
+        for i, raw_text in zip(missing, raw_sections):
+            # Hanya kalimat utuh di dalam bagian yang di-scan di sini, potongan di tepinya disambung di bawah
+            head, middle, tail = split_sentence_edges(raw_text)
+            # Bersihkan teks dari karakter yang tidak perlu
+            with self.tracer.span("clean_text"):
+                text = self.clean_text(middle)
+            with self.tracer.span("document_model"):
+                materials[i] = ExtractedMaterial(document=DocumentModel(text), text_length=len(text),
+                                                 head=head, tail=tail)
+            self.section_cache.put(keys[i], materials[i])
+
+        # Sisa bagian sebelumnya + awal bagian ini menjadi bagian sambungan, sehingga kalimat yang melewati batas
+        # bagian tetap utuh. Pemisahnya sama dengan saat teks mentah digabung utuh (halaman PDF tanpa pemisah).
+        separator = "" if file_extension == "pdf" else "\n"
+        leaves, carry = [], ""
+        with self.tracer.span("document_model"):
+            for i, (key, material) in enumerate(zip(keys, materials)):
+                if material.head is None:
+                    carry += separator + material.tail
+                    # Teks sangat panjang tanpa tanda akhir kalimat tidak terus ditahan
+                    if len(carry) < MAX_SECTION_CHARS:
+                        continue
+                else:
+                    carry += separator + material.head
+                leaves.append(self._joined_section(carry, file_extension, i))
+                leaves.append(CourseFile(f"Bagian {i + 1}", key, material))
+                carry = material.tail if material.head is not None else ""
+            leaves.append(self._joined_section(carry, file_extension, len(keys)))
+
+        document = SectionedDocument([leaf for leaf in leaves if leaf.material.text_length],
+                                     sections=zip(keys, materials))
+        text = document.text
+        return ExtractedMaterial(document=document, preview=text[:300], text_length=len(text))
+
+    # Bagian sambungan dari potongan kalimat di batas dua bagian, kuncinya hash isinya
+    def _joined_section(self, raw_text: str, file_extension: str, number: int) -> CourseFile:
+        text = self.clean_text(raw_text)
+        key = ExtractionCache.make_key(raw_text.encode("utf-8", "surrogatepass"), f"{file_extension}-joint")
+        material = ExtractedMaterial(document=DocumentModel(text), text_length=len(text))
+        return CourseFile(f"Sambungan bagian {number}", key, material)
+
+    # Kunci bagian-bagian materi dan fungsi yang mengembalikan teks mentah bagian untuk nomor-nomor tertentu.
+    # Halaman PDF dikenali dari hash content stream dan resource-nya, jadi halaman yang tidak berubah
+    # tidak diekstrak lagi.
+    def split_material(self, uploaded_file,
+                       file_extension: str) -> Tuple[List[str], Callable[[List[int]], Iterable[str]]]:
+        if file_extension == "pdf":
+            try:
+                digests = extractors.pdf_page_digests(uploaded_file)
+            except Exception as e:
+                self.reporter.error(f"Error reading PDF: {e}")
+                return [], lambda page_numbers: iter(())
+
+            def load_pages(page_numbers: List[int]) -> List[str]:
+                try:
+                    return list(extractors.iter_pdf_pages(
+                        uploaded_file,
+                        workers=self.pdf_workers,
+                        page_timeout=self.pdf_page_timeout,
+                        page_numbers=page_numbers
+                    ))
+                except Exception as e:
+                    self.reporter.error(f"Error reading PDF: {e}")
+                    return [""] * len(page_numbers)
+
+            keys = [ExtractionCache.make_key(digest.encode(), "pdf-page") for digest in digests]
+            return keys, load_pages
+
+        if file_extension == "docx":
+            text = self.extract_text_from_docx(uploaded_file)
+        else:
+            text = self.extract_text_from_txt(uploaded_file)
+        raw_sections = list(group_sections(split_paragraphs(text)))
+        keys = [ExtractionCache.make_key(raw.encode("utf-8"), f"{file_extension}-section") for raw in raw_sections]
+        return keys, lambda section_numbers: (raw_sections[i] for i in section_numbers)
+
+    # Kunci bagian materi yang sedang diproses (dipakai untuk mengenali bagian yang berubah saat upload ulang)
+    def section_keys(self) -> List[str]:
+        if isinstance(self.document, CourseModel):
+            return self.document.section_keys()
+        return [self.material_hash] if self.material_hash else []
+
+    # Potongan teks mentah (per halaman, paragraf, atau blok) untuk mode streaming
+    def iter_text_chunks(self, uploaded_file, file_extension: str) -> Iterator[str]:
+        if file_extension == "pdf":
+            yield from extractors.iter_pdf_pages(
+                uploaded_file,
+                workers=self.pdf_workers,
+                page_timeout=self.pdf_page_timeout
+            )
+        elif file_extension == "docx":
+            for block in extractors.iter_docx_blocks(uploaded_file, fast=self.docx_fast_path):
+                yield block + "\n"
+        else:
+            yield from extractors.iter_txt_chunks(uploaded_file)
+
+    # Mode streaming untuk file besar: teks diproses per potongan yang berakhir di batas kalimat,
+    # statistik konsep dihitung dari seluruh materi, kalimat yang disimpan hanya sampel
+    def extract_material_streaming(self, uploaded_file, file_extension: str) -> ExtractedMaterial:
+        builder = StreamingDocumentBuilder(reservoir_size=self.reservoir_size)
+        # Ekstraksi dan pemrosesan teks berjalan bergantian per potongan, diukur sebagai satu tahap
+        with self.tracer.span(f"extract_streaming_{file_extension}"):
+            try:
+                for chunk in self.iter_text_chunks(uploaded_file, file_extension):
+                    builder.feed(chunk)
+            except Exception as e:
+                self.reporter.error(f"Error reading {file_extension.upper()}: {e}")
+            document = builder.finish()
+        return ExtractedMaterial(document=document, preview=builder.preview, text_length=builder.text_length)
+
+    # Hapus karakter khusus dan multiple spaces
+    def clean_text(self, text: str) -> str:
+        return clean_text(text)
+
+    def get_key_concepts(self, max_concepts: int = 20) -> List[str]:
+        """Ekstrak konsep-konsep penting dari materi"""
+        if self.document is None:
+            return []
+        # Peringkat konsep yang sama dengan yang dipakai generator soal
+        return self.concept_scorer.top_k(self.document, max_concepts)
+
+
+# Satu file upload dalam process_materials
+class _MaterialUpload:
+    __slots__ = ("file", "extension", "key", "size", "weight", "material")
+
+    def __init__(self, file, extension: str, key: str, size: int, weight: float,
+                 material: Optional[ExtractedMaterial]):
+        self.file = file
+        self.extension = extension
+        self.key = key
+        self.size = size
+        self.weight = weight
+        self.material = material
+
+
+# Processor untuk proses worker (ekstraksi beberapa file, batch). Paralelisme sudah per file, jadi PDF di dalam
+# worker cukup satu proses. Worker tidak menyimpan hasil di cache: proses utama yang menyimpan hasil ekstraksinya,
+# dan batch memakai bank soal untuk materi yang sudah pernah diproses.
+def worker_processor(**kwargs) -> MaterialProcessor:
+    return MaterialProcessor(pdf_workers=1, cache=ExtractionCache(0), section_cache=ExtractionCache(0), **kwargs)
+
+
+# Ekstrak satu file di proses worker. Pesan dan waktu tiap tahap dikembalikan agar bisa diteruskan ke reporter
+# dan tracer proses utama.
+def _extract_in_worker(data: bytes, file_extension: str, streaming: bool, reservoir_size: int,
+                       docx_fast_path: bool = True) -> Tuple[ExtractedMaterial, List[Tuple[str, str]], Dict]:
+    reporter = CollectingReporter()
+    tracer = Tracer()
+    processor = worker_processor(reporter=reporter, tracer=tracer, reservoir_size=reservoir_size,
+                                 docx_fast_path=docx_fast_path)
+    uploaded_file = io.BytesIO(data)
+    if streaming:
+        material = processor.extract_material_streaming(uploaded_file, file_extension)
+    else:
+        material = processor.extract_material(uploaded_file, file_extension)
+    return material, reporter.drain(), tracer.snapshot()
@@ -0,0 +1,403 @@
+import hashlib
+import json
+import os
+import random
+import threading
+import time
+from abc import ABC, abstractmethod
+from typing import Callable, Dict, List, Optional, Tuple
+
+from questions import Question
+from text_pipeline import shorten_sentence
+
+# Versi prompt LLM, naikkan jika isi prompt berubah agar cache respons lama tidak terpakai
+PROMPT_VERSION = "1"
+
+# Status HTTP yang layak dicoba ulang (rate limit dan gangguan sementara di server)
+RETRYABLE_STATUS = (408, 409, 429, 500, 502, 503, 504)
+
+
+# Antarmuka mesin pembuat soal di balik AdvancedQuestionGenerator.generate_questions_advanced.
+# Backend yang belum mengimplementasikan generate gagal saat dibuat, bukan di tengah generate.
+class QuestionBackend(ABC):
+    # Bagian dari kunci cache hasil generate, harus berubah jika hasil backend bisa berbeda
+    key = ""
+
+    @abstractmethod
+    def generate(self, generator, material_text: str, concepts: List[str], sentences: List[str],
+                 num_questions: int, progress_callback: Callable = None) -> List[Question]:
+        ...
+
+
+# Mesin template bawaan, soal dibuat dari template dan kalimat materi
+class TemplateBackend(QuestionBackend):
+    key = "template"
+
+    def generate(self, generator, material_text: str, concepts: List[str], sentences: List[str],
+                 num_questions: int, progress_callback: Callable = None) -> List[Question]:
+        return generator.sample_distinct_questions(concepts, sentences, material_text, num_questions,
+                                                   progress_callback=progress_callback)
+
+
+# Error permintaan ke LLM yang tidak perlu dicoba ulang (misalnya API key salah)
+class LLMRequestError(Exception):
+    pass
+
+
+# Error sementara (rate limit, server sibuk), dicoba ulang setelah jeda Retry-After jika ada
+class RetryableError(Exception):
+    def __init__(self, message: str, retry_after: str = None):
+        super().__init__(message)
+        try:
+            self.retry_after = float(retry_after) if retry_after is not None else None
+        except ValueError:
+            self.retry_after = None
+
+
+# Pembatas laju permintaan dan token per menit (token bucket) untuk semua request yang berjalan bersamaan.
+# Kuota dijaga lock thread, jadi satu instance bisa dipakai bersama oleh beberapa event loop/thread.
+class RateLimiter:
+    def __init__(self, requests_per_minute: float, tokens_per_minute: float):
+        self.request_rate = requests_per_minute / 60.0
+        self.token_rate = tokens_per_minute / 60.0
+        self.request_capacity = max(requests_per_minute, 1.0)
+        self.token_capacity = max(tokens_per_minute, 1.0)
+        self.available_requests = self.request_capacity
+        self.available_tokens = self.token_capacity
+        self.updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        elapsed = now - self.updated_at
+        self.updated_at = now
+        self.available_requests = min(self.request_capacity, self.available_requests + elapsed * self.request_rate)
+        self.available_tokens = min(self.token_capacity, self.available_tokens + elapsed * self.token_rate)
+
+    # Ambil kuota satu request jika tersedia (hasil 0), selain itu lama menunggu (detik) sebelum dicoba lagi
+    def try_acquire(self, tokens: int) -> float:
+        tokens = min(tokens, self.token_capacity)
+        with self._lock:
+            self._refill()
+            if self.available_requests >= 1 and self.available_tokens >= tokens:
+                self.available_requests -= 1
+                self.available_tokens -= tokens
+                return 0.0
+            return max(
+                (1 - self.available_requests) / self.request_rate if self.available_requests < 1 else 0.0,
+                (tokens - self.available_tokens) / self.token_rate if self.available_tokens < tokens else 0.0
+            )
+
+    # Tunggu sampai kuota satu request dengan perkiraan jumlah token tersedia
+    async def acquire(self, tokens: int):
+        import asyncio
+        while True:
+            wait = self.try_acquire(tokens)
+            if wait <= 0:
+                return
+            await asyncio.sleep(wait)
+
+
+# Cache respons LLM di disk, satu file JSON per hash prompt
+class ResponseCache:
+    def __init__(self, directory: str):
+        self.directory = directory
+        self.hits = 0
+        self.misses = 0
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key[:2], key + ".json")
+
+    def get(self, key: str) -> Optional[str]:
+        try:
+            with open(self._path(key), encoding="utf-8") as f:
+                content = json.load(f)["content"]
+        except (OSError, ValueError, KeyError):
+            self.misses += 1
+            return None
+        self.hits += 1
+        return content
+
+    def put(self, key: str, content: str):
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Tulis ke file sementara lalu rename agar pembaca tidak melihat file setengah jadi
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump({"content": content}, f, ensure_ascii=False)
+        os.replace(temp_path, path)
+
+
+# Mesin LLM dengan API chat completions yang kompatibel dengan OpenAI
+class LLMBackend(QuestionBackend):
+    def __init__(self, base_url: str = "https://api.openai.com/v1", api_key: str = "", model: str = "gpt-4o-mini",
+                 questions_per_request: int = 5, max_concurrency: int = 4, requests_per_minute: float = 60,
+                 tokens_per_minute: float = 90000, max_retries: int = 5, backoff_base: float = 1.0,
+                 backoff_max: float = 30.0, request_timeout: float = 60.0, temperature: float = 0.7,
+                 max_output_tokens: int = 2000, cache_dir: str = ".cache/llm", max_context_chars: int = 6000):
+        self.base_url = base_url.rstrip("/")
+        self.api_key = api_key
+        self.model = model
+        self.questions_per_request = max(questions_per_request, 1)
+        self.max_concurrency = max(max_concurrency, 1)
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        # Satu kuota untuk semua generate dengan backend ini (beberapa sesi dan job background sekaligus)
+        self.rate_limiter = RateLimiter(requests_per_minute, tokens_per_minute)
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.request_timeout = request_timeout
+        self.temperature = temperature
+        self.max_output_tokens = max_output_tokens
+        self.max_context_chars = max_context_chars
+        self.cache = ResponseCache(cache_dir) if cache_dir else None
+        self.requests_sent = 0
+        self.retries = 0
+        self.key = f"llm:{PROMPT_VERSION}:{self.base_url}:{self.model}:{self.temperature}"
+
+    # Konfigurasi dari environment variable, None jika API key / base URL tidak diset
+    @classmethod
+    def from_env(cls, **kwargs) -> Optional["LLMBackend"]:
+        api_key = os.environ.get("OPENAI_API_KEY", "")
+        base_url = os.environ.get("OPENAI_BASE_URL", "")
+        if not api_key and not base_url:
+            return None
+        return cls(
+            base_url=base_url or "https://api.openai.com/v1",
+            api_key=api_key,
+            model=os.environ.get("OPENAI_MODEL", "gpt-4o-mini"),
+            cache_dir=os.environ.get("LLM_CACHE_DIR", ".cache/llm"),
+            **kwargs
+        )
+
+    def generate(self, generator, material_text: str, concepts: List[str], sentences: List[str],
+                 num_questions: int, progress_callback: Callable = None) -> List[Question]:
+        # Susun semua prompt di thread ini agar pilihan acak tetap mengikuti seed generator
+        batches = self.build_batches(generator, concepts, sentences, num_questions)
+        # Seed acak opsi per batch, batch selesai dalam urutan apa pun tetapi hasilnya tetap bisa diulang
+        shuffle_seeds = [generator.rng.getrandbits(32) for _ in batches]
+        results: List[Optional[List[Question]]] = [None] * len(batches)
+        completed = [0]
+
+        def on_batch_done(batch_index: int, questions: List[Question]):
+            # LLM cenderung menaruh jawaban benar di opsi pertama
+            rng = random.Random(shuffle_seeds[batch_index])
+            for question in questions:
+                rng.shuffle(question.options)
+            results[batch_index] = questions
+            for question in questions:
+                if progress_callback is not None:
+                    progress_callback(completed[0], question)
+                completed[0] += 1
+
+        # asyncio dan urllib hanya dimuat jika mesin LLM dipakai
+        import asyncio
+        with generator.tracer.span("llm_requests"):
+            errors, cache_hits = asyncio.run(self._run_batches(batches, on_batch_done))
+        if self.cache is not None:
+            # Dihitung per generate, bukan dari counter cache yang dipakai bersama generate lain
+            generator.tracer.record_cache("llm_response", hits=cache_hits, misses=len(batches) - cache_hits)
+        for message in errors:
+            generator.reporter.error(message)
+
+        # Soal LLM yang hampir sama dengan soal sebelumnya dibuang (urut batch agar hasil tetap bisa diulang)
+        questions = []
+        for batch_questions in results:
+            questions.extend(q for q in batch_questions or [] if generator.accept_question(q))
+        questions = questions[:num_questions]
+
+        # Batch gagal, respons kurang lengkap, atau soal duplikat ditutup dengan soal dari mesin template
+        def on_template_question(question_num: int, question: Question):
+            if progress_callback is not None:
+                progress_callback(completed[0], question)
+                completed[0] += 1
+
+        return generator.sample_distinct_questions(concepts, sentences, material_text, num_questions,
+                                                   questions, on_template_question)
+
+    # Bagi permintaan menjadi batch (daftar konsep, prompt), setiap batch satu request
+    def build_batches(self, generator, concepts: List[str], sentences: List[str],
+                      num_questions: int) -> List[Tuple[List[str], str]]:
+        if concepts:
+            order = list(concepts)
+            generator.rng.shuffle(order)
+            targets = [order[i % len(order)] for i in range(num_questions)]
+        else:
+            targets = [""] * num_questions
+
+        batches = []
+        for start in range(0, num_questions, self.questions_per_request):
+            batch_concepts = targets[start:start + self.questions_per_request]
+            context = self.build_context(generator, batch_concepts, sentences)
+            batches.append((batch_concepts, self.build_prompt(batch_concepts, context)))
+        return batches
+
+    # Kalimat materi pendukung konsep dalam batch, dibatasi max_context_chars
+    def build_context(self, generator, batch_concepts: List[str], sentences: List[str]) -> List[str]:
+        sentence_ids = []
+        for concept in dict.fromkeys(c for c in batch_concepts if c):
+            candidates = generator.concept_index.get(concept, [])
+            sentence_ids.extend(candidates[:3])
+        if not sentence_ids and sentences:
+            sentence_ids = generator.rng.sample(range(len(sentences)), min(len(sentences), 10))
+
+        context, total = [], 0
+        for sentence_id in sorted(set(sentence_ids)):
+            sentence = shorten_sentence(sentences[sentence_id], 300)
+            if total + len(sentence) > self.max_context_chars:
+                break
+            context.append(sentence)
+            total += len(sentence)
+        return context
+
+    def build_prompt(self, batch_concepts: List[str], context: List[str]) -> str:
+        named = [c for c in batch_concepts if c]
+        lines = [
+            f"Buat {len(batch_concepts)} soal pilihan ganda berbahasa Indonesia dari materi berikut.",
+            "Setiap soal memiliki tepat 4 opsi, satu jawaban benar yang didukung materi, dan penjelasan singkat.",
+        ]
+        if named:
+            lines.append("Konsep yang ditanyakan, satu soal per konsep: " + "; ".join(named))
+        lines.append("Materi:")
+        lines.extend(f"- {sentence}" for sentence in context)
+        lines.append(
+            'Jawab hanya dengan JSON: {"questions": [{"question": str, "options": [str, str, str, str], '
+            '"correct_answer": str, "explanation": str, "difficulty": "easy"|"medium"|"hard", "concept": str}]}'
+        )
+        return "\n".join(lines)
+
+    def _request_body(self, prompt: str) -> Dict:
+        return {
+            "model": self.model,
+            "messages": [
+                {"role": "system", "content": "Kamu adalah pembuat soal ujian yang hanya memakai isi materi."},
+                {"role": "user", "content": prompt}
+            ],
+            "temperature": self.temperature,
+            "max_tokens": self.max_output_tokens,
+            "response_format": {"type": "json_object"}
+        }
+
+    def cache_key(self, prompt: str) -> str:
+        payload = json.dumps([self.key, self._request_body(prompt)], sort_keys=True, ensure_ascii=False)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    # Perkiraan kasar token per request (prompt ~4 karakter per token + batas output)
+    def estimate_tokens(self, prompt: str) -> int:
+        return len(prompt) // 4 + self.max_output_tokens
+
+    # Jalankan semua batch bersamaan; kembalikan pesan error dan jumlah batch yang diambil dari cache
+    async def _run_batches(self, batches: List[Tuple[List[str], str]],
+                           on_batch_done: Callable) -> Tuple[List[str], int]:
+        import asyncio
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        errors = []
+        cache_hits = [0]
+
+        async def run_batch(batch_index: int, batch_size: int, prompt: str):
+            try:
+                content, cached = await self._complete(prompt, semaphore)
+                cache_hits[0] += cached
+                return batch_index, parse_questions(content)[:batch_size], None
+            except Exception as e:
+                return batch_index, [], f"LLM batch {batch_index + 1} gagal, memakai soal template: {e}"
+
+        tasks = [run_batch(i, len(batch_concepts), prompt) for i, (batch_concepts, prompt) in enumerate(batches)]
+        for future in asyncio.as_completed(tasks):
+            batch_index, questions, error = await future
+            if error:
+                errors.append(error)
+            on_batch_done(batch_index, questions)
+        return errors, cache_hits[0]
+
+    # Satu completion: cek cache disk, lalu kirim dengan rate limit dan retry backoff.
+    # Kembalikan isi jawaban dan apakah diambil dari cache.
+    async def _complete(self, prompt: str, semaphore: "asyncio.Semaphore") -> Tuple[str, bool]:
+        import asyncio
+        key = self.cache_key(prompt)
+        if self.cache is not None:
+            content = self.cache.get(key)
+            if content is not None:
+                return content, True
+
+        body = json.dumps(self._request_body(prompt)).encode("utf-8")
+        loop = asyncio.get_running_loop()
+        attempt = 0
+        while True:
+            async with semaphore:
+                await self.rate_limiter.acquire(self.estimate_tokens(prompt))
+                self.requests_sent += 1
+                try:
+                    content = await loop.run_in_executor(None, self._post, body)
+                    # Respons yang bukan JSON soal valid dicoba lagi seperti error sementara
+                    parse_questions(content)
+                    break
+                except LLMRequestError:
+                    raise
+                except RetryableError as e:
+                    error, retry_after = e, e.retry_after
+                except Exception as e:
+                    error, retry_after = e, None
+            if attempt >= self.max_retries:
+                raise error
+            delay = retry_after if retry_after is not None else min(self.backoff_max, self.backoff_base * 2 ** attempt)
+            # Jitter agar request yang gagal bersamaan tidak mencoba ulang di waktu yang sama
+            await asyncio.sleep(delay * (0.5 + random.random() / 2))
+            attempt += 1
+            self.retries += 1
+
+        if self.cache is not None:
+            self.cache.put(key, content)
+        return content, False
+
+    # Kirim request HTTP (blocking, dijalankan di thread executor) dan kembalikan isi pesan jawaban
+    def _post(self, body: bytes) -> str:
+        import urllib.error
+        import urllib.request
+        headers = {"Content-Type": "application/json"}
+        if self.api_key:
+            headers["Authorization"] = f"Bearer {self.api_key}"
+        request = urllib.request.Request(f"{self.base_url}/chat/completions", data=body, headers=headers)
+        try:
+            with urllib.request.urlopen(request, timeout=self.request_timeout) as response:
+                payload = json.loads(response.read().decode("utf-8"))
+        except urllib.error.HTTPError as e:
+            detail = e.read()[:200].decode("utf-8", "replace")
+            if e.code not in RETRYABLE_STATUS:
+                raise LLMRequestError(f"HTTP {e.code}: {detail}")
+            raise RetryableError(f"HTTP {e.code}: {detail}", e.headers.get("Retry-After"))
+        return payload["choices"][0]["message"]["content"]
+
+
+# Ubah isi respons LLM menjadi daftar Question, soal yang tidak lengkap dibuang
+def parse_questions(content: str) -> List[Question]:
+    data = json.loads(content)
+    items = data.get("questions") if isinstance(data, dict) else data
+    if not isinstance(items, list):
+        raise ValueError("respons LLM tidak memuat daftar 'questions'")
+
+    questions = []
+    for item in items:
+        if not isinstance(item, dict):
+            continue
+        options = [str(option).strip() for option in item.get("options") or [] if str(option).strip()]
+        correct_answer = str(item.get("correct_answer", "")).strip()
+        # Jawaban kadang diberikan sebagai huruf opsi (A-D)
+        if correct_answer not in options and len(correct_answer) == 1 and correct_answer.upper() in "ABCD":
+            index = "ABCD".index(correct_answer.upper())
+            correct_answer = options[index] if index < len(options) else correct_answer
+        question_text = str(item.get("question", "")).strip()
+        options = options[:4]
+        if not question_text or len(options) < 2 or correct_answer not in options:
+            continue
+        difficulty = str(item.get("difficulty", "medium")).lower()
+        questions.append(Question(
+            question_text=question_text,
+            options=options,
+            correct_answer=correct_answer,
+            explanation=str(item.get("explanation", "")).strip(),
+            difficulty=difficulty if difficulty in ("easy", "medium", "hard") else "medium",
+            concept=str(item.get("concept", "")).strip()
+        ))
+    return questions
@@ -0,0 +1,323 @@
+import json
+import sqlite3
+import threading
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from questions import Question
+
+# Versi skema database, naikkan jika tabel berubah
+SCHEMA_VERSION = 3
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS materials (
+    id INTEGER PRIMARY KEY,
+    material_hash TEXT NOT NULL UNIQUE,
+    name TEXT NOT NULL DEFAULT '',
+    text_length INTEGER NOT NULL DEFAULT 0,
+    preview TEXT NOT NULL DEFAULT '',
+    created_at TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS concepts (
+    material_id INTEGER NOT NULL REFERENCES materials(id),
+    rank INTEGER NOT NULL,
+    concept TEXT NOT NULL,
+    PRIMARY KEY (material_id, rank)
+);
+CREATE INDEX IF NOT EXISTS idx_concepts_concept ON concepts(concept);
+CREATE TABLE IF NOT EXISTS generations (
+    id INTEGER PRIMARY KEY,
+    material_id INTEGER NOT NULL REFERENCES materials(id),
+    num_questions INTEGER NOT NULL,
+    seed INTEGER NOT NULL,
+    generator_key TEXT NOT NULL,
+    created_at TEXT NOT NULL,
+    UNIQUE (material_id, num_questions, seed, generator_key)
+);
+CREATE TABLE IF NOT EXISTS questions (
+    id INTEGER PRIMARY KEY,
+    generation_id INTEGER NOT NULL REFERENCES generations(id),
+    material_id INTEGER NOT NULL REFERENCES materials(id),
+    position INTEGER NOT NULL,
+    question_text TEXT NOT NULL,
+    options TEXT NOT NULL,
+    correct_answer TEXT NOT NULL,
+    explanation TEXT NOT NULL,
+    question_type TEXT NOT NULL,
+    difficulty TEXT NOT NULL,
+    concept TEXT NOT NULL,
+    question_uid TEXT NOT NULL DEFAULT '',
+    section_id TEXT NOT NULL DEFAULT ''
+);
+CREATE INDEX IF NOT EXISTS idx_questions_generation ON questions(generation_id, position);
+CREATE INDEX IF NOT EXISTS idx_questions_material ON questions(material_id);
+CREATE INDEX IF NOT EXISTS idx_questions_concept ON questions(concept);
+CREATE INDEX IF NOT EXISTS idx_questions_difficulty ON questions(difficulty);
+CREATE INDEX IF NOT EXISTS idx_questions_type ON questions(question_type);
+CREATE TABLE IF NOT EXISTS question_stats (
+    day TEXT NOT NULL,
+    concept TEXT NOT NULL,
+    difficulty TEXT NOT NULL,
+    question_type TEXT NOT NULL,
+    question_count INTEGER NOT NULL,
+    PRIMARY KEY (day, concept, difficulty, question_type)
+);
+"""
+
+# Index full-text atas teks soal (butuh SQLite dengan FTS5)
+FTS_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS questions_fts USING fts5(
+    question_text, content='questions', content_rowid='id'
+);
+"""
+
+# Kolom soal yang ditambahkan setelah skema versi 1 (nama, definisi), ditambahkan ke database lama saat dibuka
+_ADDED_COLUMNS = (
+    ("question_uid", "TEXT NOT NULL DEFAULT ''"),
+    ("section_id", "TEXT NOT NULL DEFAULT ''"),
+)
+
+# Jumlah soal per hari, konsep, kesulitan, dan jenis; diperbarui setiap set soal disimpan agar
+# statistik dan grafik riwayat tidak perlu membaca semua baris soal
+_STATS_UPSERT = """
+INSERT INTO question_stats (day, concept, difficulty, question_type, question_count)
+SELECT substr(g.created_at, 1, 10), q.concept, q.difficulty, q.question_type, COUNT(*)
+FROM questions q JOIN generations g ON g.id = q.generation_id
+WHERE {where}
+GROUP BY 1, 2, 3, 4
+ON CONFLICT (day, concept, difficulty, question_type) DO UPDATE
+SET question_count = question_count + excluded.question_count
+"""
+
+_QUESTION_COLUMNS = ("question_text, options, correct_answer, explanation, question_type, difficulty, concept, "
+                     "question_uid, section_id")
+_QUALIFIED_COLUMNS = ", ".join(f"q.{column}" for column in _QUESTION_COLUMNS.split(", "))
+
+
+def _row_to_question(row: Tuple) -> Question:
+    question_text, options, correct_answer, explanation, question_type, difficulty, concept, question_uid, \
+        section_id = row
+    return Question(
+        question_text=question_text,
+        options=json.loads(options),
+        correct_answer=correct_answer,
+        explanation=explanation,
+        question_type=question_type,
+        difficulty=difficulty,
+        concept=concept,
+        question_id=question_uid,
+        section_id=section_id
+    )
+
+
+# Bank soal lokal di SQLite: materi (per hash isi), konsep, dan soal hasil generate
+class QuestionBank:
+    def __init__(self, path: str = "question_bank.db"):
+        self.path = path
+        # Satu koneksi dipakai bersama oleh thread script Streamlit dan thread job, akses dijaga lock
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("PRAGMA foreign_keys=ON")
+        with self._conn:
+            version = self._conn.execute("PRAGMA user_version").fetchone()[0]
+            self._conn.executescript(SCHEMA)
+            self._migrate(version)
+            self._conn.execute(f"PRAGMA user_version={SCHEMA_VERSION}")
+        try:
+            with self._conn:
+                self._conn.executescript(FTS_SCHEMA)
+            self.has_fts = True
+        except sqlite3.OperationalError:
+            # SQLite tanpa FTS5, pencarian teks memakai LIKE
+            self.has_fts = False
+
+    # Tambahkan kolom baru ke tabel questions dari database versi lama, isi statistik soal yang sudah ada
+    def _migrate(self, version: int):
+        existing = {row[1] for row in self._conn.execute("PRAGMA table_info(questions)")}
+        for column, definition in _ADDED_COLUMNS:
+            if column not in existing:
+                self._conn.execute(f"ALTER TABLE questions ADD COLUMN {column} {definition}")
+        if version < 3:
+            self._conn.execute("DELETE FROM question_stats")
+            self._conn.execute(_STATS_UPSERT.format(where="1"))
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    # Simpan (atau perbarui) data materi beserta konsep kuncinya, kembalikan id materi
+    def save_material(self, material_hash: str, name: str = "", text_length: int = 0, preview: str = "",
+                      concepts: Iterable[str] = ()) -> int:
+        with self._lock, self._conn:
+            return self._save_material(material_hash, name, text_length, preview, concepts)
+
+    def _save_material(self, material_hash: str, name: str, text_length: int, preview: str,
+                       concepts: Iterable[str]) -> int:
+        self._conn.execute(
+            "INSERT INTO materials (material_hash, name, text_length, preview, created_at) VALUES (?, ?, ?, ?, ?) "
+            "ON CONFLICT(material_hash) DO UPDATE SET name = excluded.name, text_length = excluded.text_length, "
+            "preview = excluded.preview",
+            (material_hash, name, text_length, preview, datetime.now().isoformat(timespec="seconds"))
+        )
+        material_id = self._conn.execute(
+            "SELECT id FROM materials WHERE material_hash = ?", (material_hash,)
+        ).fetchone()[0]
+        concepts = list(concepts)
+        if concepts:
+            self._conn.execute("DELETE FROM concepts WHERE material_id = ?", (material_id,))
+            self._conn.executemany(
+                "INSERT INTO concepts (material_id, rank, concept) VALUES (?, ?, ?)",
+                ((material_id, rank, concept) for rank, concept in enumerate(concepts))
+            )
+        return material_id
+
+    # Simpan satu set soal hasil generate dalam satu transaksi, kembalikan id generation
+    def save_generation(self, material_hash: str, num_questions: int, seed: int, generator_key: str,
+                        questions: Iterable[Question], name: str = "") -> int:
+        with self._lock, self._conn:
+            row = self._conn.execute(
+                "SELECT id FROM materials WHERE material_hash = ?", (material_hash,)
+            ).fetchone()
+            material_id = row[0] if row else self._save_material(material_hash, name, 0, "", ())
+            cursor = self._conn.execute(
+                "INSERT OR IGNORE INTO generations (material_id, num_questions, seed, generator_key, created_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (material_id, num_questions, seed, generator_key, datetime.now().isoformat(timespec="seconds"))
+            )
+            if cursor.rowcount == 0:
+                # Set soal yang sama sudah tersimpan
+                return self._conn.execute(
+                    "SELECT id FROM generations WHERE material_id = ? AND num_questions = ? AND seed = ? "
+                    "AND generator_key = ?", (material_id, num_questions, seed, generator_key)
+                ).fetchone()[0]
+            generation_id = cursor.lastrowid
+            self._conn.executemany(
+                f"INSERT INTO questions (generation_id, material_id, position, {_QUESTION_COLUMNS}) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                ((generation_id, material_id, position, q.question_text, json.dumps(list(q.options), ensure_ascii=False),
+                  q.correct_answer, q.explanation, q.question_type, q.difficulty, q.concept, q.question_id,
+                  q.section_id)
+                 for position, q in enumerate(questions))
+            )
+            self._conn.execute(_STATS_UPSERT.format(where="q.generation_id = ?"), (generation_id,))
+            if self.has_fts:
+                self._conn.execute(
+                    "INSERT INTO questions_fts (rowid, question_text) "
+                    "SELECT id, question_text FROM questions WHERE generation_id = ?", (generation_id,)
+                )
+            return generation_id
+
+    # Cari set soal yang sudah pernah dibuat; seed None berarti set terbaru dengan seed apa pun
+    def find_generation(self, material_hash: str, num_questions: int, generator_key: str,
+                        seed: int = None) -> Optional[Tuple[int, List[Question]]]:
+        query = ("SELECT g.id, g.seed FROM generations g JOIN materials m ON m.id = g.material_id "
+                 "WHERE m.material_hash = ? AND g.num_questions = ? AND g.generator_key = ?")
+        params = [material_hash, num_questions, generator_key]
+        if seed is not None:
+            query += " AND g.seed = ?"
+            params.append(seed)
+        query += " ORDER BY g.id DESC LIMIT 1"
+        with self._lock:
+            row = self._conn.execute(query, params).fetchone()
+            if row is None:
+                return None
+            generation_id, found_seed = row
+            rows = self._conn.execute(
+                f"SELECT {_QUESTION_COLUMNS} FROM questions WHERE generation_id = ? ORDER BY position",
+                (generation_id,)
+            ).fetchall()
+        return found_seed, [_row_to_question(r) for r in rows]
+
+    # Ambil soal tersimpan dengan filter materi, konsep, kesulitan, dan jenis soal
+    def query(self, material_hash: str = None, concept: str = None, difficulty: str = None,
+              question_type: str = None, limit: int = 100) -> List[Question]:
+        clauses, params = [], []
+        if material_hash is not None:
+            clauses.append("material_id = (SELECT id FROM materials WHERE material_hash = ?)")
+            params.append(material_hash)
+        if concept is not None:
+            clauses.append("concept = ?")
+            params.append(concept)
+        if difficulty is not None:
+            clauses.append("difficulty = ?")
+            params.append(difficulty)
+        if question_type is not None:
+            clauses.append("question_type = ?")
+            params.append(question_type)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        params.append(limit)
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT {_QUESTION_COLUMNS} FROM questions {where} ORDER BY id DESC LIMIT ?", params
+            ).fetchall()
+        return [_row_to_question(r) for r in rows]
+
+    # Cari soal yang teksnya memuat semua kata pencarian (terbaru dulu), bisa difilter tingkat kesulitan
+    def search(self, text: str, difficulty: str = None, limit: int = 50) -> List[Question]:
+        words = text.split()
+        if not words:
+            return []
+        extra, params = "", []
+        if difficulty is not None:
+            extra = " AND q.difficulty = ?"
+            params.append(difficulty)
+        with self._lock:
+            if self.has_fts:
+                # Setiap kata dikutip agar tanda baca dari input user tidak dibaca sebagai sintaks FTS5
+                match = " ".join('"' + word.replace('"', '""') + '"' for word in words)
+                # Urut rowid bisa dibaca langsung dari index FTS dan berhenti di LIMIT; urut bm25 (rank)
+                # harus menilai semua kecocokan dulu, ratusan ms untuk kata umum di 1 juta soal
+                rows = self._conn.execute(
+                    f"SELECT {_QUALIFIED_COLUMNS} FROM questions_fts JOIN questions q ON q.id = questions_fts.rowid "
+                    f"WHERE questions_fts MATCH ?{extra} ORDER BY questions_fts.rowid DESC LIMIT ?",
+                    [match] + params + [limit]
+                ).fetchall()
+            else:
+                like = " AND ".join("q.question_text LIKE ?" for _ in words)
+                rows = self._conn.execute(
+                    f"SELECT {_QUALIFIED_COLUMNS} FROM questions q WHERE {like}{extra} ORDER BY q.id DESC LIMIT ?",
+                    [f"%{word}%" for word in words] + params + [limit]
+                ).fetchall()
+        return [_row_to_question(r) for r in rows]
+
+    # Teks semua soal tersimpan dari satu materi, untuk menghindari soal yang sama saat generate ulang
+    def question_texts(self, material_hash: str) -> List[str]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT question_text FROM questions "
+                "WHERE material_id = (SELECT id FROM materials WHERE material_hash = ?) ORDER BY id",
+                (material_hash,)
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    # Konsep kunci materi yang tersimpan, urut sesuai peringkat
+    def material_concepts(self, material_hash: str) -> List[str]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT c.concept FROM concepts c JOIN materials m ON m.id = c.material_id "
+                "WHERE m.material_hash = ? ORDER BY c.rank", (material_hash,)
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    def stats(self) -> Dict:
+        with self._lock:
+            materials, generations = (
+                self._conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+                for table in ("materials", "generations")
+            )
+            questions = self._conn.execute("SELECT COALESCE(SUM(question_count), 0) FROM question_stats").fetchone()[0]
+        return {"materials": materials, "generations": generations, "questions": questions}
+
+    # Penanda isi bank: berubah setiap ada set soal baru, untuk kunci cache grafik riwayat
+    def version(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COALESCE(MAX(id), 0) FROM generations").fetchone()[0]
+
+    # Jumlah soal per hari, konsep, kesulitan, dan jenis soal (dari tabel ringkasan, bukan tabel soal)
+    def question_stats(self) -> List[Tuple[str, str, str, str, int]]:
+        with self._lock:
+            return self._conn.execute(
+                "SELECT day, concept, difficulty, question_type, question_count FROM question_stats"
+            ).fetchall()
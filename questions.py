@@ -0,0 +1,240 @@
+import sys
+from array import array
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence
+
+import numpy as np
+
+
+# Class untuk merepresentasikan sebuah soal (pakai __slots__, tanpa __dict__ per objek)
+class Question:
+    __slots__ = ("question_text", "options", "correct_answer", "explanation",
+                 "question_type", "difficulty", "concept", "question_id", "section_id")
+
+    def __init__(self, question_text: str, options: List[str], correct_answer: str, explanation: str,
+                 question_type: str = "pilihan_ganda", difficulty: str = "medium", concept: str = "",
+                 question_id: str = "", section_id: str = ""):
+        self.question_text = question_text
+        self.options = options
+        self.correct_answer = correct_answer
+        self.explanation = explanation
+        self.question_type = question_type
+        self.difficulty = difficulty
+        self.concept = concept
+        # Id soal yang tetap sama selama bagian materi sumbernya tidak berubah
+        self.question_id = question_id
+        # Kunci (hash isi) bagian materi tempat soal dibuat, kosong jika tidak diketahui
+        self.section_id = section_id
+
+    def __eq__(self, other) -> bool:
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in self.__slots__)
+
+    def __repr__(self) -> str:
+        fields = ", ".join(f"{name}={getattr(self, name)!r}" for name in self.__slots__)
+        return f"Question({fields})"
+
+    # Convert question to dictionary
+    def to_dict(self) -> Dict:
+        return {
+            "question": self.question_text,
+            "options": self.options,
+            "correct_answer": self.correct_answer,
+            "explanation": self.explanation,
+            "type": self.question_type,
+            "difficulty": self.difficulty,
+            "concept": self.concept,
+            "id": self.question_id
+        }
+
+
+# Nilai kategori yang berulang (kesulitan, tipe, konsep) disimpan sekali, baris cukup menyimpan kodenya
+class _Categories:
+    def __init__(self, initial: Sequence[str] = ()):
+        self.values: List[str] = []
+        self.codes: Dict[str, int] = {}
+        for value in initial:
+            self.code(value)
+
+    def code(self, value: str) -> int:
+        code = self.codes.get(value)
+        if code is None:
+            code = len(self.values)
+            value = sys.intern(value)
+            self.values.append(value)
+            self.codes[value] = code
+        return code
+
+
+# Penyimpanan soal per kolom untuk bank soal besar (batch, riwayat, session state)
+class QuestionStore:
+    def __init__(self, questions: Iterable[Question] = ()):
+        self.question_texts: List[str] = []
+        # Opsi disimpan sebagai tuple, jawaban benar cukup sebagai indeks ke opsi
+        self.options: List[tuple] = []
+        self.answer_indexes = array("b")
+        # Jawaban yang tidak ada di daftar opsi (jarang), disimpan terpisah per baris
+        self.extra_answers: Dict[int, str] = {}
+        self.explanations: List[str] = []
+        # Label kesulitan/tipe bisa bebas (mesin LLM, kesulitan dari akurasi kuis), jadi kodenya int16, bukan int8
+        self.difficulties = _Categories(("easy", "medium", "hard"))
+        self.difficulty_codes = array("h")
+        self.types = _Categories(("pilihan_ganda",))
+        self.type_codes = array("h")
+        self.concepts = _Categories(("",))
+        self.concept_codes = array("i")
+        self.question_ids: List[str] = []
+        # Banyak soal berasal dari bagian materi yang sama
+        self.sections = _Categories(("",))
+        self.section_codes = array("i")
+        self.extend(questions)
+
+    def append(self, question: Question):
+        row = len(self.question_texts)
+        options = tuple(question.options)
+        try:
+            answer_index = options.index(question.correct_answer)
+        except ValueError:
+            answer_index = -1
+            self.extra_answers[row] = question.correct_answer
+        self._push("answer_indexes", answer_index)
+        self._push("difficulty_codes", self.difficulties.code(question.difficulty))
+        self._push("type_codes", self.types.code(question.question_type))
+        self._push("concept_codes", self.concepts.code(question.concept))
+        self._push("section_codes", self.sections.code(question.section_id))
+        self.question_ids.append(question.question_id)
+        self.question_texts.append(question.question_text)
+        self.options.append(options)
+        self.explanations.append(question.explanation)
+
+    def _push(self, column: str, value: int):
+        codes = getattr(self, column)
+        try:
+            codes.append(value)
+        except BufferError:
+            # Buffer masih dipakai view pandas/Arrow, salin dulu (copy-on-write) agar view lama tetap valid
+            codes = array(codes.typecode, codes)
+            codes.append(value)
+            setattr(self, column, codes)
+
+    # Ganti label kesulitan per baris (None = tetap), misalnya dari akurasi kuis; kembalikan jumlah yang berubah.
+    # Kolom kode disalin dulu agar view pandas/Arrow lama tetap valid
+    def set_difficulties(self, difficulties: Sequence[Optional[str]]) -> int:
+        codes = array(self.difficulty_codes.typecode, self.difficulty_codes)
+        changed = 0
+        for row, difficulty in enumerate(difficulties):
+            if difficulty is None:
+                continue
+            code = self.difficulties.code(difficulty)
+            if codes[row] != code:
+                codes[row] = code
+                changed += 1
+        self.difficulty_codes = codes
+        return changed
+
+    def extend(self, questions: Iterable[Question]):
+        for question in questions:
+            self.append(question)
+
+    def __len__(self) -> int:
+        return len(self.question_texts)
+
+    def __bool__(self) -> bool:
+        return bool(self.question_texts)
+
+    def correct_answer(self, row: int) -> str:
+        answer_index = self.answer_indexes[row]
+        if answer_index < 0:
+            return self.extra_answers[row]
+        return self.options[row][answer_index]
+
+    # Buat objek Question untuk satu baris (hanya saat dibutuhkan, misalnya untuk ditampilkan)
+    def __getitem__(self, row):
+        if isinstance(row, slice):
+            return [self[i] for i in range(*row.indices(len(self)))]
+        if row < 0:
+            row += len(self)
+        return Question(
+            question_text=self.question_texts[row],
+            options=list(self.options[row]),
+            correct_answer=self.correct_answer(row),
+            explanation=self.explanations[row],
+            question_type=self.types.values[self.type_codes[row]],
+            difficulty=self.difficulties.values[self.difficulty_codes[row]],
+            concept=self.concepts.values[self.concept_codes[row]],
+            question_id=self.question_ids[row],
+            section_id=self.sections.values[self.section_codes[row]]
+        )
+
+    def __iter__(self) -> Iterator[Question]:
+        for row in range(len(self)):
+            yield self[row]
+
+    def to_dicts(self) -> List[Dict]:
+        return [question.to_dict() for question in self]
+
+    # Jumlah soal per nilai kolom kategori ("difficulty", "type", atau "concept")
+    def count_by(self, column: str) -> Dict[str, int]:
+        categories, codes = self._categorical(column)
+        counts = np.bincount(np.frombuffer(codes, dtype=codes.typecode), minlength=len(categories.values))
+        return {value: int(count) for value, count in zip(categories.values, counts) if count}
+
+    def _categorical(self, column: str):
+        if column == "difficulty":
+            return self.difficulties, self.difficulty_codes
+        if column == "type":
+            return self.types, self.type_codes
+        if column == "concept":
+            return self.concepts, self.concept_codes
+        raise ValueError(f"Kolom kategori tidak dikenal: {column}")
+
+    # DataFrame pandas; kolom kategori memakai buffer kode yang sama tanpa disalin
+    def to_pandas(self):
+        import pandas as pd
+
+        columns = {
+            "question": self.question_texts,
+            "options": self.options,
+            "correct_answer": [self.correct_answer(row) for row in range(len(self))],
+            "explanation": self.explanations,
+        }
+        for column in ("type", "difficulty", "concept"):
+            categories, codes = self._categorical(column)
+            columns[column] = pd.Categorical.from_codes(
+                np.frombuffer(codes, dtype=codes.typecode), categories=categories.values
+            )
+        return pd.DataFrame(columns, copy=False)
+
+    # Tabel Arrow (butuh pyarrow); kolom kategori menjadi dictionary array di atas buffer kode
+    def to_arrow(self):
+        try:
+            import pyarrow as pa
+        except ImportError as e:
+            raise ImportError("to_arrow membutuhkan pyarrow (pip install pyarrow)") from e
+
+        columns = {
+            "question": pa.array(self.question_texts, pa.string()),
+            "options": pa.array([list(options) for options in self.options], pa.list_(pa.string())),
+            "answer_index": pa.array(np.frombuffer(self.answer_indexes, dtype=np.int8)),
+            "explanation": pa.array(self.explanations, pa.string()),
+        }
+        for column in ("type", "difficulty", "concept"):
+            categories, codes = self._categorical(column)
+            columns[column] = pa.DictionaryArray.from_arrays(
+                pa.array(np.frombuffer(codes, dtype=codes.typecode)), pa.array(categories.values, pa.string())
+            )
+        return pa.table(columns)
+
+    # Perkiraan memori yang dipakai store (byte)
+    def size_bytes(self) -> int:
+        size = sum(sys.getsizeof(column) for column in (self.question_texts, self.options, self.explanations,
+                                                        self.question_ids))
+        size += sum(sys.getsizeof(text) for text in self.question_texts)
+        size += sum(sys.getsizeof(question_id) for question_id in self.question_ids)
+        size += sum(sys.getsizeof(text) for text in self.explanations)
+        for options in self.options:
+            size += sys.getsizeof(options) + sum(sys.getsizeof(option) for option in options)
+        for codes in (self.answer_indexes, self.difficulty_codes, self.type_codes, self.concept_codes,
+                      self.section_codes):
+            size += codes.itemsize * len(codes)
+        return size
@@ -0,0 +1,56 @@
+import logging
+from abc import ABC, abstractmethod
+from typing import List, Tuple
+
+logger = logging.getLogger("question_generator")
+
+
+# Antarmuka pelaporan pesan dari processor dan generator; reporter yang tidak lengkap gagal saat dibuat
+class Reporter(ABC):
+    @abstractmethod
+    def error(self, message: str):
+        ...
+
+    @abstractmethod
+    def warning(self, message: str):
+        ...
+
+
+# Tampilkan pesan di UI Streamlit
+class StreamlitReporter(Reporter):
+    def error(self, message: str):
+        import streamlit as st
+        st.error(message)
+
+    def warning(self, message: str):
+        import streamlit as st
+        st.warning(message)
+
+
+# Kirim pesan ke logging, untuk mode batch/headless
+class LoggingReporter(Reporter):
+    def __init__(self, log: logging.Logger = logger):
+        self.log = log
+
+    def error(self, message: str):
+        self.log.error(message)
+
+    def warning(self, message: str):
+        self.log.warning(message)
+
+
+# Kumpulkan pesan agar bisa disimpan bersama hasil
+class CollectingReporter(Reporter):
+    def __init__(self):
+        self.messages: List[Tuple[str, str]] = []
+
+    def error(self, message: str):
+        self.messages.append(("error", message))
+
+    def warning(self, message: str):
+        self.messages.append(("warning", message))
+
+    # Ambil dan kosongkan pesan yang terkumpul
+    def drain(self) -> List[Tuple[str, str]]:
+        messages, self.messages = self.messages, []
+        return messages
@@ -0,0 +1,252 @@
+import json
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from questions import QuestionStore
+
+# Kode jawaban kosong atau tidak dikenali di matriks jawaban
+NO_ANSWER = -1
+# Batas akurasi untuk label kesulitan: >= EASY_ACCURACY mudah, >= MEDIUM_ACCURACY sedang, selebihnya sulit
+EASY_ACCURACY = 0.8
+MEDIUM_ACCURACY = 0.5
+# Jumlah jawaban minimal sebelum kesulitan soal dihitung dari akurasi (sebelumnya label dari generator)
+MIN_RESPONSES = 5
+
+
+# Kunci jawaban satu set soal sebagai array: indeks opsi benar per soal, plus lookup id soal dan teks opsi
+class AnswerKey:
+    def __init__(self, store: QuestionStore):
+        self.num_questions = len(store)
+        # -1 jika jawaban benar tidak ada di daftar opsi (tidak ada jawaban siswa yang cocok)
+        self.correct = np.frombuffer(store.answer_indexes, dtype=np.int8).astype(np.int16)
+        self.rows = {question_id: row for row, question_id in enumerate(store.question_ids) if question_id}
+        self.question_ids = list(store.question_ids)
+        self.num_options = [len(options) for options in store.options]
+        self.option_counts = np.array(self.num_options, dtype=np.int16)
+        # Lookup jawaban teks per soal: huruf besar/kecil dan teks opsi -> indeks opsi
+        self._lookups = []
+        for options in store.options:
+            lookup = {option: i for i, option in enumerate(options)}
+            for i in range(len(options)):
+                lookup[chr(65 + i)] = lookup[chr(97 + i)] = i
+            self._lookups.append(lookup)
+        # Opsi berupa satu huruf ("x") tidak boleh lewat jalur cepat huruf -> indeks di encode
+        self._letter_fast_path = not any(len(option) == 1 and option.isascii() and option.isalpha()
+                                         for options in store.options for option in options)
+
+    # Indeks opsi dari jawaban siswa: huruf ("B"), indeks opsi (int, mulai 0), atau teks opsinya
+    def option_index(self, row: int, answer) -> int:
+        if isinstance(answer, str):
+            lookup = self._lookups[row]
+            return lookup.get(answer, lookup.get(answer.strip(), NO_ANSWER))
+        if isinstance(answer, int) and not isinstance(answer, bool):
+            return answer if 0 <= answer < self.num_options[row] else NO_ANSWER
+        return NO_ANSWER
+
+    # Baris soal dari kunci jawaban dict: id soal, atau nomor soal mulai 1 ("3" / 3)
+    def row_of(self, key) -> Optional[int]:
+        row = self.rows.get(key)
+        if row is not None:
+            return row
+        try:
+            row = int(key) - 1
+        except (TypeError, ValueError):
+            return None
+        return row if 0 <= row < self.num_questions else None
+
+    # Jawaban satu siswa yang berupa list urut soal; lookup huruf/teks per soal dijalankan lewat map
+    def _encode_list(self, answers) -> List[int]:
+        answers = list(answers)[:self.num_questions]
+        try:
+            encoded = list(map(dict.get, self._lookups, answers))
+        except TypeError:
+            # Ada jawaban yang tidak bisa di-hash (list/object): semua lewat option_index
+            encoded = [None] * len(answers)
+        if None in encoded:
+            encoded = [index if index is not None else self.option_index(row, answer)
+                       for row, (index, answer) in enumerate(zip(encoded, answers))]
+        encoded.extend([NO_ANSWER] * (self.num_questions - len(encoded)))
+        return encoded
+
+    # Jawaban satu siswa yang berupa dict id/nomor soal -> jawaban
+    def _encode_dict(self, answers: Dict) -> List[int]:
+        encoded = [NO_ANSWER] * self.num_questions
+        for key, answer in answers.items():
+            row = self.rows.get(key) if isinstance(key, str) else None
+            if row is None:
+                row = self.row_of(key)
+                if row is None:
+                    continue
+            index = self._lookups[row].get(answer) if isinstance(answer, str) else None
+            encoded[row] = index if index is not None else self.option_index(row, answer)
+        return encoded
+
+    # Matriks jawaban (siswa x soal) dari jawaban tiap siswa: list urut soal, atau dict soal -> jawaban.
+    # Jawaban yang semuanya satu huruf (format utama) digabung lalu dikodekan sekaligus dengan NumPy.
+    # Gabungan sepanjang jumlah soal tanpa string kosong berarti setiap jawaban tepat satu karakter.
+    def encode(self, submissions: Iterable) -> np.ndarray:
+        submissions = list(submissions)
+        matrix = np.full((len(submissions), self.num_questions), NO_ANSWER, dtype=np.int16)
+        letter_students, letters = [], []
+        for student, answers in enumerate(submissions):
+            if isinstance(answers, dict):
+                if not answers.keys() <= self.rows.keys():
+                    matrix[student] = self._encode_dict(answers)
+                    continue
+                answers = list(map(answers.get, self.question_ids))
+            joined = ""
+            if self._letter_fast_path and len(answers) == self.num_questions and "" not in answers:
+                try:
+                    joined = "".join(answers)
+                except TypeError:
+                    pass
+            if len(joined) == self.num_questions and joined.isascii() and joined.isalpha():
+                letter_students.append(student)
+                letters.append(joined)
+            else:
+                matrix[student] = self._encode_list(answers)
+        if letter_students:
+            codes = np.frombuffer("".join(letters).encode("ascii"), dtype=np.uint8).reshape(-1, self.num_questions)
+            # Huruf besar/kecil sama: bit 32 di-set lalu dikurangi "a"
+            index = (codes | 32).astype(np.int16) - ord("a")
+            matrix[letter_students] = np.where(index < self.option_counts, index, NO_ANSWER)
+        return matrix
+
+
+# Hasil penilaian sekumpulan jawaban: matriks benar/dijawab per siswa x soal
+class ScoreReport:
+    def __init__(self, students: List[str], answers: np.ndarray, key: AnswerKey, errors: List[str] = None):
+        self.students = students
+        self.answers = answers
+        self.answered = answers != NO_ANSWER
+        self.correct = (answers == key.correct) & self.answered
+        self.num_questions = key.num_questions
+        # Baris JSONL yang tidak bisa dibaca
+        self.errors = errors or []
+
+    def __len__(self) -> int:
+        return len(self.students)
+
+    # Jumlah jawaban benar per siswa
+    @property
+    def scores(self) -> np.ndarray:
+        return self.correct.sum(axis=1)
+
+    # Nilai 0-100 per siswa (soal yang tidak dijawab dihitung salah)
+    @property
+    def percentages(self) -> np.ndarray:
+        return self.scores * (100.0 / max(self.num_questions, 1))
+
+    # Hasil per soal untuk satu siswa, format yang dipakai DashboardManager.analyze_quiz_results
+    def results(self, student: int, store: QuestionStore) -> List[Dict]:
+        results = []
+        for row in range(self.num_questions):
+            selected = int(self.answers[student, row])
+            results.append({
+                "question_id": store.question_ids[row],
+                "selected": store.options[row][selected] if selected != NO_ANSWER else None,
+                "correct_answer": store.correct_answer(row),
+                "is_correct": bool(self.correct[student, row]),
+            })
+        return results
+
+    # Tabel nilai per siswa (pandas)
+    def to_pandas(self):
+        import pandas as pd
+
+        return pd.DataFrame({
+            "Siswa": self.students,
+            "Benar": self.scores,
+            "Dijawab": self.answered.sum(axis=1),
+            "Nilai": self.percentages.round(1),
+        })
+
+
+# Akumulasi hasil kuis per soal, diperbarui per batch tanpa menyimpan semua jawaban
+class QuizStatistics:
+    def __init__(self, num_questions: int):
+        self.num_questions = num_questions
+        self.correct = np.zeros(num_questions, dtype=np.int64)
+        self.answered = np.zeros(num_questions, dtype=np.int64)
+        self.submissions = 0
+        # Total jawaban benar semua siswa, untuk rata-rata nilai
+        self.total_correct = 0
+
+    def add(self, report: ScoreReport):
+        self.correct += report.correct.sum(axis=0)
+        self.answered += report.answered.sum(axis=0)
+        self.submissions += len(report)
+        self.total_correct += int(report.correct.sum())
+
+    # Akurasi per soal (0-1), NaN untuk soal yang belum pernah dijawab
+    def accuracy(self) -> np.ndarray:
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return np.where(self.answered > 0, self.correct / np.maximum(self.answered, 1), np.nan)
+
+    # Label kesulitan per soal dari akurasi; None untuk soal yang jawabannya belum cukup
+    def difficulties(self, min_responses: int = MIN_RESPONSES) -> List[Optional[str]]:
+        accuracy = self.accuracy()
+        labels = np.select([accuracy >= EASY_ACCURACY, accuracy >= MEDIUM_ACCURACY], ["easy", "medium"], "hard")
+        return [str(label) if count >= min_responses else None for label, count in zip(labels, self.answered)]
+
+    # Ringkasan untuk analytics: jumlah siswa, rata-rata nilai, akurasi per soal
+    def summary(self) -> Dict:
+        total = self.submissions * self.num_questions
+        accuracy = (self.total_correct / total) * 100 if total else 0
+        return {
+            "submissions": self.submissions,
+            "correct_answers": self.total_correct,
+            "total_questions": total,
+            "accuracy": accuracy,
+            "question_accuracy": [None if np.isnan(a) else float(a) for a in self.accuracy()],
+            "performance": "Excellent" if accuracy >= 80 else "Good" if accuracy >= 60 else "Needs Improvement"
+        }
+
+
+# Baca jawaban siswa dari baris JSONL: {"student": "...", "answers": [...] atau {id soal: jawaban}}
+def parse_submissions(lines: Iterable) -> Tuple[List[str], List, List[str]]:
+    numbered = []
+    for line_number, line in enumerate(lines, 1):
+        if isinstance(line, bytes):
+            line = line.decode("utf-8")
+        if line.strip():
+            numbered.append((line_number, line))
+    # Semua baris di-decode dalam satu panggilan json; jika ada baris rusak, ulangi per baris untuk pesan error
+    try:
+        records = json.loads("[" + ",".join(line for _, line in numbered) + "]")
+    except ValueError:
+        records = None
+    if records is None or len(records) != len(numbered):
+        records = []
+        for _, line in numbered:
+            try:
+                records.append(json.loads(line))
+            except ValueError as e:
+                records.append(e)
+
+    students, answers, errors = [], [], []
+    for (line_number, _), record in zip(numbered, records):
+        if isinstance(record, ValueError):
+            errors.append(f"baris {line_number}: {record}")
+            continue
+        submission = record.get("answers") if isinstance(record, dict) else None
+        if not isinstance(submission, (list, dict)):
+            errors.append(f"baris {line_number}: answers harus list atau object")
+            continue
+        students.append(str(record.get("student", f"Siswa {len(students) + 1}")))
+        answers.append(submission)
+    return students, answers, errors
+
+
+# Nilai banyak jawaban sekaligus (JSONL) terhadap kunci jawaban set soal; perbandingan dilakukan per matriks
+def score_submissions(store: QuestionStore, lines: Iterable, key: AnswerKey = None) -> ScoreReport:
+    key = key if key is not None else AnswerKey(store)
+    students, answers, errors = parse_submissions(lines)
+    return ScoreReport(students, key.encode(answers), key, errors)
+
+
+# Nilai jawaban satu siswa (list urut soal atau dict soal -> jawaban)
+def score_answers(store: QuestionStore, answers, student: str = "", key: AnswerKey = None) -> ScoreReport:
+    key = key if key is not None else AnswerKey(store)
+    return ScoreReport([student], key.encode([answers]), key)
@@ -0,0 +1,63 @@
+import re
+import zlib
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+from course import CourseModel
+
+# Ukuran bagian (karakter teks mentah): batas bawah sebelum boleh dipotong dan batas atas paksa
+MIN_SECTION_CHARS = 2000
+MAX_SECTION_CHARS = 20000
+# Rata-rata satu dari sekian paragraf menjadi akhir bagian (setelah MIN_SECTION_CHARS tercapai)
+BOUNDARY_DIVISOR = 4
+
+_BLANK_LINE_RE = re.compile(r"\n[ \t\r\f\v]*\n")
+# Tanda akhir kalimat, sama dengan yang memutus kalimat di DocumentModel
+_SENTENCE_END_RE = re.compile(r"[.!?]")
+
+
+# Pisahkan teks mentah menjadi paragraf: dipisah baris kosong jika ada, jika tidak per baris (DOCX)
+def split_paragraphs(text: str) -> List[str]:
+    if _BLANK_LINE_RE.search(text):
+        paragraphs = _BLANK_LINE_RE.split(text)
+    else:
+        paragraphs = text.split("\n")
+    return [p for p in paragraphs if p.strip()]
+
+
+# Kelompokkan paragraf menjadi bagian. Batas bagian ditentukan isi paragraf (hash), bukan posisinya,
+# sehingga menyisipkan atau mengubah satu paragraf hanya mengubah bagian tempat paragraf itu berada;
+# bagian sesudahnya kembali ke batas yang sama dan hash-nya tidak berubah.
+def group_sections(paragraphs: Iterable[str], min_chars: int = MIN_SECTION_CHARS,
+                   max_chars: int = MAX_SECTION_CHARS, divisor: int = BOUNDARY_DIVISOR) -> Iterator[str]:
+    current, size = [], 0
+    for paragraph in paragraphs:
+        current.append(paragraph)
+        size += len(paragraph) + 1
+        if size >= max_chars or (size >= min_chars and zlib.crc32(paragraph.encode("utf-8")) % divisor == 0):
+            yield "\n".join(current)
+            current, size = [], 0
+    if current:
+        yield "\n".join(current)
+
+
+# Pisahkan teks mentah satu bagian di akhir kalimat pertama dan terakhirnya: (awal, tengah, sisa). Awal dan sisa
+# bisa berupa kalimat yang terpotong batas bagian, jadi keduanya baru di-scan setelah disambung dengan bagian
+# sebelum/sesudahnya. Tanpa tanda akhir kalimat, awal None dan seluruh teks menjadi sisa.
+def split_sentence_edges(text: str) -> Tuple[Optional[str], str, str]:
+    first = _SENTENCE_END_RE.search(text)
+    if first is None:
+        return None, "", text
+    last = max(text.rfind("."), text.rfind("!"), text.rfind("?"))
+    return text[:first.end()], text[first.end():last + 1], text[last + 1:]
+
+
+# Materi satu file yang dibagi per bagian (halaman PDF atau kelompok paragraf). Kunci setiap bagian
+# adalah hash isinya. Kalimat yang terpotong batas bagian menjadi bagian sambungan sendiri, dan statistik istilah
+# bagian dijumlahkan apa adanya, sehingga kalimat dan statistiknya sama dengan satu dokumen utuh.
+class SectionedDocument(CourseModel):
+    normalize_files = False
+
+    def __init__(self, files: Iterable, sections: Iterable[Tuple[str, object]] = ()):
+        super().__init__(files)
+        # (kunci, hasil) setiap bagian sebelum kalimat di batasnya disambung, untuk disimpan ke cache bagian
+        self.sections = list(sections)
@@ -0,0 +1,35 @@
+import os
+import sys
+
+# Modul aplikasi ada di root project (tanpa package)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+# PDF minimal: setiap halaman hanya menggambar Form XObject /Fm0 (q /Fm0 Do Q), teksnya ada di XObject itu
+def make_pdf(page_texts) -> bytes:
+    objects = [b"<< /Type /Catalog /Pages 2 0 R >>", None,
+               b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    kids = []
+    for text in page_texts:
+        form = b"BT /F1 12 Tf 72 700 Td (" + text.encode() + b") Tj ET"
+        objects.append(b"<< /Type /XObject /Subtype /Form /BBox [0 0 612 792] /Resources << /Font << /F1 3 0 R >> >> "
+                       b"/Length %d >>\nstream\n%s\nendstream" % (len(form), form))
+        form_id = len(objects)
+        contents = b"q /Fm0 Do Q"
+        objects.append(b"<< /Length %d >>\nstream\n%s\nendstream" % (len(contents), contents))
+        objects.append(b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] /Contents %d 0 R "
+                       b"/Resources << /XObject << /Fm0 %d 0 R >> >> >>" % (len(objects), form_id))
+        kids.append(b"%d 0 R" % len(objects))
+    objects[1] = b"<< /Type /Pages /Kids [" + b" ".join(kids) + b"] /Count %d >>" % len(kids)
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n%s\nendobj\n" % (number, body)
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    for offset in offsets:
+        out += b"%010d 00000 n \n" % offset
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref)
+    return bytes(out)
@@ -0,0 +1,74 @@
+import csv
+import io
+import json
+import os
+
+import pytest
+from streamlit.testing.v1 import AppTest
+import streamlit.testing.v1.app_test as app_test_module
+
+from exporters import EXPORT_FORMATS, export_questions
+from questions import Question, QuestionStore
+
+APP_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "app.py")
+
+
+def make_questions(count: int = 3) -> QuestionStore:
+    return QuestionStore([
+        Question(question_text=f"Apa fungsi klorofil {i}?", options=["Menyerap cahaya", "Akar", "Batang", "Bunga"],
+                 correct_answer="Menyerap cahaya", explanation="Klorofil menyerap cahaya.",
+                 question_type="multiple_choice", difficulty="easy")
+        for i in range(count)
+    ])
+
+
+@pytest.mark.parametrize("file_type", list(EXPORT_FORMATS))
+def test_export_returns_bytes(file_type):
+    data = export_questions(make_questions(), file_type)
+    assert isinstance(data, bytes)
+    assert "klorofil 2".encode() in data
+
+
+def test_export_formats_parse_back():
+    questions = make_questions()
+    rows = list(csv.reader(io.StringIO(export_questions(questions, "csv").decode("utf-8"))))
+    assert len(rows) == len(questions) + 1
+    assert [item["question"] for item in json.loads(export_questions(questions, "json"))] == \
+        [q.question_text for q in questions]
+
+
+# Klik tombol download di tab Download lalu jalankan callable data-nya seperti server Streamlit saat diklik
+def test_download_buttons_serve_exports(monkeypatch, tmp_path):
+    # Bank soal dan cache LLM aplikasi ditulis ke direktori sementara, bukan ke working tree
+    monkeypatch.setenv("QUESTION_BANK_PATH", str(tmp_path / "question_bank.db"))
+    monkeypatch.setenv("LLM_CACHE_DIR", str(tmp_path / "llm"))
+    monkeypatch.chdir(tmp_path)
+    managers = []
+
+    class RecordingMediaFileManager(app_test_module.MediaFileManager):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            managers.append(self)
+
+    monkeypatch.setattr(app_test_module, "MediaFileManager", RecordingMediaFileManager)
+    import app
+
+    questions = make_questions()
+    at = AppTest.from_file(APP_PATH, default_timeout=60)
+    at.run()
+    at.session_state["generated_questions"] = questions
+    at.session_state["questions_generated"] = True
+    at.session_state["analytics_data"] = app.DashboardManager().create_analytics(questions)
+    at.run()
+
+    buttons = [button for button in at.get("download_button") if button.proto.label.startswith("📥 Download")]
+    assert len(buttons) == len(EXPORT_FORMATS)
+    for index, file_type in enumerate(EXPORT_FORMATS):
+        # Versi AppTest lama belum bisa mengklik download_button; callable-nya tetap dijalankan seperti saat diklik
+        if hasattr(buttons[index], "click"):
+            buttons[index].click().run()
+            assert not at.exception
+            buttons = [button for button in at.get("download_button") if button.proto.label.startswith("📥 Download")]
+        url = managers[-1].execute_deferred(buttons[index].proto.deferred_file_id)
+        file_id = url.rsplit("/", 1)[-1].split(".")[0]
+        assert managers[-1]._storage.get_file(file_id).content == export_questions(questions, file_type)
@@ -0,0 +1,92 @@
+import io
+import multiprocessing
+import time
+
+import pytest
+
+import extractors
+from conftest import make_pdf
+from processing import MaterialProcessor
+from reporting import CollectingReporter
+
+# File yang lolos sampel 64 KB sebagai UTF-8 tetapi rusak sesudahnya
+INVALID_AFTER_SAMPLE = [
+    # Karakter cp1252 di byte terakhir: UTF-8 terpotong saat decode final
+    ("a" * 70000 + "é").encode("cp1252"),
+    # Karakter UTF-8 multi-byte yang terpotong di akhir file
+    ("a" * 70000 + "é").encode("utf-8")[:-1],
+    # Byte cp1252 di tengah file, jauh setelah sampel
+    ("a" * 70000 + "é" + "b" * 100000 + "ü").encode("cp1252"),
+]
+
+
+@pytest.mark.parametrize("data", INVALID_AFTER_SAMPLE)
+@pytest.mark.parametrize("chunk_size", [4096, 70001, 1024 * 1024])
+def test_streamed_txt_matches_decode_txt(data, chunk_size):
+    expected = extractors.decode_txt(io.BytesIO(data))
+    assert "".join(extractors.iter_txt_chunks(io.BytesIO(data), chunk_size=chunk_size)) == expected
+
+
+def test_streamed_txt_with_invalid_trailing_byte_reads_fallback_encoding():
+    data = ("Materi biologi. " * 5000 + "Kafé").encode("cp1252")
+    assert "".join(extractors.iter_txt_chunks(io.BytesIO(data))).endswith("Kafé")
+
+
+@pytest.mark.parametrize("encoding", ["utf-8", "utf-8-sig", "utf-16", "cp1252"])
+def test_decode_txt_detects_encoding(encoding):
+    text = "Fotosintesis terjadi di daun. Catatan: café, naïve.\n" * 10
+    assert extractors.decode_txt(io.BytesIO(text.encode(encoding))) == text
+
+
+def test_streaming_mode_handles_invalid_trailing_byte():
+    data = ("Fotosintesis mengubah cahaya menjadi energi kimia di daun. " * 2000 + "Kafé").encode("cp1252")
+    processor = MaterialProcessor(reporter=CollectingReporter(), streaming_threshold_bytes=0)
+    material = processor.extract_material_streaming(io.BytesIO(data), "txt")
+
+    assert not processor.reporter.drain()
+    assert material.preview.startswith("Fotosintesis")
+    assert material.text_length > len(data) // 2
+
+
+def test_parallel_pdf_extraction_keeps_page_order():
+    pages = [f"Halaman nomor {i} berisi materi." for i in range(extractors.PARALLEL_MIN_PAGES + 4)]
+    assert list(extractors.iter_pdf_pages(io.BytesIO(make_pdf(pages)), workers=2)) == pages
+
+
+# Halaman yang belum selesai saat batas waktu habis dilewati, juga untuk PDF kecil dan workers=1
+def test_page_timeout_applies_to_small_pdfs():
+    pages = ["Halaman pertama.", "Halaman kedua."]
+    text = list(extractors.iter_pdf_pages(io.BytesIO(make_pdf(pages)), workers=1, page_timeout=1e-6))
+    assert len(text) == len(pages)
+    assert text[0] == ""
+
+
+_extract_pdf_page = extractors._extract_pdf_page
+
+
+# Pengganti _extract_pdf_page untuk uji: halaman 1 macet (jauh lebih lama dari page_timeout)
+def _extract_with_stuck_page(page_number: int) -> str:
+    if page_number == 1:
+        time.sleep(60)
+    return _extract_pdf_page(page_number)
+
+
+# Setelah satu halaman macet, pool dibuat ulang sehingga halaman berikutnya tetap diekstrak tanpa menunggu
+@pytest.mark.skipif("fork" not in multiprocessing.get_all_start_methods(), reason="butuh fork")
+@pytest.mark.parametrize("workers", [1, 2])
+def test_stuck_page_does_not_block_remaining_pages(monkeypatch, workers):
+    # fork agar fungsi pengganti ikut terbawa ke worker
+    monkeypatch.setattr(extractors, "WORKER_CONTEXT", multiprocessing.get_context("fork"))
+    monkeypatch.setattr(extractors, "_extract_pdf_page", _extract_with_stuck_page)
+    pages = [f"Halaman nomor {i}." for i in range(5)]
+
+    started = time.monotonic()
+    text = list(extractors.iter_pdf_pages_parallel(make_pdf(pages), range(len(pages)), workers, page_timeout=2.0))
+
+    assert text == [pages[0], ""] + pages[2:]
+    assert time.monotonic() - started < 10
+
+
+def test_pdf_without_timeout_is_extracted_in_process():
+    pages = ["Halaman pertama.", "Halaman kedua."]
+    assert list(extractors.iter_pdf_pages(io.BytesIO(make_pdf(pages)), page_timeout=None)) == pages
@@ -0,0 +1,22 @@
+import pytest
+
+from generator import AdvancedQuestionGenerator
+from reporting import CollectingReporter
+
+
+# Materi sangat kecil: kata termirip kurang dari 3, soal tetap fill-in-the-blank dari kalimat materi
+@pytest.mark.parametrize("sentences", [
+    ["Fotosintesis terjadi di kloroplas."],
+    ["Fotosintesis terjadi di kloroplas.", "Respirasi menghasilkan energi sel."],
+])
+def test_small_material_keeps_fill_in_the_blank(sentences):
+    generator = AdvancedQuestionGenerator(reporter=CollectingReporter())
+    for seed in range(5):
+        generator.rng.seed(seed)
+        question = generator.create_question_from_sentence(sentences, 0)
+
+        assert question.question_text.startswith("Lengkapi kalimat:")
+        assert "______" in question.question_text
+        assert len(question.options) == len(set(question.options)) == 4
+        assert question.correct_answer in question.options
+
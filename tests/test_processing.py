@@ -0,0 +1,67 @@
+import io
+from concurrent.futures import ThreadPoolExecutor
+
+import processing
+from processing import ExtractionCache, MaterialProcessor, worker_processor
+from reporting import CollectingReporter
+
+
+class NamedFile(io.BytesIO):
+    def __init__(self, name: str, data: bytes):
+        super().__init__(data)
+        self.name = name
+
+
+def make_material(topic: str) -> bytes:
+    return " ".join(f"{topic} Nomor {i} dipelajari di kelas Biologi bersama Guru." for i in range(200)).encode()
+
+
+def test_multiple_files_are_extracted_in_worker_processes():
+    section_cache = ExtractionCache()
+    processor = MaterialProcessor(reporter=CollectingReporter(), file_workers=2, section_cache=section_cache)
+    files = [NamedFile("fotosintesis.txt", make_material("Fotosintesis")),
+             NamedFile("respirasi.txt", make_material("Respirasi"))]
+
+    assert processor.process_materials(files)
+    assert [f.name for f in processor.course.files] == ["fotosintesis.txt", "respirasi.txt"]
+    assert "Respirasi Nomor 199" in processor.text_content
+    # Bagian hasil worker disimpan di cache bagian proses utama
+    assert len(section_cache.entries) > 0
+    assert processor.cache.stats()["entries"] == 2
+
+
+def test_worker_processor_keeps_no_cache():
+    processor = worker_processor(reporter=CollectingReporter())
+    assert processor.process_material(NamedFile("fotosintesis.txt", make_material("Fotosintesis")))
+    assert processor.pdf_workers == 1
+    assert not processor.cache.entries and not processor.section_cache.entries
+
+
+# Dua sesi dengan cache bersama mengupload file yang sama bersamaan: setiap file hanya diekstrak sekali
+def test_concurrent_sessions_share_extraction():
+    cache, section_cache = ExtractionCache(), ExtractionCache()
+    data = [("fotosintesis.txt", make_material("Fotosintesis")), ("respirasi.txt", make_material("Respirasi"))]
+    processors = [MaterialProcessor(reporter=CollectingReporter(), file_workers=2, cache=cache,
+                                    section_cache=section_cache) for _ in range(2)]
+
+    with ThreadPoolExecutor(max_workers=2) as threads:
+        results = list(threads.map(lambda p: p.process_materials([NamedFile(n, d) for n, d in data]), processors))
+
+    assert results == [True, True]
+    assert cache.stats()["misses"] == 2 and cache.stats()["hits"] == 2
+    assert processors[0].course.files[0].material is processors[1].course.files[0].material
+
+
+# Rerun dengan semua file (termasuk file tanpa teks) sudah di cache tidak menjalankan proses worker baru
+def test_rerun_with_cached_files_starts_no_workers(monkeypatch):
+    processor = MaterialProcessor(reporter=CollectingReporter(), file_workers=2)
+    data = [("fotosintesis.txt", make_material("Fotosintesis")), ("kosong.txt", b"")]
+    assert processor.process_materials([NamedFile(n, d) for n, d in data])
+    assert processor.cache.stats()["entries"] == 2
+
+    def no_workers(*args, **kwargs):
+        raise AssertionError("proses worker tidak boleh dibuat")
+
+    monkeypatch.setattr(processing, "ProcessPoolExecutor", no_workers)
+    assert processor.process_materials([NamedFile(n, d) for n, d in data])
+    assert [f.name for f in processor.course.files] == ["fotosintesis.txt"]
@@ -0,0 +1,106 @@
+import threading
+
+import pytest
+
+from generator import AdvancedQuestionGenerator
+from llm_stub_server import serve_in_thread
+from question_backends import LLMBackend, QuestionBackend, RateLimiter, TemplateBackend
+from reporting import CollectingReporter
+
+MATERIAL = " ".join(
+    f"Fotosintesis tahap {i} mengubah energi cahaya menjadi energi kimia di dalam kloroplas daun. "
+    f"Klorofil menyerap cahaya merah dan biru untuk proses respirasi sel nomor {i}."
+    for i in range(12)
+)
+
+
+@pytest.fixture
+def stub_server():
+    servers = []
+
+    def start(fail_every: int = 0):
+        server = serve_in_thread(fail_every=fail_every)
+        servers.append(server)
+        return server
+
+    yield start
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+
+def make_backend(server, cache_dir, **kwargs) -> LLMBackend:
+    return LLMBackend(base_url=f"http://127.0.0.1:{server.server_address[1]}/v1", cache_dir=str(cache_dir),
+                      questions_per_request=2, backoff_base=0.01, **kwargs)
+
+
+def generate(backend, num_questions: int = 6):
+    reporter = CollectingReporter()
+    generator = AdvancedQuestionGenerator(reporter=reporter, backend=backend)
+    questions = generator.generate_questions_advanced(MATERIAL, num_questions, seed=7)
+    return questions, reporter.drain()
+
+
+def test_retry_after_429_then_cache_hit_sends_no_requests(stub_server, tmp_path):
+    # Setiap request ke-2 dijawab 429 dengan Retry-After: 0
+    server = stub_server(fail_every=2)
+    backend = make_backend(server, tmp_path)
+
+    questions, messages = generate(backend)
+
+    assert not messages
+    assert backend.retries > 0
+    assert backend.requests_sent == server.request_count == 3 + backend.retries
+    assert any(q.question_text.startswith("Pernyataan mana yang benar") for q in questions)
+
+    # Backend baru dengan cache disk yang sama: semua batch dari cache, tidak ada request
+    cached_backend = make_backend(server, tmp_path)
+    cached_questions, messages = generate(cached_backend)
+
+    assert not messages
+    assert cached_backend.requests_sent == 0
+    assert server.request_count == backend.requests_sent
+    assert [q.question_text for q in cached_questions] == [q.question_text for q in questions]
+    assert [q.options for q in cached_questions] == [q.options for q in questions]
+
+
+def test_rate_limit_is_shared_across_generations(stub_server, tmp_path):
+    server = stub_server()
+    backend = make_backend(server, tmp_path, requests_per_minute=3)
+
+    generate(backend)
+
+    # Tiga batch menghabiskan kuota 3 request/menit; generate berikutnya harus menunggu
+    assert server.request_count == 3
+    assert backend.rate_limiter.try_acquire(1) > 0
+
+
+def test_rate_limiter_is_thread_safe():
+    limiter = RateLimiter(requests_per_minute=5, tokens_per_minute=10 ** 6)
+    granted = []
+
+    def worker():
+        for _ in range(20):
+            if limiter.try_acquire(1) == 0:
+                granted.append(1)
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(granted) == 5
+
+
+def test_template_backend_needs_no_server():
+    questions, messages = generate(TemplateBackend(), num_questions=3)
+    assert len(questions) == 3
+
+
+def test_incomplete_backend_fails_when_created():
+    class NoGenerateBackend(QuestionBackend):
+        key = "incomplete"
+
+    with pytest.raises(TypeError):
+        NoGenerateBackend()
@@ -0,0 +1,34 @@
+from questions import Question, QuestionStore
+
+
+def make_question(number, difficulty="easy", question_type="pilihan_ganda"):
+    return Question(
+        question_text=f"Soal {number}?",
+        options=["a", "b", "c", "d"],
+        correct_answer="b",
+        explanation="",
+        question_type=question_type,
+        difficulty=difficulty,
+        concept=f"konsep {number % 7}",
+    )
+
+
+def test_more_than_127_labels_round_trip():
+    labels = [f"level-{number}" for number in range(300)]
+    store = QuestionStore(make_question(number, difficulty=label, question_type=f"tipe-{number}")
+                          for number, label in enumerate(labels))
+
+    assert [store[row].difficulty for row in range(len(labels))] == labels
+    assert store.count_by("difficulty")["level-200"] == 1
+    assert [store[row].question_type for row in range(len(labels))] == [f"tipe-{number}" for number in range(300)]
+    frame = store.to_pandas()
+    assert list(frame["difficulty"]) == labels
+
+
+def test_set_difficulties_beyond_127_labels():
+    store = QuestionStore(make_question(number) for number in range(200))
+
+    changed = store.set_difficulties([f"kuis-{row}" for row in range(200)])
+
+    assert changed == 200
+    assert [store[row].difficulty for row in range(200)] == [f"kuis-{row}" for row in range(200)]
@@ -0,0 +1,21 @@
+import pytest
+
+from reporting import CollectingReporter, Reporter
+
+
+def test_incomplete_reporter_fails_when_created():
+    class ErrorOnlyReporter(Reporter):
+        def error(self, message: str):
+            pass
+
+    with pytest.raises(TypeError):
+        ErrorOnlyReporter()
+
+
+def test_collecting_reporter_drains_messages():
+    reporter = CollectingReporter()
+    reporter.error("gagal")
+    reporter.warning("hati-hati")
+
+    assert reporter.drain() == [("error", "gagal"), ("warning", "hati-hati")]
+    assert reporter.drain() == []
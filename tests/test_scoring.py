@@ -0,0 +1,117 @@
+import json
+import os
+import random
+import sys
+
+import pytest
+
+from questions import Question, QuestionStore
+from scoring import AnswerKey, score_answers, score_submissions
+
+# Cara lama (loop per siswa per soal) ada di benchmark penilaian kuis
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "benchmarks"))
+
+from bench_quiz_scoring import make_store, make_submissions, score_legacy  # noqa: E402
+
+
+# Acuan per jawaban: huruf (besar/kecil), indeks opsi, atau teks opsi dibandingkan dengan correct_answer soal
+def score_reference(store: QuestionStore, submissions) -> list:
+    questions = list(store)
+    scores = []
+    for answers in submissions:
+        if isinstance(answers, dict):
+            answers = [answers.get(q.question_id, answers.get(str(row + 1)))
+                       for row, q in enumerate(questions)]
+        correct = 0
+        for question, answer in zip(questions, answers):
+            if isinstance(answer, str) and len(answer) == 1 and answer.isalpha():
+                answer = ord(answer.upper()) - ord("A")
+            if isinstance(answer, int) and not isinstance(answer, bool):
+                answer = question.options[answer] if 0 <= answer < len(question.options) else None
+            if answer is not None and answer in question.options and answer == question.correct_answer:
+                correct += 1
+        scores.append(correct)
+    return scores
+
+
+@pytest.mark.parametrize("num_students", [1, 7, 300])
+def test_score_submissions_matches_legacy(num_students):
+    store = make_store(12, seed=num_students)
+    lines = make_submissions(store, num_students, seed=num_students)
+
+    report = score_submissions(store, lines)
+
+    assert report.scores.tolist() == score_legacy(store, lines)
+    assert report.students == [f"Siswa {i + 1}" for i in range(num_students)]
+
+
+def test_mixed_answer_formats_match_reference():
+    rng = random.Random(3)
+    store = QuestionStore()
+    for i in range(6):
+        options = [f"opsi {i}-{j}" for j in range(rng.choice((2, 3, 4)))]
+        store.append(Question(f"Soal {i}?", options, options[rng.randrange(len(options))], "",
+                              question_id=f"materi-{i + 1}"))
+    # Jawaban benar yang tidak ada di daftar opsi tidak pernah cocok
+    store.append(Question("Soal lain?", ["x", "y"], "z", "", question_id="materi-7"))
+
+    def random_answer(row):
+        options = store.options[row]
+        index = rng.randrange(len(options) + 1)
+        return rng.choice([
+            chr(65 + index), chr(97 + index), index, options[index] if index < len(options) else "bukan opsi", None
+        ])
+
+    submissions = []
+    for student in range(200):
+        answers = [random_answer(row) for row in range(len(store))]
+        if student % 3 == 1:
+            answers = {store.question_ids[row]: answer for row, answer in enumerate(answers) if answer is not None}
+        elif student % 3 == 2:
+            answers = {str(row + 1): answer for row, answer in enumerate(answers[:-2])}
+        submissions.append(answers)
+    lines = [json.dumps({"student": f"S{i}", "answers": answers}) for i, answers in enumerate(submissions)]
+
+    report = score_submissions(store, lines)
+    expected = score_reference(store, [json.loads(line)["answers"] for line in lines])
+
+    assert report.scores.tolist() == expected
+    key = AnswerKey(store)
+    for student in (0, 1, 2):
+        assert score_answers(store, submissions[student], key=key).scores.tolist() == [expected[student]]
+
+
+def test_invalid_lines_are_reported_not_scored():
+    store = make_store(3)
+    lines = ['{"student": "A", "answers": ["A", "B", "C"]}', "bukan json", '{"student": "B", "answers": 5}', ""]
+
+    report = score_submissions(store, lines)
+
+    assert report.students == ["A"]
+    assert report.scores.tolist() == score_legacy(store, lines[:1])
+    assert len(report.errors) == 2
+
+
+def test_multi_letter_and_empty_answers_are_not_merged():
+    store = make_store(3)
+    key = AnswerKey(store)
+    answers = ["AB", "", "C"]
+
+    assert key.encode([answers]).tolist() == [key._encode_list(answers)] == [[-1, -1, 2]]
+
+
+def test_single_letter_option_text_matches_single_answer_path():
+    store = QuestionStore([
+        Question("Variabel apa?", ["x", "y", "z"], "x", "", question_id="q-1"),
+        Question("Konstanta apa?", ["pi", "e"], "e", "", question_id="q-2"),
+    ])
+    key = AnswerKey(store)
+    submissions = [["x", "B"], ["y", "b"], {"q-1": "z", "q-2": "A"}]
+
+    matrix = key.encode(submissions)
+
+    assert matrix.tolist() == [[0, 1], [1, 1], [2, 0]]
+    for student, answers in enumerate(submissions):
+        assert key.encode([answers]).tolist() == [matrix[student].tolist()]
+        expected = key._encode_dict(answers) if isinstance(answers, dict) else key._encode_list(answers)
+        assert matrix[student].tolist() == expected
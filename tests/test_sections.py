@@ -0,0 +1,92 @@
+import io
+
+from conftest import make_pdf
+from processing import ExtractionCache, MaterialProcessor
+from reporting import CollectingReporter
+from text_pipeline import DocumentModel, clean_text
+
+
+def make_processor(section_cache: ExtractionCache) -> MaterialProcessor:
+    return MaterialProcessor(reporter=CollectingReporter(), pdf_workers=1, section_cache=section_cache)
+
+
+def test_pdf_pages_with_same_contents_but_different_xobjects_do_not_share_cache():
+    section_cache = ExtractionCache()
+    a = make_pdf(["Alpha satu berada di halaman pertama.", "Alpha dua berada di halaman kedua."])
+    b = make_pdf(["Beta satu berada di halaman pertama.", "Beta dua berada di halaman kedua."])
+
+    first = make_processor(section_cache).extract_material(io.BytesIO(a), "pdf")
+    # Sesi lain dengan cache bagian yang sama
+    second = make_processor(section_cache).extract_material(io.BytesIO(b), "pdf")
+
+    assert "Alpha" in first.text and "Beta" not in first.text
+    assert "Beta satu" in second.text and "Beta dua" in second.text
+    assert "Alpha" not in second.text
+
+
+def test_unchanged_pdf_pages_are_reused_after_edit():
+    section_cache = ExtractionCache()
+    original = make_pdf(["Halaman pertama tidak berubah.", "Halaman kedua versi lama."])
+    edited = make_pdf(["Halaman pertama tidak berubah.", "Halaman kedua versi baru."])
+
+    make_processor(section_cache).extract_material(io.BytesIO(original), "pdf")
+    hits = section_cache.hits
+    material = make_processor(section_cache).extract_material(io.BytesIO(edited), "pdf")
+
+    assert section_cache.hits == hits + 1
+    assert "versi baru" in material.text and "versi lama" not in material.text
+
+
+# Materi TXT yang paragrafnya berakhir di tengah kalimat, jadi banyak kalimat melewati batas bagian
+def make_wrapped_text(num_paragraphs: int, marker: str = "") -> str:
+    paragraphs = []
+    for i in range(num_paragraphs):
+        paragraphs.append(f"Konsep Fotosintesis nomor {i} dijelaskan oleh Guru Biologi. Kalimat nomor {i} {marker} "
+                          f"sengaja dilanjutkan ke paragraf berikutnya dan membahas Klorofil serta Cahaya yang")
+    paragraphs.append("diserap daun. Penutup materi.")
+    return "\n\n".join(paragraphs)
+
+
+def whole_document(text: str) -> DocumentModel:
+    return DocumentModel(clean_text(text))
+
+
+def assert_same_as_whole_document(material, text: str):
+    whole = whole_document(text)
+    assert material.sentences == whole.meaningful_sentences()
+    terms, term_frequency, sentence_frequency, num_sentences = material.document.term_statistics()
+    whole_terms, whole_tf, whole_sf, whole_num_sentences = whole.term_statistics()
+    assert num_sentences == whole_num_sentences
+    assert dict(zip(terms, term_frequency)) == dict(zip(whole_terms, whole_tf))
+    assert dict(zip(terms, sentence_frequency)) == dict(zip(whole_terms, whole_sf))
+
+
+def test_sentences_crossing_section_boundaries_stay_whole():
+    text = make_wrapped_text(200)
+    processor = make_processor(ExtractionCache())
+    material = processor.extract_material(io.BytesIO(text.encode()), "txt")
+
+    assert len(material.document.sections) > 5
+    assert_same_as_whole_document(material, text)
+
+
+def test_sentences_stay_whole_after_editing_one_section():
+    section_cache = ExtractionCache()
+    text = make_wrapped_text(200)
+    make_processor(section_cache).extract_material(io.BytesIO(text.encode()), "txt")
+
+    edited = text.replace("Kalimat nomor 100 ", "Kalimat nomor 100 yang sudah diubah ")
+    hits = section_cache.hits
+    material = make_processor(section_cache).extract_material(io.BytesIO(edited.encode()), "txt")
+
+    assert section_cache.hits > hits
+    assert_same_as_whole_document(material, edited)
+
+
+def test_pdf_sentence_across_pages_matches_joined_pages():
+    pages = ["Kalimat pertama lengkap di halaman satu. Kalimat kedua terpotong di ",
+             "halaman dua lalu selesai di sini. Penutup halaman dua."]
+    material = make_processor(ExtractionCache()).extract_material(io.BytesIO(make_pdf(pages)), "pdf")
+
+    assert "Kalimat kedua terpotong di halaman dua lalu selesai di sini" in material.sentences
+    assert_same_as_whole_document(material, "".join(pages))
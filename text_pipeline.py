@@ -0,0 +1,295 @@
+import random
+import re
+import sys
+from array import array
+from typing import Dict, Iterable, List, Tuple
+
+import numpy as np
+
+# Pola yang dipakai bersama oleh seluruh pipeline teks, dikompilasi sekali
+_WHITESPACE_RE = re.compile(r'\s+')
+_UNWANTED_CHARS_RE = re.compile(r'[^\w\s.,!?;:()-]')
+# Token berupa kata (tanpa spasi dan tanda akhir kalimat) atau tanda akhir kalimat
+_TOKEN_RE = re.compile(r'[^\s.!?]+|[.!?]')
+_CAPITALIZED_RE = re.compile(r'\b[A-Z][a-z]+\b')
+_NON_ALPHA_RE = re.compile(r'[^a-zA-Z]')
+_ALPHA_RUN_RE = re.compile(r'[a-z]+')
+_SENTENCE_END = frozenset(".!?")
+
+
+# Hapus karakter khusus dan multiple spaces
+def clean_text(text: str) -> str:
+    # Dua substitusi di level C masih lebih cepat daripada satu re.sub dengan callback Python
+    text = _WHITESPACE_RE.sub(' ', text)
+    text = _UNWANTED_CHARS_RE.sub('', text)
+    return text.strip()
+
+
+# Model dokumen hasil satu kali scan teks: kalimat, posisi token, dan frekuensi istilah
+class DocumentModel:
+    def __init__(self, text: str):
+        self.text = text
+        # Posisi awal/akhir setiap token kata di dalam teks
+        self.token_starts = array('I')
+        self.token_ends = array('I')
+        # (awal, akhir, index token pertama, jumlah token) untuk setiap kalimat yang berisi kata
+        self.sentence_spans: List[Tuple[int, int, int, int]] = []
+        # Frekuensi kata berhuruf kapital (lebih dari 4 huruf), dalam huruf kecil
+        self.capitalized_terms: Dict[str, int] = {}
+        # Kandidat konsep: kata judul atau kata setelah titik dua, urut kemunculan
+        self.title_terms: Dict[str, int] = {}
+        # Kosakata kandidat konsep (gabungan dua jenis di atas) dan kemunculannya per kalimat
+        self.term_ids: Dict[str, int] = {}
+        self.occurrence_terms = array('I')
+        self.occurrence_sentences = array('I')
+        self._meaningful_sentences = None
+        self._concept_indexes = {}
+        # Hasil peringkat konsep per scorer, dihitung sekali per dokumen
+        self.concept_rankings = {}
+        # Statistik istilah dari seluruh materi jika model ini dibuat oleh StreamingDocumentBuilder
+        self.aggregated_statistics = None
+        self._statistics = None
+        self._scan()
+
+    # Scan teks sekali untuk mengisi semua struktur di atas
+    def _scan(self):
+        text = self.text
+        token_starts = self.token_starts
+        token_ends = self.token_ends
+        capitalized_terms = self.capitalized_terms
+        title_terms = self.title_terms
+        term_ids = self.term_ids
+        occurrence_terms = self.occurrence_terms
+        occurrence_sentences = self.occurrence_sentences
+
+        first_token = 0
+        previous_word = ""
+        for match in _TOKEN_RE.finditer(text):
+            word = match.group()
+            if word in _SENTENCE_END:
+                self._close_sentence(first_token)
+                first_token = len(token_starts)
+                previous_word = ""
+                continue
+
+            token_starts.append(match.start())
+            token_ends.append(match.end())
+            token_terms = []
+
+            # Kata berhuruf kapital untuk peringkat konsep
+            if not word.islower():
+                for capitalized in _CAPITALIZED_RE.findall(word):
+                    if len(capitalized) > 4:
+                        capitalized = capitalized.lower()
+                        capitalized_terms[capitalized] = capitalized_terms.get(capitalized, 0) + 1
+                        token_terms.append(capitalized)
+
+            # Kata judul atau kata setelah titik dua sebagai kandidat konsep
+            cleaned_word = word if word.isascii() and word.isalpha() else _NON_ALPHA_RE.sub('', word)
+            if (len(cleaned_word) > 3 and cleaned_word.isalpha() and
+                    (cleaned_word.istitle() or previous_word.endswith(':'))):
+                cleaned_word = cleaned_word.lower()
+                title_terms[cleaned_word] = title_terms.get(cleaned_word, 0) + 1
+                if cleaned_word not in token_terms:
+                    token_terms.append(cleaned_word)
+            previous_word = word
+
+            # Catat kemunculan kandidat konsep di kalimat ini untuk matriks kalimat-istilah
+            for term in token_terms:
+                term_id = term_ids.get(term)
+                if term_id is None:
+                    term_id = term_ids[term] = len(term_ids)
+                occurrence_terms.append(term_id)
+                occurrence_sentences.append(len(self.sentence_spans))
+
+        self._close_sentence(first_token)
+
+    # Simpan kalimat yang berakhir sebelum token ke-len(token_starts)
+    def _close_sentence(self, first_token: int):
+        num_tokens = len(self.token_starts) - first_token
+        if num_tokens > 0:
+            self.sentence_spans.append((
+                self.token_starts[first_token],
+                self.token_ends[first_token + num_tokens - 1],
+                first_token,
+                num_tokens
+            ))
+
+    # Jumlah kata dalam dokumen
+    @property
+    def num_tokens(self) -> int:
+        return len(self.token_starts)
+
+    # Teks sebuah kalimat berdasarkan index
+    def sentence_text(self, index: int) -> str:
+        start, end, _, _ = self.sentence_spans[index]
+        return self.text[start:end]
+
+    # Kalimat yang cukup panjang untuk dijadikan soal (minimal 5 kata dan 20 karakter)
+    def meaningful_sentences(self) -> List[str]:
+        if self._meaningful_sentences is None:
+            self._meaningful_sentences = [
+                self.text[start:end]
+                for start, end, _, num_tokens in self.sentence_spans
+                if num_tokens >= 5 and end - start > 20
+            ]
+        return self._meaningful_sentences
+
+    # Index terbalik konsep -> nomor kalimat bermakna yang memuat konsep tersebut, dibuat sekali per daftar konsep
+    def concept_index(self, concepts: Iterable[str]) -> Dict[str, List[int]]:
+        concepts = tuple(concepts)
+        index = self._concept_indexes.get(concepts)
+        if index is None:
+            index = {concept: [] for concept in concepts}
+            for sentence_id, sentence in enumerate(self.meaningful_sentences()):
+                for word in set(_ALPHA_RUN_RE.findall(sentence.lower())):
+                    postings = index.get(word)
+                    if postings is not None:
+                        postings.append(sentence_id)
+            self._concept_indexes[concepts] = index
+        return index
+
+    # Statistik istilah: (daftar istilah, frekuensi total, jumlah kalimat yang memuat, jumlah kalimat)
+    def term_statistics(self) -> Tuple[List[str], np.ndarray, np.ndarray, int]:
+        if self.aggregated_statistics is not None:
+            return self.aggregated_statistics
+        # Model tidak berubah setelah scan, statistik cukup dihitung sekali (bagian materi dipakai ulang)
+        if self._statistics is None:
+            self._statistics = self._compute_term_statistics()
+        return self._statistics
+
+    def _compute_term_statistics(self) -> Tuple[List[str], np.ndarray, np.ndarray, int]:
+        num_terms = len(self.term_ids)
+        terms = np.frombuffer(self.occurrence_terms, dtype=np.uint32)
+        sentences = np.frombuffer(self.occurrence_sentences, dtype=np.uint32)
+        term_frequency = np.bincount(terms, minlength=num_terms)
+        pairs = np.unique(sentences.astype(np.int64) * max(num_terms, 1) + terms)
+        sentence_frequency = np.bincount(pairs % max(num_terms, 1), minlength=num_terms)
+        return list(self.term_ids), term_frequency, sentence_frequency, len(self.sentence_spans)
+
+    # Perkiraan ukuran memori model (tanpa teks) dalam byte
+    def size_bytes(self) -> int:
+        size = self.token_starts.buffer_info()[1] * self.token_starts.itemsize * 2
+        size += self.occurrence_terms.buffer_info()[1] * self.occurrence_terms.itemsize * 2
+        size += sum(sys.getsizeof(term) for term in self.term_ids)
+        size += sys.getsizeof(self.sentence_spans) + len(self.sentence_spans) * 72
+        size += sum(sys.getsizeof(term) for term in self.capitalized_terms)
+        size += sum(sys.getsizeof(term) for term in self.title_terms)
+        return size
+
+
+# Potong kalimat panjang di batas kata
+def shorten_sentence(sentence: str, max_chars: int = 180) -> str:
+    if len(sentence) <= max_chars:
+        return sentence
+    return sentence[:max_chars].rsplit(" ", 1)[0] + "..."
+
+
+# Sembunyikan konsep (beserta imbuhan di belakangnya) di dalam kalimat
+def mask_concept(sentence: str, concept: str, mask: str = "___") -> str:
+    return re.sub(r'(?i)\b' + re.escape(concept) + r'[a-z]*', mask, sentence)
+
+
+# Salin array ke array baru yang lebih besar, sisanya diisi nol
+def _grow(values: np.ndarray, capacity: int) -> np.ndarray:
+    grown = np.zeros(capacity, dtype=values.dtype)
+    grown[:len(values)] = values
+    return grown
+
+
+# Bangun model dokumen dari potongan teks secara bertahap dengan memori terbatas.
+# Statistik istilah dihitung dari seluruh materi, sedangkan kalimat yang disimpan
+# hanya sampel (reservoir) berukuran tetap.
+class StreamingDocumentBuilder:
+    def __init__(self, reservoir_size: int = 5000, preview_chars: int = 300,
+                 max_pending_chars: int = 1024 * 1024, seed: int = 0):
+        self.reservoir_size = reservoir_size
+        self.preview_chars = preview_chars
+        self.max_pending_chars = max_pending_chars
+        self.rng = random.Random(seed)
+        # Sisa teks mentah yang belum diakhiri tanda akhir kalimat
+        self.pending = ""
+        self.preview = ""
+        self.text_length = 0
+        # Sampel kalimat bermakna: (nomor urut, kalimat)
+        self.reservoir: List[Tuple[int, str]] = []
+        self.num_meaningful_sentences = 0
+        # Statistik istilah berjalan
+        self.term_ids: Dict[str, int] = {}
+        self.term_frequency = np.zeros(0, dtype=np.int64)
+        self.sentence_frequency = np.zeros(0, dtype=np.int64)
+        self.num_sentences = 0
+
+    # Tambahkan potongan teks mentah, diproses sampai tanda akhir kalimat terakhir
+    def feed(self, chunk: str):
+        data = self.pending + chunk
+        cut = max(data.rfind("."), data.rfind("!"), data.rfind("?"))
+        if cut < 0 and len(data) > self.max_pending_chars:
+            # Teks tanpa tanda akhir kalimat yang sangat panjang dipotong di spasi terakhir
+            cut = data.rfind(" ")
+        if cut < 0:
+            self.pending = data
+            return
+        self.pending = data[cut + 1:]
+        self._process(data[:cut + 1])
+
+    # Proses sisa teks dan hasilkan model dokumen dari sampel kalimat
+    def finish(self) -> DocumentModel:
+        if self.pending:
+            self._process(self.pending)
+            self.pending = ""
+        sentences = [sentence for _, sentence in sorted(self.reservoir)]
+        text = ". ".join(sentences) + "." if sentences else ""
+        document = DocumentModel(text)
+        num_terms = len(self.term_ids)
+        document.aggregated_statistics = (
+            list(self.term_ids),
+            self.term_frequency[:num_terms],
+            self.sentence_frequency[:num_terms],
+            self.num_sentences
+        )
+        return document
+
+    # Bersihkan dan scan satu potongan, gabungkan statistiknya, lalu sampel kalimatnya
+    def _process(self, raw_text: str):
+        text = clean_text(raw_text)
+        if not text:
+            return
+        if len(self.preview) < self.preview_chars:
+            self.preview = (self.preview + " " + text if self.preview else text)[:self.preview_chars]
+        self.text_length += len(text) + (1 if self.text_length else 0)
+
+        chunk = DocumentModel(text)
+        self._merge_statistics(chunk)
+        for sentence in chunk.meaningful_sentences():
+            self._sample(sentence)
+
+    # Tambahkan statistik istilah potongan ke statistik berjalan (id istilah dipetakan ke kosakata global)
+    def _merge_statistics(self, chunk: DocumentModel):
+        terms, term_frequency, sentence_frequency, num_sentences = chunk.term_statistics()
+        self.num_sentences += num_sentences
+        if not terms:
+            return
+        global_ids = np.fromiter(
+            (self.term_ids.setdefault(term, len(self.term_ids)) for term in terms),
+            dtype=np.int64, count=len(terms)
+        )
+        num_terms = len(self.term_ids)
+        if num_terms > len(self.term_frequency):
+            # Perbesar array dua kali lipat agar penambahan istilah baru tetap murah
+            capacity = max(num_terms, 2 * len(self.term_frequency))
+            self.term_frequency = _grow(self.term_frequency, capacity)
+            self.sentence_frequency = _grow(self.sentence_frequency, capacity)
+        np.add.at(self.term_frequency, global_ids, term_frequency)
+        np.add.at(self.sentence_frequency, global_ids, sentence_frequency)
+
+    # Reservoir sampling (Algorithm R) agar jumlah kalimat yang disimpan tetap
+    def _sample(self, sentence: str):
+        position = self.num_meaningful_sentences
+        self.num_meaningful_sentences += 1
+        if len(self.reservoir) < self.reservoir_size:
+            self.reservoir.append((position, sentence))
+            return
+        slot = self.rng.randrange(self.num_meaningful_sentences)
+        if slot < self.reservoir_size:
+            self.reservoir[slot] = (position, sentence)
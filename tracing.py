@@ -0,0 +1,192 @@
+import json
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# Prefix nama metrik di export OpenMetrics
+METRIC_PREFIX = "question_generator"
+
+
+# Peak RSS proses sejauh ini (byte), None jika platform tidak mendukung
+def peak_rss_bytes() -> Optional[int]:
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux melaporkan KB, macOS byte
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+# Statistik waktu satu tahap
+class StageStats:
+    __slots__ = ("count", "total", "min", "max", "last", "rss_growth")
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.min = float("inf")
+        self.max = 0.0
+        self.last = 0.0
+        # Kenaikan peak RSS terbesar selama tahap ini berjalan (byte)
+        self.rss_growth = 0
+
+    def add(self, seconds: float, rss_growth: int):
+        self.count += 1
+        self.total += seconds
+        self.min = min(self.min, seconds)
+        self.max = max(self.max, seconds)
+        self.last = seconds
+        self.rss_growth = max(self.rss_growth, rss_growth)
+
+    def to_dict(self) -> Dict:
+        return {
+            "count": self.count,
+            "total_seconds": self.total,
+            "mean_seconds": self.total / self.count if self.count else 0.0,
+            "min_seconds": self.min if self.count else 0.0,
+            "max_seconds": self.max,
+            "last_seconds": self.last,
+            "rss_growth_bytes": self.rss_growth,
+        }
+
+
+# Pencatat waktu per tahap, peak memori, dan hit rate cache; aman dipakai dari thread script dan thread job
+class Tracer:
+    def __init__(self, enabled: bool = True):
+        self.enabled = enabled
+        self.started_at = time.time()
+        self.stages: Dict[str, StageStats] = {}
+        self.caches: Dict[str, List[int]] = {}
+        self._lock = threading.Lock()
+
+    # Ukur satu tahap: `with tracer.span("clean_text"): ...`
+    @contextmanager
+    def span(self, name: str) -> Iterator[None]:
+        if not self.enabled:
+            yield
+            return
+        rss_before = peak_rss_bytes()
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            seconds = time.perf_counter() - start
+            rss_after = peak_rss_bytes()
+            growth = rss_after - rss_before if rss_before is not None else 0
+            self.record(name, seconds, growth)
+
+    def record(self, name: str, seconds: float, rss_growth: int = 0):
+        with self._lock:
+            stats = self.stages.get(name)
+            if stats is None:
+                stats = self.stages[name] = StageStats()
+            stats.add(seconds, rss_growth)
+
+    # Tambah hitungan hit/miss satu cache
+    def record_cache(self, name: str, hits: int = 0, misses: int = 0):
+        if not self.enabled or not (hits or misses):
+            return
+        with self._lock:
+            counts = self.caches.setdefault(name, [0, 0])
+            counts[0] += hits
+            counts[1] += misses
+
+    # Gabungkan snapshot dari tracer lain (misalnya tracer di proses worker)
+    def merge(self, snapshot: Dict):
+        with self._lock:
+            for stage in snapshot["stages"]:
+                stats = self.stages.get(stage["stage"])
+                if stats is None:
+                    stats = self.stages[stage["stage"]] = StageStats()
+                stats.count += stage["count"]
+                stats.total += stage["total_seconds"]
+                stats.min = min(stats.min, stage["min_seconds"])
+                stats.max = max(stats.max, stage["max_seconds"])
+                stats.last = stage["last_seconds"]
+                stats.rss_growth = max(stats.rss_growth, stage["rss_growth_bytes"])
+            for cache in snapshot["caches"]:
+                counts = self.caches.setdefault(cache["cache"], [0, 0])
+                counts[0] += cache["hits"]
+                counts[1] += cache["misses"]
+
+    def reset(self):
+        with self._lock:
+            self.stages = {}
+            self.caches = {}
+            self.started_at = time.time()
+
+    # Salinan semua data, tahap diurutkan dari total waktu terbesar
+    def snapshot(self) -> Dict:
+        with self._lock:
+            stages = {name: stats.to_dict() for name, stats in self.stages.items()}
+            caches = {name: tuple(counts) for name, counts in self.caches.items()}
+            started_at = self.started_at
+        return {
+            "started_at": started_at,
+            "peak_rss_bytes": peak_rss_bytes(),
+            "stages": [
+                dict(stage=name, **stats)
+                for name, stats in sorted(stages.items(), key=lambda item: item[1]["total_seconds"], reverse=True)
+            ],
+            "caches": [
+                {"cache": name, "hits": hits, "misses": misses,
+                 "hit_rate": hits / (hits + misses) if hits + misses else 0.0}
+                for name, (hits, misses) in sorted(caches.items())
+            ],
+        }
+
+    def to_json(self) -> str:
+        return json.dumps(self.snapshot(), indent=2)
+
+    # Format teks OpenMetrics (bisa dibaca Prometheus)
+    def to_openmetrics(self) -> str:
+        data = self.snapshot()
+        name = METRIC_PREFIX
+        lines = [
+            f"# TYPE {name}_stage_seconds summary",
+            f"# UNIT {name}_stage_seconds seconds",
+            f"# HELP {name}_stage_seconds Waktu setiap tahap pipeline.",
+        ]
+        for stage in data["stages"]:
+            label = _labels(stage=stage["stage"])
+            lines.append(f"{name}_stage_seconds_count{label} {stage['count']}")
+            lines.append(f"{name}_stage_seconds_sum{label} {stage['total_seconds']:.9g}")
+        lines += [
+            f"# TYPE {name}_stage_max_seconds gauge",
+            f"# UNIT {name}_stage_max_seconds seconds",
+            f"# HELP {name}_stage_max_seconds Waktu terlama satu kali tahap berjalan.",
+        ]
+        lines += [f"{name}_stage_max_seconds{_labels(stage=s['stage'])} {s['max_seconds']:.9g}" for s in data["stages"]]
+        lines += [
+            f"# TYPE {name}_stage_rss_growth_bytes gauge",
+            f"# UNIT {name}_stage_rss_growth_bytes bytes",
+            f"# HELP {name}_stage_rss_growth_bytes Kenaikan peak RSS terbesar selama tahap berjalan.",
+        ]
+        lines += [f"{name}_stage_rss_growth_bytes{_labels(stage=s['stage'])} {s['rss_growth_bytes']}"
+                  for s in data["stages"]]
+        for kind in ("hits", "misses"):
+            lines += [f"# TYPE {name}_cache_{kind} counter", f"# HELP {name}_cache_{kind} Jumlah cache {kind}."]
+            lines += [f"{name}_cache_{kind}_total{_labels(cache=c['cache'])} {c[kind]}" for c in data["caches"]]
+        if data["peak_rss_bytes"] is not None:
+            lines += [
+                f"# TYPE {name}_peak_rss_bytes gauge",
+                f"# UNIT {name}_peak_rss_bytes bytes",
+                f"# HELP {name}_peak_rss_bytes Peak RSS proses.",
+                f"{name}_peak_rss_bytes {data['peak_rss_bytes']}",
+            ]
+        lines.append("# EOF")
+        return "\n".join(lines) + "\n"
+
+
+def _labels(**labels: str) -> str:
+    escaped = (
+        f'{key}="' + value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") + '"'
+        for key, value in labels.items()
+    )
+    return "{" + ",".join(escaped) + "}"